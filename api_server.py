@@ -3,90 +3,77 @@
 주식 로고 수집, 저장, 조회 및 관리 기능을 제공하는 API 서버
 """
 
-from fastapi import FastAPI, HTTPException, Query, Depends, File, UploadFile, Form, Request
-from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi import FastAPI, HTTPException, Query, Depends, File, UploadFile, Form, Request, Header
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from minio import Minio
 import os
 import asyncio
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import json
-from datetime import datetime, date
+from datetime import datetime
 import hashlib
+import hmac
+import time
+import threading
 import requests
 from pydantic import BaseModel
+from contextlib import asynccontextmanager
 import logging
-
-# 크롤러 모듈 임포트 (선택적)
-try:
-    from crawler import LogoCrawler
-except ImportError as e:
-    LogoCrawler = None
-    logging.warning(f"크롤러 모듈 임포트 실패: {e}")
-
-from PIL import Image, ImageDraw, ImageFont
 import io
 
+from existing_api_client import ExistingAPIClient
+from logo_registry import LogoRegistry, RegistrationBuffer
+from quota import get_quota_ledger, release_all as release_quota_leases
+from job_queue import JobWorkerPool, create_job_queue, split_batches
+from progress_journal import get_journal, add_snapshot_listener, TERMINAL_STATUSES as PROGRESS_TERMINAL_STATUSES
+from job_registry import JobRegistry
+from missing_scan import scan_missing_logos, to_ticker, parse_cursor, format_cursor
+from minio_inventory import MinioInventory, notify_put, notify_remove, split_key
+from content_store import belongs_to, is_cas_key, object_key_of, row_key
+from image_encoder import describe_quality
+from similarity_index import SimilarityIndex
+from storage import create_storage_client
+from tracing import get_trace_store
+import metrics
+import profiler
+from event_log import get_event_logger, setup_logging
+
+# NOTE: crawler(Playwright, fake_useragent), PIL, cairosvg 등 무거운 모듈은
+# 기동 속도를 위해 최초 사용 시점에 임포트한다.
+
+setup_logging()
 logger = logging.getLogger(__name__)
-
-# 기존 API 클라이언트
-class ExistingAPIClient:
-    def __init__(self, base_url: str):
-        self.base_url = base_url.rstrip('/')
-    
-    async def query_table_async(self, schema: str, table: str, params: dict = None):
-        """테이블 쿼리 실행"""
-        try:
-            url = f"{self.base_url}/api/schemas/{schema}/tables/{table}/query"
-            response = requests.get(url, params=params or {}, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"기존 API 쿼리 오류: {e}")
-            return None
-    
-    async def upsert_data_async(self, schema: str, table: str, data: dict):
-        """데이터 삽입/업데이트"""
-        try:
-            url = f"{self.base_url}/api/schemas/{schema}/tables/{table}/upsert"
-            response = requests.post(url, json=data, timeout=10)
-            response.raise_for_status()
-            try:
-                return response.json()
-            except Exception:
-                return {"text": response.text}
-        except Exception as e:
-            logger.error(f"기존 API 데이터 입력 오류: {e}")
-            return None
-
-    def query_table(self, schema: str, table: str, params: dict = None):
-        """테이블 쿼리 실행 (동기)"""
-        try:
-            url = f"{self.base_url}/api/schemas/{schema}/tables/{table}/query"
-            response = requests.get(url, params=params or {}, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"기존 API 쿼리 오류: {e}")
-            return None
-
-    def upsert_data(self, schema: str, table: str, data: dict):
-        """데이터 삽입/업데이트 (동기)"""
-        try:
-            url = f"{self.base_url}/api/schemas/{schema}/tables/{table}/upsert"
-            response = requests.post(url, json=data, timeout=10)
-            response.raise_for_status()
-            try:
-                return response.json()
-            except Exception:
-                return {"text": response.text}
-        except Exception as e:
-            logger.error(f"기존 API 데이터 입력 오류: {e}")
-            print(f"❌ upsert_data 오류 상세: {e}")
-            print(f"❌ URL: {url}")
-            print(f"❌ 데이터: {data}")
-            return None
+# 요청/행 단위 진단은 이벤트 로그(DEBUG, 샘플링)로 기록 - 기본 INFO에서는 레벨 확인만 하고 끝남
+log = get_event_logger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 기동/종료 훅 - 네트워크 의존 초기화는 기동을 막지 않도록 백그라운드로 수행"""
+    bucket_task = asyncio.create_task(ensure_bucket_exists())
+    # 레지스트리가 비어 있으면 기존 진행상황 파일로 1회 색인
+    registry_task = asyncio.create_task(asyncio.to_thread(rebuild_job_registry_if_empty))
+    # MinIO 인벤토리: 디스크 스냅샷 로드 후 주기적으로 전체 목록 갱신
+    inventory_task = asyncio.create_task(run_inventory_refresher())
+    # 이전 프로세스가 스캔 도중 멈춘 미보유 로고 스윕 이어받기 (또는 종료 처리)
+    sweep_task = asyncio.create_task(recover_missing_sweeps())
+    # 작업 큐 워커 (CRAWL_WORKERS=0이면 별도 워커 프로세스(worker.py)에서 소비)
+    worker_pool = None
+    if CRAWL_WORKERS > 0:
+        worker_pool = create_worker_pool(CRAWL_WORKERS)
+        worker_pool.start()
+    app.state.worker_pool = worker_pool
+    try:
+        yield
+    finally:
+        bucket_task.cancel()
+        registry_task.cancel()
+        inventory_task.cancel()
+        sweep_task.cancel()
+        if worker_pool:
+            await asyncio.to_thread(worker_pool.stop)
+        # 미사용 쿼터 임대분 반환
+        await asyncio.to_thread(release_quota_leases)
 
 # FastAPI 앱 초기화
 app = FastAPI(
@@ -94,7 +81,8 @@ app = FastAPI(
     description="주식 로고 수집 및 관리 시스템",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -106,6 +94,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """요청 처리 시간 기록 (handler 레이블 = 엔드포인트 함수 이름)"""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        endpoint = request.scope.get("endpoint")
+        metrics.HTTP_REQUEST_DURATION.labels(
+            handler=getattr(endpoint, "__name__", "unmatched"),
+            method=request.method,
+            status=str(status)
+        ).observe(time.perf_counter() - started)
+
 # 이미지 처리 유틸리티 함수
 def convert_svg_to_png(svg_data: bytes, size: int) -> Optional[bytes]:
     """SVG 데이터를 PNG로 변환"""
@@ -138,6 +143,7 @@ def convert_svg_to_png(svg_data: bytes, size: int) -> Optional[bytes]:
 
 def process_uploaded_image(image_data: bytes, target_size: int = 256, target_format: str = "PNG") -> bytes:
     """업로드된 이미지를 처리하여 지정된 크기와 형식으로 변환"""
+    from PIL import Image
     try:
         logger.info(f"이미지 처리 시작: {len(image_data)} bytes")
         
@@ -190,6 +196,64 @@ def process_uploaded_image(image_data: bytes, target_size: int = 256, target_for
         logger.error(f"이미지 처리 오류: {e}")
         raise HTTPException(status_code=400, detail=f"이미지 처리 실패: {str(e)}")
 
+# 자동 형식(format=auto) 협상 - 저장된 형식 중 선호 순서 (앞일수록 작음)
+NEGOTIATED_FORMATS = ("avif", "webp", "png")
+LOGO_DEFAULT_FORMAT = os.getenv('LOGO_DEFAULT_FORMAT', 'auto').lower()
+
+def parse_accept(accept: Optional[str]) -> Dict[str, float]:
+    """Accept 헤더 → {미디어 범위: q}"""
+    ranges = {}
+    for part in (accept or "").split(","):
+        media, *params = [p.strip() for p in part.split(";")]
+        if not media:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranges[media.lower()] = q
+    return ranges
+
+def accept_quality(accept: Optional[str], fmt: str) -> float:
+    """형식 fmt에 대한 Accept q (0이면 받을 수 없음)
+
+    AVIF/WebP는 Accept에 명시된 경우만 (*/*, image/*만 보내는 클라이언트는 디코딩 못 할 수 있음),
+    PNG는 q=0으로 거부하지 않는 한 항상 가능 (명시되지 않으면 가장 낮은 우선순위).
+    """
+    ranges = parse_accept(accept)
+    mime = f"image/{fmt}"
+    if fmt == "png":
+        return ranges.get(mime, ranges.get("image/*", ranges.get("*/*", 0.001)))
+    return ranges.get(mime, 0.0)
+
+def negotiate_format(accept: Optional[str], available) -> Optional[str]:
+    """Accept 헤더와 저장된 형식으로 응답 형식 선택 (q가 같으면 AVIF > WebP > PNG)
+
+    저장된 형식 중 받을 수 있는 것이 없으면 None
+    """
+    best, best_q = None, 0.0
+    for fmt in NEGOTIATED_FORMATS:
+        if fmt not in available:
+            continue
+        q = accept_quality(accept, fmt)
+        if q > best_q:
+            best, best_q = fmt, q
+    return best
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match가 etag와 일치하는지 (약한 비교, '*' 포함)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
 def validate_image_file(file: UploadFile) -> bool:
     """업로드된 파일이 유효한 이미지인지 검증"""
     if not file.content_type or not file.content_type.startswith('image/'):
@@ -240,177 +304,177 @@ MINIO_BUCKET = _get_env('MINIO_BUCKET', 'logos')
 EXISTING_API_BASE = _get_env('EXISTING_API_BASE', 'http://10.150.2.150:8004')
 LOGO_DEV_DAILY_LIMIT = int(_get_env('LOGO_DEV_DAILY_LIMIT', '5000'))
 
-# MinIO 연결
-minio_client = Minio(
-    MINIO_ENDPOINT,
-    access_key=MINIO_ACCESS_KEY,
-    secret_key=MINIO_SECRET_KEY,
-    secure=False
-)
+# MinIO 연결 (호출 시간/전송 바이트 계측, STORAGE_BACKEND=filesystem이면 로컬 디렉터리)
+minio_client = metrics.instrument_minio(create_storage_client(MINIO_ENDPOINT, MINIO_ACCESS_KEY, MINIO_SECRET_KEY))
 
-# MinIO 버킷 생성 (없으면 생성)
-def ensure_bucket_exists():
-    """MinIO 버킷이 존재하는지 확인하고 없으면 생성"""
+# MinIO 인벤토리 (logo_hash별 객체 키/크기/etag 색인 - 존재 확인 시 네트워크 호출 없음)
+minio_inventory = MinioInventory(minio_client, MINIO_BUCKET, os.getenv('MINIO_INVENTORY_PATH') or None)
+
+# 로고 유사도 색인 (대표 렌디션 dHash - 인벤토리 갱신 뒤 새로 생긴/바뀐 그룹만 해시)
+similarity_index = SimilarityIndex(minio_client, MINIO_BUCKET, os.getenv('SIMILARITY_INDEX_PATH') or None) \
+    if os.getenv('SIMILARITY_INDEX_ENABLED', 'true').lower() == 'true' else None
+
+async def run_inventory_refresher():
+    """인벤토리 스냅샷 로드 + 주기적 갱신 (MINIO_INVENTORY_REFRESH_INTERVAL=0이면 기동 시 1회만)"""
+    await asyncio.to_thread(minio_inventory.load)
+    if similarity_index:
+        await asyncio.to_thread(similarity_index.load)
+    while True:
+        if minio_inventory.is_stale() or not minio_inventory.ready:
+            try:
+                await asyncio.to_thread(minio_inventory.refresh)
+            except Exception as e:
+                print(f"⚠️ MinIO 인벤토리 갱신 실패: {e}")
+            if similarity_index:
+                try:
+                    await asyncio.to_thread(similarity_index.refresh, minio_inventory)
+                except Exception as e:
+                    print(f"⚠️ 유사도 색인 갱신 실패: {e}")
+        if minio_inventory.refresh_interval <= 0 and minio_inventory.ready:
+            return
+        await asyncio.sleep(max(minio_inventory.refresh_interval, 0) or 30)
+
+def object_exists(object_key: str) -> bool:
+    """객체 존재 확인 - 인벤토리에 있으면 바로 True, 없을 때만 stat_object로 확인 (다른 프로세스가 쓴 객체)"""
+    if minio_inventory.exists(object_key):
+        metrics.record_cache("minio_inventory", True)
+        return True
+    metrics.record_cache("minio_inventory", False)
     try:
-        if not minio_client.bucket_exists(MINIO_BUCKET):
-            minio_client.make_bucket(MINIO_BUCKET)
-            print(f"✅ Created MinIO bucket: {MINIO_BUCKET}")
-        else:
-            print(f"✅ MinIO bucket exists: {MINIO_BUCKET}")
-    except Exception as e:
-        print(f"❌ MinIO bucket creation failed: {e}")
+        stat = minio_client.stat_object(MINIO_BUCKET, object_key)
+    except Exception:
+        return False
+    minio_inventory.record_put(object_key, stat.size, stat.etag)
+    return True
+
+# 관리자 API 토큰 (미설정 시 관리자 API 비활성화)
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
 
-# 앱 시작 시 버킷 확인
-ensure_bucket_exists()
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """관리자 API 인증 - X-Admin-Token 헤더가 ADMIN_TOKEN과 일치해야 함"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="ADMIN_TOKEN이 설정되지 않아 관리자 API를 사용할 수 없습니다")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+MINIO_BUCKET_CHECK_RETRIES = int(os.getenv('MINIO_BUCKET_CHECK_RETRIES', '5'))
+MINIO_BUCKET_CHECK_DELAY = float(os.getenv('MINIO_BUCKET_CHECK_DELAY', '1'))
+
+# MinIO 버킷 생성 (없으면 생성)
+async def ensure_bucket_exists(retries: int = MINIO_BUCKET_CHECK_RETRIES, delay: float = MINIO_BUCKET_CHECK_DELAY) -> bool:
+    """MinIO 버킷이 존재하는지 확인하고 없으면 생성 (지수 백오프 재시도)"""
+    for attempt in range(1, retries + 1):
+        try:
+            exists = await asyncio.to_thread(minio_client.bucket_exists, MINIO_BUCKET)
+            if not exists:
+                await asyncio.to_thread(minio_client.make_bucket, MINIO_BUCKET)
+                print(f"✅ Created MinIO bucket: {MINIO_BUCKET}")
+            else:
+                print(f"✅ MinIO bucket exists: {MINIO_BUCKET}")
+            return True
+        except Exception as e:
+            print(f"❌ MinIO bucket check failed ({attempt}/{retries}): {e}")
+            if attempt < retries:
+                await asyncio.sleep(delay * (2 ** (attempt - 1)))
+    return False
 
 # 진행상황 모니터링 디렉토리
 PROGRESS_DIR = Path(os.getenv('PROGRESS_DIR', 'progress'))
 PROGRESS_DIR.mkdir(exist_ok=True)
+PROGRESS_STREAM_POLL_INTERVAL = float(os.getenv('PROGRESS_STREAM_POLL_INTERVAL', '0.5'))  # SSE 저널 확인 주기(초)
 
 # 기존 API 클라이언트 초기화
 existing_api = ExistingAPIClient(EXISTING_API_BASE)
 
-# 쿼터 매니저 클래스
-class QuotaManager:
-    """API 쿼터 관리 클래스"""
-    
-    def __init__(self, api_name: str, daily_limit: int):
-        self.api_name = api_name
-        self.daily_limit = daily_limit
-    
-    def check_and_consume_quota(self, count: int = 1) -> bool:
-        """쿼터 확인 및 소모 (원자적 연산)"""
-        try:
-            today = date.today()
-            
-            # 현재 사용량 조회
-            current_usage = self._get_current_usage(today)
-            
-            if current_usage + count > self.daily_limit:
-                print(f"❌ {self.api_name} 일일 쿼터 초과: {current_usage}/{self.daily_limit} (요청: {count})")
-                return False
-            
-            # 쿼터 소모 (upsert 방식)
-            success = self._consume_quota(today, count)
-            if success:
-                print(f"✅ {self.api_name} 쿼터 소모: {count}건 (총 {current_usage + count}/{self.daily_limit})")
-            return success
-            
-        except Exception as e:
-            print(f"❌ 쿼터 확인 오류: {e}")
-            return False
-    
-    def _get_current_usage(self, target_date: date) -> int:
-        """현재 사용량 조회"""
-        try:
-            response = existing_api.query_table("raw_data", "ext_api_quota", {
-                "date_utc": target_date.isoformat(),
-                "api_name": self.api_name,
-                "limit": 1
-            })
-            
-            if response and 'data' in response and response['data']:
-                return response['data'][0].get('used_count', 0)
-            return 0
-        except Exception as e:
-            print(f"❌ 사용량 조회 오류: {e}")
-            return 0
-    
-    def _consume_quota(self, target_date: date, count: int) -> bool:
-        """쿼터 소모 (upsert)"""
-        try:
-            # upsert 데이터 준비
-            quota_data = {
-                "data": {
-                    "date_utc": target_date.isoformat(),
-                    "api_name": self.api_name,
-                    "used_count": count  # 증가량
-                },
-                "conflict_columns": ["date_utc", "api_name"]
-            }
-            
-            # upsert 실행 (ON CONFLICT 시 used_count += count)
-            result = existing_api.upsert_data("raw_data", "ext_api_quota", quota_data)
-            return result is not None
-            
-        except Exception as e:
-            print(f"❌ 쿼터 소모 오류: {e}")
-            return False
+# 크롤링 작업 큐 (로컬 SQLite 파일, 여러 워커/프로세스가 공유 가능)
+JOB_QUEUE_PATH = Path(os.getenv('JOB_QUEUE_PATH', str(PROGRESS_DIR / 'jobs.sqlite3')))
+JOB_QUEUE_SCHEDULING = os.getenv('JOB_QUEUE_SCHEDULING', 'fifo')
+CRAWL_WORKERS = int(os.getenv('CRAWL_WORKERS', '2'))
+CRAWL_LEASE_BATCH_SIZE = int(os.getenv('CRAWL_LEASE_BATCH_SIZE', '20'))  # 워커가 한 번에 임대하는 종목 수
+# 스캔 진행 기록이 이 시간(초) 이상 없는 열린 스윕은 중단된 것으로 보고 이어받음
+MISSING_SWEEP_STALE_SECONDS = float(os.getenv('MISSING_SWEEP_STALE_SECONDS', '300'))
+job_queue = create_job_queue(JOB_QUEUE_PATH, scheduling=JOB_QUEUE_SCHEDULING)
+
+# 작업 레지스트리 (작업 목록 색인) - 진행상황 스냅샷이 기록될 때마다 갱신
+JOB_REGISTRY_PATH = Path(os.getenv('JOB_REGISTRY_PATH', str(JOB_QUEUE_PATH)))
+job_registry = JobRegistry(JOB_REGISTRY_PATH)
+add_snapshot_listener(job_registry.record)
+
+# 요청과 분리된 백그라운드 작업 (GC 방지용 참조 보관)
+_background_tasks = set()
+
+# logo.dev 쿼터 원장 (블록 임대 후 로컬 소모, crawler와 공유)
+logo_dev_quota = get_quota_ledger("logo_dev", LOGO_DEV_DAILY_LIMIT, existing_api)
 
-# 쿼터 매니저 인스턴스
-logo_dev_quota = QuotaManager("logo_dev", LOGO_DEV_DAILY_LIMIT)
+# 로고 DB 등록기 (logo_hash → logo_id 메모이즈 + logo_files 일괄 upsert)
+logo_registry = LogoRegistry(existing_api)
 
 # 로고 데이터 저장 함수
 def save_logo_data(infomax_code: str, logo_hash: str, file_info: dict) -> bool:
     """로고 데이터를 DB에 저장 (logos -> logo_files 순서)"""
+    return save_logo_files(infomax_code, logo_hash, [file_info])
+
+def save_logo_files(infomax_code: str, logo_hash: str, files: List[dict]) -> bool:
+    """하나의 로고에 속한 모든 파일을 DB에 저장 (logo_id는 해시당 1회만 확보)"""
     try:
-        # 1. logos 테이블에 데이터 입력 또는 기존 데이터 조회
-        # 먼저 기존 데이터가 있는지 확인
-        existing_logo = existing_api.query_table("raw_data", "logos", {
-            "search_column": "logo_hash",
-            "search": logo_hash,
-            "limit": 1
-        })
-        
-        if existing_logo and 'data' in existing_logo and existing_logo['data']:
-            # 기존 데이터가 있으면 해당 logo_id 사용
-            logo_id = existing_logo['data'][0]['logo_id']
-            print(f"✅ 기존 logos 데이터 사용: logo_id={logo_id}, logo_hash={logo_hash}")
+        success = logo_registry.register_files(logo_hash, files)
+        if success:
+            print(f"✅ 로고 데이터 저장 완료: {infomax_code} ({len(files)}개 파일)")
         else:
-            # 기존 데이터가 없으면 새로 생성
-            logo_data = {
-                "data": {
-                    "logo_hash": logo_hash,
-                    "is_deleted": False
-                },
-                "conflict_columns": ["logo_hash"]
-            }
-            
-            print(f"🔍 logos 저장 데이터: {logo_data}")
-            
-            logo_result = existing_api.upsert_data("raw_data", "logos", logo_data)
-            if not logo_result or 'data' not in logo_result:
-                print(f"❌ logos 테이블 저장 실패: {infomax_code}")
-                return False
-            
-            logo_id = logo_result['data']['logo_id']
-            print(f"✅ logos 테이블 저장 성공: logo_id={logo_id}, logo_hash={logo_hash}")
-        
-        # 2. logo_files 테이블에 데이터 입력
-        file_data = {
-            "data": {
-                "logo_id": logo_id,
-                "file_format": file_info["format"],
-                "dimension_width": file_info["width"],
-                "dimension_height": file_info["height"],
-                "file_size": file_info["size"],
-                "minio_object_key": file_info["minio_key"],
-                "data_source": file_info["source"],
-                "upload_type": file_info["upload_type"],
-                "is_original": file_info.get("is_original", True)
-            },
-            "conflict_columns": ["minio_object_key"]
-        }
-        
-        print(f"🔍 logo_files 저장 데이터: {file_data}")
-        
-        file_result = existing_api.upsert_data("raw_data", "logo_files", file_data)
-        if not file_result:
-            print(f"❌ logo_files 테이블 저장 실패: {infomax_code}")
-            print(f"❌ file_result: {file_result}")
-            return False
-        
-        print(f"✅ logo_files 테이블 저장 성공: logo_id={logo_id}")
-        
-        print(f"✅ 로고 데이터 저장 완료: {infomax_code}")
-        return True
+            print(f"❌ 로고 데이터 저장 실패: {infomax_code}")
+        return success
         
     except Exception as e:
         print(f"❌ 로고 데이터 저장 오류: {e}")
         return False
 
-# 기존 API 클라이언트는 이미 위에서 정의됨
-# crawler = LogoCrawler()  # 임시로 비활성화
+def crawled_file_rows(saved_files: List[dict], logo_hash: str) -> List[dict]:
+    """crawler.pop_saved_files 결과 → save_logo_data 형식 (공유 객체는 로고별 행 키)"""
+    return [
+        {
+            "format": f['format'],
+            "source": f['data_source'],
+            "upload_type": "crawled",
+            "width": f['dimension_width'],
+            "height": f['dimension_height'],
+            "size": f['file_size'],
+            "minio_key": row_key(f['object_key'], logo_hash),
+            "is_original": f['is_original'],
+            "quality": f.get('quality')
+        }
+        for f in saved_files
+    ]
+
+def register_crawled_files(infomax_code: str, saved_files: Optional[List[dict]]) -> bool:
+    """단건 크롤링이 저장한 파일 등록 - 등록하지 않으면 cas/ 객체는 어느 행도 가리키지 않는 고아가 됨
+
+    배치 크롤링은 RegistrationBuffer로 모아 등록한다.
+    """
+    if not saved_files:
+        return True
+    logo_hash = get_logo_hash_from_master(infomax_code)
+    return save_logo_files(infomax_code, logo_hash, crawled_file_rows(saved_files, logo_hash))
+
+# 앱 전역 크롤러 (최초 사용 시 1회 생성 후 재사용)
+_crawler_instance = None
+_crawler_lock = threading.Lock()
+
+def get_crawler():
+    """앱 전역 LogoCrawler 인스턴스 반환 (crawler 모듈은 이 시점에 임포트)
+
+    워커 스레드에서도 호출되므로 락을 잡고 한 번 더 확인한 뒤 생성 (인스턴스는 하나만)
+    """
+    global _crawler_instance
+    if _crawler_instance is None:
+        with _crawler_lock:
+            if _crawler_instance is None:
+                try:
+                    from crawler import LogoCrawler
+                except ImportError as e:
+                    logger.warning(f"크롤러 모듈 임포트 실패: {e}")
+                    raise RuntimeError(f"크롤러 모듈이 로딩되지 않았습니다: {e}")
+                _crawler_instance = LogoCrawler(minio_client=minio_client, existing_api=existing_api, quota=logo_dev_quota)
+    return _crawler_instance
 
 def generate_logo_hash(infomax_code: str, source: str = "website") -> str:
     """로고 해시 생성"""
@@ -432,7 +496,7 @@ async def root(request: Request):
 @app.get("/api/v1/test")
 async def test_endpoint():
     """테스트 엔드포인트"""
-    print("🔍🔍🔍 TEST 엔드포인트 호출")
+    log.debug("test_endpoint", "TEST 엔드포인트 호출")
     return {"status": "test", "message": "Test endpoint working"}
 
 @app.get("/api/v1/logos/search")
@@ -470,16 +534,16 @@ async def search_logos(
         # 간단한 테스트를 위해 처음 3개만 처리
         results = []
         for i, master_info in enumerate(master_data[:3]):
-            print(f"🔍 처리 중: {i} - {type(master_info)} - {master_info}")
+            log.debug("search_logos.row", "처리 중", index=i, infomax_code=master_info.get("infomax_code") if isinstance(master_info, dict) else None)
             
             # master_info가 딕셔너리인지 확인
             if not isinstance(master_info, dict):
-                print(f"⚠️ master_info가 딕셔너리가 아님: {type(master_info)} - {master_info}")
+                log.warning("search_logos.bad_row", "master_info가 딕셔너리가 아님", row_type=type(master_info).__name__)
                 continue
                 
             infomax_code = master_info.get("infomax_code")
             if not infomax_code:
-                print(f"⚠️ infomax_code가 없음: {master_info}")
+                log.warning("search_logos.no_code", "infomax_code가 없음", logo_hash=master_info.get("logo_hash"))
                 continue
             
             # logos 테이블에서 해당 infomax_code의 로고 존재 여부 확인
@@ -519,76 +583,85 @@ async def search_logos(
         }
         
     except Exception as e:
-        print(f"❌ 로고 검색 오류: {e}")
+        log.error("search_logos.error", "로고 검색 오류", error=str(e))
         raise HTTPException(status_code=500, detail=f"Search failed: {e}")
 
 @app.get("/api/v1/logos/{infomax_code}")
 # @limiter.limit("30/minute")  # 임시 비활성화
-async def get_logo(request: Request, infomax_code: str, format: str = "png", size: int = 256):
+async def get_logo(request: Request, infomax_code: str, format: Optional[str] = None, size: int = 256):
     # 지원되는 크기: 240px, 300px
     # 요청된 크기가 지원되지 않으면 가장 가까운 크기로 매핑
     supported_sizes = [240, 300]
     if size not in supported_sizes:
         # 가장 가까운 크기 찾기
         size = min(supported_sizes, key=lambda x: abs(x - size))
-    """로고 조회 - 이미지 스트리밍 (메타 조회 → MinIO 객체 바이너리 반환)"""
-    logger.info(f"Logo request: {infomax_code}, format={format}, size={size} from {request.client.host}")
+    """로고 조회 - 이미지 스트리밍 (메타 조회 → MinIO 객체 바이너리 반환)
+
+    format=auto(기본값 LOGO_DEFAULT_FORMAT)면 Accept 헤더로 저장된 형식 중 AVIF > WebP > PNG를 골라 Vary: Accept와 함께 반환.
+    ETag는 객체 etag이며 If-None-Match가 일치하면 본문 없이 304.
+    304 판단은 인벤토리 etag를 힌트로 쓰되 기존 키 형식 객체는 stat_object로 현재 etag를 확인하고,
+    200 응답의 ETag는 실제로 읽은 객체(get_object 응답 헤더)의 것을 쓴다.
+    """
+    format = (format or LOGO_DEFAULT_FORMAT).lower()
+    negotiated = format == "auto"
+    headers = {"Vary": "Accept"} if negotiated else {}
+    log.debug("get_logo.request", "로고 조회", infomax_code=infomax_code, format=format, size=size,
+              client=request.client.host if request.client else None)
     try:
-        print(f"🔍 get_logo 함수 호출됨: infomax_code={infomax_code}, format={format}, size={size}")
         
         # 1. logo_hash 조회 또는 생성 (디버그 플로우와 동일)
         logo_hash = get_logo_hash_from_master(infomax_code)
-        print(f"🔍 logo_hash: {logo_hash}")
         
         # 2. logos 테이블에서 로고 정보 조회
-        print(f"🔍 logos 테이블 조회 시작: logo_hash={logo_hash}")
         logo_response = existing_api.query_table("raw_data", "logos", {
             "search_column": "logo_hash",
             "search": logo_hash,
             "is_deleted": False,
             "limit": 1
         })
-        print(f"🔍 logos 테이블 응답: {logo_response}")
         
         if not logo_response or not logo_response.get('data'):
-            print(f"❌ logos 테이블에서 {logo_hash}를 찾을 수 없음")
+            log.debug("get_logo.no_logo", "logos 테이블에서 찾을 수 없음", infomax_code=infomax_code, logo_hash=logo_hash)
             raise HTTPException(status_code=404, detail="Logo not found in database")
         
         logo_data = logo_response['data'][0]
         logo_id = logo_data.get('logo_id')
-        print(f"🔍 조회된 logo_id: {logo_id}")
         
         # 3. logo_files 테이블에서 해당 logo_id의 파일들 조회
-        print(f"🔍 logo_files 테이블 조회 시작: logo_id={logo_id}")
         file_response = existing_api.query_table("raw_data", "logo_files", {
             "page": 1,
             "size": 100
         })
-        print(f"🔍 logo_files 테이블 응답: {file_response}")
         
         if not file_response or not file_response.get('data'):
-            print(f"❌ logo_files 테이블에서 파일을 찾을 수 없음")
+            log.debug("get_logo.no_files", "logo_files 테이블에서 파일을 찾을 수 없음", infomax_code=infomax_code, logo_id=logo_id)
             raise HTTPException(status_code=404, detail="Logo files not found")
         
         all_files = file_response['data']
-        print(f"🔍 전체 파일 수: {len(all_files)}개")
+        log.debug("get_logo.files", "logo_files 조회", infomax_code=infomax_code, logo_hash=logo_hash, logo_id=logo_id, rows=len(all_files))
         
-        # 4. 조건에 맞는 파일 찾기
-        found_file = None
-        for f in all_files:
+        # 4. 조건에 맞는 파일 찾기 (같은 포맷/크기 행이 여럿이면 가장 최근 행 - 재크롤링/수정으로 추가된 행)
+        sized = [
+            f for f in all_files
             if (f.get('logo_id') == logo_id and 
-                f.get('file_format') == format and 
                 f.get('dimension_width') == size and
-                str(f.get('minio_object_key','')).startswith(logo_hash)):
-                found_file = f
-                print(f"🔍 조건에 맞는 파일 발견: {f.get('minio_object_key')}")
-                break
+                belongs_to(f.get('minio_object_key'), logo_hash))
+        ]
+        if negotiated:
+            # 자동 형식: 이 크기로 저장된 형식 중 클라이언트가 받을 수 있는 가장 작은 형식 (없으면 PNG - SVG 실시간 변환)
+            accept = request.headers.get("accept")
+            format = negotiate_format(accept, {f.get('file_format') for f in sized})
+            if format is None:
+                if accept_quality(accept, "png") <= 0:
+                    raise HTTPException(status_code=406, detail="No acceptable logo format (png, webp, avif)", headers=headers)
+                format = "png"
+        matches = [f for f in sized if f.get('file_format') == format]
+        found_file = max(matches, key=lambda f: f.get('file_id') or 0) if matches else None
         
         if not found_file:
-            print(f"❌ 조건에 맞는 파일을 찾을 수 없음: logo_id={logo_id}, format={format}, size={size}")
-            # 사용 가능한 파일들 출력
             available_files = [f for f in all_files if f.get('logo_id') == logo_id]
-            print(f"🔍 사용 가능한 파일들: {[f.get('minio_object_key') for f in available_files]}")
+            log.debug("get_logo.no_match", "조건에 맞는 파일 없음", infomax_code=infomax_code, logo_id=logo_id,
+                      format=format, size=size, available=len(available_files))
             
             # SVG 원본이 있으면 실시간 변환 시도
             svg_file = None
@@ -598,10 +671,10 @@ async def get_logo(request: Request, infomax_code: str, format: str = "png", siz
                     break
             
             if svg_file:
-                print(f"🔍 SVG 원본 발견, 실시간 변환 시도: {svg_file.get('minio_object_key')}")
+                log.debug("get_logo.svg_convert", "SVG 원본 실시간 변환", object_key=svg_file.get('minio_object_key'), size=size)
                 try:
                     # SVG 파일을 MinIO에서 가져오기
-                    svg_obj = minio_client.get_object(MINIO_BUCKET, svg_file.get('minio_object_key'))
+                    svg_obj = minio_client.get_object(MINIO_BUCKET, object_key_of(svg_file.get('minio_object_key')))
                     svg_data = svg_obj.read()
                     svg_obj.close()
                     svg_obj.release_conn()
@@ -609,60 +682,75 @@ async def get_logo(request: Request, infomax_code: str, format: str = "png", siz
                     # SVG를 PNG로 변환
                     converted_data = convert_svg_to_png(svg_data, size)
                     if converted_data:
-                        print(f"✅ SVG → PNG 변환 성공: {size}px")
                         content_type = f"image/{format.lower()}"
-                        return Response(content=converted_data, media_type=content_type)
-                    else:
-                        print(f"❌ SVG → PNG 변환 실패")
+                        return Response(content=converted_data, media_type=content_type, headers=headers)
+                    log.warning("get_logo.svg_convert_failed", "SVG → PNG 변환 실패", infomax_code=infomax_code, size=size)
                 except Exception as e:
-                    print(f"❌ SVG 변환 중 오류: {e}")
+                    log.warning("get_logo.svg_convert_error", "SVG 변환 중 오류", infomax_code=infomax_code, error=str(e))
             
             raise HTTPException(status_code=404, detail="Logo file not found")
         
         file_info = found_file
-        object_key = file_info.get('minio_object_key')
+        object_key = object_key_of(file_info.get('minio_object_key'))
         if not object_key:
             raise HTTPException(status_code=404, detail="Object key not found")
         
-        print(f"🔍 최종 선택된 파일: {object_key}")
         
         # 5. MinIO에서 파일 조회
-        try:
-            minio_client.stat_object(MINIO_BUCKET, object_key)
-            print(f"✅ MinIO 객체 존재 확인: {object_key}")
-        except Exception as e:
-            print(f"❌ MinIO 객체 없음: {e}")
-            # 사용 가능한 객체들 출력
-            try:
-                print(f"🔎 prefix 목록: {logo_hash}")
-                for o in minio_client.list_objects(MINIO_BUCKET, prefix=logo_hash):
-                    print(f"  - {o.object_name}")
-            except Exception as e2:
-                print(f"❌ list_objects 실패: {e2}")
+        if not await asyncio.to_thread(object_exists, object_key):
+            # 사용 가능한 객체 (인벤토리 기준)
+            log.warning("get_logo.object_missing", "MinIO 객체 없음", object_key=object_key,
+                        available=sorted(minio_inventory.objects(split_key(object_key)[0])))
             raise HTTPException(status_code=404, detail=f"MinIO object not found: {object_key}")
         
-        # 6. 파일 스트리밍 반환
+        # 6. 조건부 요청 - 객체 etag가 그대로면 본문 없이 304 (형식마다 객체가 다르므로 표현별로 구분됨)
+        if_none_match = request.headers.get("if-none-match")
+        entry = minio_inventory.stat(object_key)
+        if if_none_match and entry and entry[1] and etag_matches(if_none_match, f'"{entry[1]}"'):
+            etag = entry[1]
+            if not is_cas_key(object_key):
+                # 기존 키 형식({logo_hash}_{size}.{fmt})은 다른 레플리카/worker가 덮어쓸 수 있어 인벤토리 etag를 그대로 믿지 않음
+                try:
+                    stat = await asyncio.to_thread(minio_client.stat_object, MINIO_BUCKET, object_key)
+                    minio_inventory.record_put(object_key, stat.size, stat.etag)
+                    etag = (stat.etag or "").strip('"')
+                except Exception:
+                    etag = None
+            if etag and etag_matches(if_none_match, f'"{etag}"'):
+                metrics.record_cache("http_etag", True)
+                return Response(status_code=304, headers={**headers, "ETag": f'"{etag}"'})
+        
+        # 7. 파일 스트리밍 반환 (ETag는 읽은 객체의 것)
         obj = minio_client.get_object(MINIO_BUCKET, object_key)
         content_type = f"image/{format.lower()}"
         data = obj.read()
+        etag = (obj.headers.get("ETag") or "").strip('"')
         obj.close()
         obj.release_conn()
-        
-        print(f"✅ 로고 반환 완료: {len(data)} bytes")
-        return Response(content=data, media_type=content_type)
+        if etag:
+            headers["ETag"] = f'"{etag}"'
+            if not entry or entry[1] != etag:
+                # 다른 프로세스가 덮어쓴 객체 - 인벤토리도 갱신
+                minio_inventory.record_put(object_key, len(data), etag)
+            if if_none_match:
+                not_modified = etag_matches(if_none_match, headers["ETag"])
+                metrics.record_cache("http_etag", not_modified)
+                if not_modified:
+                    return Response(status_code=304, headers=headers)
+        
+        log.debug("get_logo.served", "로고 반환", object_key=object_key, bytes=len(data), format=format)
+        return Response(content=data, media_type=content_type, headers=headers)
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ get_logo 오류: {e}")
-        import traceback
-        print(f"📋 상세 오류: {traceback.format_exc()}")
+        log.error("get_logo.error", "get_logo 오류", exc_info=True, infomax_code=infomax_code, error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/crawl/test")
 async def crawl_test():
     """크롤링 테스트 엔드포인트"""
-    print("🔍🔍🔍 CRAWL TEST 엔드포인트 호출")
+    log.debug("crawl_test", "CRAWL TEST 엔드포인트 호출")
     return {"status": "test", "message": "Crawl test endpoint working"}
 
 @app.get("/api/v1/logo-info")
@@ -675,7 +763,8 @@ async def get_logo_by_criteria(
 ):
     """서비스에서 사용할 로고 조회 API - 기존 API를 통해 데이터 조회"""
     
-    print(f"🔍 get_logo_by_criteria 함수 호출됨: infomax_code={infomax_code}, fs_regional_id={fs_regional_id}, fs_entity_id={fs_entity_id}")
+    log.debug("get_logo_by_criteria.request", "로고 정보 조회", infomax_code=infomax_code,
+              fs_regional_id=fs_regional_id, fs_entity_id=fs_entity_id)
     # 크기 매핑: 300px -> 256px (실제 저장된 표준 크기에 맞춤)
     if size == 300:
         size = 256
@@ -724,7 +813,7 @@ async def get_logo_by_criteria(
                             if (f.get('logo_id') == logo_data[0]["logo_id"] and 
                                 f.get('file_format') == format and 
                                 f.get('dimension_width') == size and
-                                str(f.get('minio_object_key','')).startswith(logo_data[0]["logo_hash"])):
+                                belongs_to(f.get('minio_object_key'), logo_data[0]["logo_hash"])):
                                 found_file = f
                                 break
                         
@@ -748,7 +837,8 @@ async def get_logo_by_criteria(
                                 "minio_object_key": file_info.get('minio_object_key'),
                                 "dimension_width": file_info.get('dimension_width'),
                                 "dimension_height": file_info.get('dimension_height'),
-                                "quality": file_info.get('quality')
+                                "quality": file_info.get('quality'),
+                                "encoding": describe_quality(file_info.get('file_format'), file_info.get('quality'))
                             },
                             "logo_info": {
                                 "logo_id": logo_data[0].get('logo_id'),
@@ -791,8 +881,8 @@ async def get_logo_by_criteria(
             files = files_response['data'] or []
         else:
             files = files_response or []
-        # 동일 해시 prefix만 사용
-        files = [f for f in files if isinstance(f, dict) and str(f.get('minio_object_key','')).startswith(logo_hash)]
+        # 동일 해시의 행만 사용 (기존 키: 해시 접두사, 공유 객체: '#logo_hash')
+        files = [f for f in files if isinstance(f, dict) and belongs_to(f.get('minio_object_key'), logo_hash)]
         # 후보 선택: 정확 매칭 → 포맷만 매칭 → 첫 번째
         file_info = None
         for f in files:
@@ -824,7 +914,8 @@ async def get_logo_by_criteria(
                 "minio_object_key": file_info.get('minio_object_key'),
                 "dimension_width": file_info.get('dimension_width'),
                 "dimension_height": file_info.get('dimension_height'),
-                "quality": file_info.get('quality')
+                "quality": file_info.get('quality'),
+                "encoding": describe_quality(file_info.get('file_format'), file_info.get('quality'))
             },
             "logo_info": {
                 "logo_id": logo_data[0].get('logo_id'),
@@ -838,23 +929,112 @@ async def get_logo_by_criteria(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/v1/traces")
+async def list_slowest_traces(
+    job_id: Optional[str] = None,
+    outcome: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=500),
+    spans: bool = True
+):
+    """소요 시간이 긴 크롤링 트레이스 (전체 또는 작업별)"""
+    traces = await asyncio.to_thread(get_trace_store().slowest, job_id, outcome, limit, spans)
+    return {"job_id": job_id, "count": len(traces), "traces": traces}
+
+@app.get("/api/v1/traces/stats")
+async def get_trace_stats(job_id: str):
+    """작업의 span 이름별 소요 시간 통계 (합계 내림차순) - 느린 구간 찾기용"""
+    stats = await asyncio.to_thread(get_trace_store().span_stats, job_id)
+    if not stats:
+        raise HTTPException(status_code=404, detail="Traces not found")
+    return {"job_id": job_id, "spans": stats}
+
+@app.get("/api/v1/traces/{infomax_code}")
+async def get_code_traces(
+    infomax_code: str,
+    job_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    spans: bool = True
+):
+    """종목 코드의 크롤링 트레이스 (최신순)"""
+    traces = await asyncio.to_thread(get_trace_store().by_code, infomax_code, job_id, limit, spans)
+    return {"infomax_code": infomax_code, "count": len(traces), "traces": traces}
+
 @app.get("/api/v1/progress/{job_id}")
 async def get_progress(job_id: str):
-    """작업 진행상황 조회"""
-    progress_file = PROGRESS_DIR / f"{job_id}.json"
+    """작업 진행상황 조회 (저널 메모리 집계)"""
+    journal = get_journal(job_id, PROGRESS_DIR)
     
-    if not progress_file.exists():
+    if not journal.exists():
         raise HTTPException(status_code=404, detail="Job not found")
     
     try:
-        with open(progress_file, 'r', encoding='utf-8') as f:
-            progress_data = json.load(f)
-        
-        return progress_data
+        return journal.aggregate()
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def format_sse(data: Dict, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    """Server-Sent Events 메시지 1건 직렬화"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+@app.get("/api/v1/progress/{job_id}/stream")
+async def stream_progress(
+    job_id: str,
+    request: Request,
+    offset: int = Query(0, ge=0, description="이 번호의 저널 이벤트부터 전송"),
+    aggregate_interval: float = Query(5.0, gt=0, description="집계 전송 주기(초)")
+):
+    """작업 진행상황 스트리밍 (Server-Sent Events)
+    
+    - 저널 이벤트(update/item)를 id=이벤트 번호로 전송하고, aggregate_interval마다 집계(aggregate)를 보낸다.
+    - 재연결 시 Last-Event-ID 헤더(또는 offset)로 이어받는다.
+    - 작업이 종료 상태가 되면 마지막 집계와 end 이벤트를 보내고 연결을 닫는다.
+    """
+    journal = get_journal(job_id, PROGRESS_DIR)
+    if not journal.exists():
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        offset = int(last_event_id) + 1
+    
+    async def event_stream():
+        next_offset, position = offset, None
+        last_aggregate = 0.0
+        status = None
+        loop = asyncio.get_running_loop()
+        while True:
+            if await request.is_disconnected():
+                break
+            events, next_offset, position = await asyncio.to_thread(journal.read_events, next_offset, position)
+            for event in events:
+                yield format_sse(event, event=event.get("type"), event_id=event["offset"])
+            
+            if events or loop.time() - last_aggregate >= aggregate_interval:
+                summary = await asyncio.to_thread(journal.summary)
+                # 집계에는 id를 붙이지 않아 Last-Event-ID가 저널 위치만 가리키도록 함
+                yield format_sse(summary, event="aggregate")
+                last_aggregate = loop.time()
+                status = summary.get("status")
+            
+            if status in PROGRESS_TERMINAL_STATUSES and not events:
+                yield format_sse({"job_id": job_id, "status": status}, event="end")
+                break
+            
+            await asyncio.sleep(PROGRESS_STREAM_POLL_INTERVAL)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/v1/stats")
 async def get_stats():
     """시스템 통계 조회 - 기존 API를 통해 데이터 조회"""
@@ -915,6 +1095,20 @@ async def get_stats():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 메트릭 (큐 깊이/쿼터 잔량은 조회 시점에 갱신)"""
+    try:
+        metrics.set_queue_depth(await asyncio.to_thread(job_queue.depth))
+    except Exception as e:
+        print(f"⚠️ 큐 깊이 조회 실패: {e}")
+    try:
+        metrics.set_quota_remaining("logo_dev", await asyncio.to_thread(logo_dev_quota.remaining))
+    except Exception as e:
+        print(f"⚠️ 쿼터 잔량 조회 실패: {e}")
+    body, content_type = metrics.render_latest()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/api/v1/health")
 async def health_check():
     """헬스 체크"""
@@ -1056,9 +1250,37 @@ async def debug_list_files(infomax_code: str):
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
+@app.get("/api/v1/debug/inventory")
+async def debug_inventory(refresh: bool = False):
+    """MinIO 인벤토리 상태 (refresh=true면 버킷 전체 목록으로 즉시 갱신)"""
+    if refresh:
+        await asyncio.to_thread(minio_inventory.refresh)
+    return minio_inventory.stats()
+
 @app.get("/api/v1/debug/minio")
-async def debug_minio_check(object_key: str):
-    """MinIO 객체 존재 여부 및 메타데이터 확인"""
+async def debug_minio_check(object_key: str, live: bool = False):
+    """MinIO 객체 존재 여부 및 메타데이터 확인 (기본: 인벤토리, live=true면 MinIO 직접 조회)"""
+    object_key = object_key_of(object_key)
+    if not live and minio_inventory.ready:
+        entry = minio_inventory.stat(object_key)
+        if entry:
+            return {
+                "status": "exists",
+                "object_key": object_key,
+                "bucket": MINIO_BUCKET,
+                "size": entry[0],
+                "etag": entry[1],
+                "source": "inventory",
+                "inventory_refreshed_at": minio_inventory.refreshed_at
+            }
+        return {
+            "status": "not_found",
+            "object_key": object_key,
+            "bucket": MINIO_BUCKET,
+            "source": "inventory",
+            "inventory_refreshed_at": minio_inventory.refreshed_at,
+            "available_objects": list(minio_inventory.objects(split_key(object_key)[0]))[:10]
+        }
     try:
         # MinIO 객체 존재 확인
         stat = minio_client.stat_object(MINIO_BUCKET, object_key)
@@ -1095,24 +1317,19 @@ async def debug_minio_check(object_key: str):
 async def get_crawl_status(job_id: str):
     """크롤링 작업 상태 확인"""
     try:
-        # 진행상황 파일 경로
-        progress_file = PROGRESS_DIR / f"{job_id}.json"
+        journal = get_journal(job_id, PROGRESS_DIR)
         
-        if not progress_file.exists():
+        if not journal.exists():
             return {
                 "status": "not_found",
                 "job_id": job_id,
                 "message": "Job not found"
             }
         
-        # 진행상황 파일 읽기
-        with open(progress_file, 'r', encoding='utf-8') as f:
-            progress_data = json.load(f)
-        
         return {
             "status": "found",
             "job_id": job_id,
-            "progress": progress_data
+            "progress": journal.aggregate()
         }
         
     except Exception as e:
@@ -1123,35 +1340,32 @@ async def get_crawl_status(job_id: str):
         }
 
 @app.get("/api/v1/crawl/jobs")
-async def list_crawl_jobs():
-    """모든 크롤링 작업 목록 조회"""
+async def list_crawl_jobs(
+    status: Optional[str] = None,
+    type: Optional[str] = Query(None, description="작업 유형 (crawl, missing)"),
+    created_from: Optional[str] = Query(None, description="생성 시각 하한 (ISO 8601)"),
+    created_to: Optional[str] = Query(None, description="생성 시각 상한 (ISO 8601)"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
+    """크롤링 작업 목록 조회 (작업 레지스트리 색인 기반, 최신순)"""
     try:
-        jobs = []
-        for progress_file in PROGRESS_DIR.glob("*.json"):
-            try:
-                with open(progress_file, 'r', encoding='utf-8') as f:
-                    progress_data = json.load(f)
-                
-                jobs.append({
-                    "job_id": progress_file.stem,
-                    "status": progress_data.get("status", "unknown"),
-                    "created_at": progress_data.get("created_at"),
-                    "total_items": progress_data.get("total_items", 0),
-                    "processed_items": progress_data.get("processed_items", 0),
-                    "successful_items": progress_data.get("successful_items", 0),
-                    "failed_items": progress_data.get("failed_items", 0)
-                })
-            except Exception as e:
-                print(f"⚠️ 진행상황 파일 읽기 실패: {progress_file} - {e}")
-                continue
-        
-        # 생성 시간 기준으로 정렬 (최신순)
-        jobs.sort(key=lambda x: x.get("created_at") or "", reverse=True)
+        result = await asyncio.to_thread(
+            job_registry.list_jobs,
+            status=status,
+            job_type=type,
+            created_from=created_from,
+            created_to=created_to,
+            limit=limit,
+            offset=offset
+        )
         
         return {
             "status": "success",
-            "total_jobs": len(jobs),
-            "jobs": jobs
+            "total_jobs": result["total"],
+            "limit": limit,
+            "offset": offset,
+            "jobs": result["jobs"]
         }
         
     except Exception as e:
@@ -1228,21 +1442,13 @@ async def debug_logo_flow(infomax_code: str):
                 files = files_response['data']
                 for f in files:
                     if f.get('minio_object_key'):
-                        try:
-                            stat = minio_client.stat_object(MINIO_BUCKET, f['minio_object_key'])
-                            result["steps"].append({
-                                "step": "minio_check",
-                                "object_key": f['minio_object_key'],
-                                "exists": True,
-                                "size": stat.size
-                            })
-                        except Exception as e:
-                            result["steps"].append({
-                                "step": "minio_check",
-                                "object_key": f['minio_object_key'],
-                                "exists": False,
-                                "error": str(e)
-                            })
+                        entry = minio_inventory.stat(object_key_of(f['minio_object_key']))
+                        result["steps"].append({
+                            "step": "minio_check",
+                            "object_key": f['minio_object_key'],
+                            "exists": entry is not None,
+                            "size": entry[0] if entry else None
+                        })
         
         return result
         
@@ -1260,6 +1466,7 @@ async def debug_seed_file(infomax_code: str, size: int = 256, format: str = "png
         logo_hash = master["data"][0].get("logo_hash")
 
         # 간단 이미지 생성
+        from PIL import Image
         img = Image.new("RGB", (size, size), color=(173, 216, 230))
         buffer = io.BytesIO()
         fmt = format.upper()
@@ -1273,13 +1480,14 @@ async def debug_seed_file(infomax_code: str, size: int = 256, format: str = "png
 
         # MinIO 업로드
         object_key = f"{logo_hash}_{size}.{format.lower()}"
-        minio_client.put_object(
+        written = minio_client.put_object(
             MINIO_BUCKET,
             object_key,
             io.BytesIO(data),
             length=len(data),
             content_type=f"image/{format.lower()}"
         )
+        notify_put(MINIO_BUCKET, object_key, len(data), written.etag)
 
         # logos upsert 보장
         logo_upsert = existing_api.upsert_data("raw_data", "logos", {
@@ -1393,11 +1601,14 @@ async def crawl_single_logo(request: Request, crawl_request: CrawlSingleRequest)
     """단일 로고 크롤링 - 실제 크롤링 실행 후 결과 반환 (간단 동기)"""
     logger.info(f"Crawl request: {crawl_request.infomax_code} from {request.client.host}")
     try:
-        # 크롤러 인스턴스 생성
-        crawler = LogoCrawler()
+        crawler = get_crawler()
         ok = await crawler.crawl_logo(crawl_request.infomax_code, crawl_request.ticker, crawl_request.api_domain)
+        # 업로드한 객체를 logo_files에 등록 (현재 그룹으로 기록된 유사도 색인과도 일치)
+        registered = await asyncio.to_thread(
+            register_crawled_files, crawl_request.infomax_code, crawler.pop_saved_files(crawl_request.infomax_code)
+        )
         return {
-            "status": "success" if ok else "failed",
+            "status": "success" if ok and registered else "failed",
             "infomax_code": crawl_request.infomax_code,
             "ticker": crawl_request.ticker,
             "api_domain": crawl_request.api_domain
@@ -1415,6 +1626,7 @@ class TickerInfo(BaseModel):
 class CrawlBatchRequest(BaseModel):
     tickers: List[TickerInfo]
     job_id: Optional[str] = None
+    priority: int = 0
 
 @app.post("/api/v1/crawl/batch")
 async def crawl_batch_logos(request: CrawlBatchRequest):
@@ -1422,24 +1634,31 @@ async def crawl_batch_logos(request: CrawlBatchRequest):
     try:
         tickers_data = [{"infomax_code": t.infomax_code, "ticker": t.ticker, "api_domain": t.api_domain} for t in request.tickers]
         
-        # 쿼터 체크 (logo.dev 사용 예상량)
+        # 쿼터 체크 (logo.dev 사용 예상량, 실제 소모는 호출 시점에 원장에서 차감)
         logo_dev_count = sum(1 for t in tickers_data if t.get('api_domain') == 'logo_dev')
+        quota_skipped = 0
         if logo_dev_count > 0:
-            if not logo_dev_quota.check_and_consume_quota(logo_dev_count):
+            if not await asyncio.to_thread(logo_dev_quota.has_budget, logo_dev_count):
                 print(f"⚠️ logo.dev 쿼터 부족으로 {logo_dev_count}건 스킵")
                 # logo.dev 항목 제거하고 다른 소스만 처리
                 tickers_data = [t for t in tickers_data if t.get('api_domain') != 'logo_dev']
+                quota_skipped = logo_dev_count
         
         if not tickers_data:
             return {"status": "no_quota", "message": "No items available after quota check"}
         
-        # result_job_id = await crawler.crawl_batch(tickers_data, request.job_id)
-        result_job_id = "test_job_id"  # 임시로 비활성화
+        # 작업 큐에 등록 후 즉시 반환 (실행은 워커가 담당)
+        result_job_id = submit_crawl_job(
+            tickers_data,
+            request.job_id or f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            kind="crawl",
+            priority=request.priority
+        )
         return {
             "status": "started", 
             "job_id": result_job_id, 
-            "message": f"Batch crawling started for {len(tickers_data)} items",
-            "quota_skipped": logo_dev_count if logo_dev_count > 0 and not logo_dev_quota.check_and_consume_quota(0) else 0
+            "message": f"Batch crawling queued for {len(tickers_data)} items",
+            "quota_skipped": quota_skipped
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1450,196 +1669,369 @@ async def crawl_missing_logos(
     fs_exchange: Optional[str] = None,
     country: Optional[str] = None,
     is_active: Optional[bool] = None,
-    prefix: Optional[str] = None
+    prefix: Optional[str] = None,
+    priority: int = 0,
+    cursor: Optional[str] = None
 ):
-    """로고가 없는 종목들 크롤링 - 스트리밍 처리로 메모리 효율적"""
+    """로고가 없는 종목들 크롤링 - 커서 기반 스캔 (응답의 next_cursor로 이어서 요청)"""
     try:
-        # 스트리밍으로 미보유 종목 수집
-        missing_items = await collect_missing_logos_streaming(
+        # 커서 위치부터 미보유 종목 수집
+        missing_items, next_cursor = await collect_missing_logos_streaming(
             limit=limit,
             fs_exchange=fs_exchange,
             country=country,
             is_active=is_active,
-            prefix=prefix
+            prefix=prefix,
+            cursor=cursor
         )
         
         if not missing_items:
-            return {"status": "no_missing", "message": "No missing logos found with given filters"}
+            return {"status": "no_missing", "message": "No missing logos found with given filters", "next_cursor": next_cursor}
         
         print(f"🔍 미보유 종목 {len(missing_items)}개 발견")
         
         # 크롤링할 데이터 준비
-        tickers = []
-        for item in missing_items:
-            infomax_code = item['infomax_code']
-            crawling_ticker = item.get('crawling_ticker', infomax_code)
-            api_domain = item.get('api_domain', 'website')
-            
-            tickers.append({
-                "infomax_code": infomax_code,
-                "ticker": crawling_ticker,
-                "api_domain": api_domain
-            })
+        tickers = [to_ticker(item) for item in missing_items]
         
-        # 쿼터 체크 (logo.dev 사용 예상량)
+        # 쿼터 체크 (logo.dev 사용 예상량, 실제 소모는 호출 시점에 원장에서 차감)
         logo_dev_count = sum(1 for t in tickers if t.get('api_domain') == 'logo_dev')
+        quota_skipped = 0
         if logo_dev_count > 0:
-            if not logo_dev_quota.check_and_consume_quota(logo_dev_count):
+            if not await asyncio.to_thread(logo_dev_quota.has_budget, logo_dev_count):
                 print(f"⚠️ logo.dev 쿼터 부족으로 {logo_dev_count}건 스킵")
                 # logo.dev 항목 제거하고 다른 소스만 처리
                 tickers = [t for t in tickers if t.get('api_domain') != 'logo_dev']
+                quota_skipped = logo_dev_count
         
         if not tickers:
             return {"status": "no_quota", "message": "No items available after quota check"}
         
-        # 배치 크롤링 시작 (백그라운드 작업으로 즉시 반환)
-        job_id = f"missing_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        # 진행상황 파일 생성
-        progress_data = {
-            "job_id": job_id,
-            "status": "running",
-            "created_at": datetime.now().isoformat(),
-            "total_items": len(tickers),
-            "processed_items": 0,
-            "successful_items": 0,
-            "failed_items": 0,
-            "items": []
-        }
-        
-        # 진행상황 파일 저장
-        progress_file = PROGRESS_DIR / f"{job_id}.json"
-        with open(progress_file, 'w', encoding='utf-8') as f:
-            json.dump(progress_data, f, ensure_ascii=False, indent=2)
-        
-        print(f"🔍 크롤링 작업 시작: {job_id}")
-        print(f"📊 크롤링 대상: {len(tickers)}개 종목")
-        
-        # 실제 크롤링 작업 수행 (백그라운드)
-        import asyncio
-        import threading
-        
-        def run_crawl():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(execute_crawl_batch(tickers, job_id))
-            loop.close()
-        
-        thread = threading.Thread(target=run_crawl, daemon=True)
-        thread.start()
+        # 배치 크롤링 작업 등록 (작업 큐에 넣고 즉시 반환)
+        job_id = submit_crawl_job(
+            tickers,
+            f"missing_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            kind="missing",
+            priority=priority
+        )
 
         return {
             "status": "started",
             "job_id": job_id,
-            "message": f"Missing logos crawling started for {len(tickers)} items",
+            "message": f"Missing logos crawling queued for {len(tickers)} items",
             "filters_applied": {
                 "fs_exchange": fs_exchange,
                 "country": country,
                 "is_active": is_active,
                 "prefix": prefix
             },
-            "quota_skipped": logo_dev_count if logo_dev_count > 0 and not logo_dev_quota.check_and_consume_quota(0) else 0
+            "quota_skipped": quota_skipped,
+            "next_cursor": next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-async def collect_missing_logos_streaming(
-    limit: int = 100,
+@app.post("/api/v1/crawl/missing/sweep")
+async def sweep_missing_logos(
     fs_exchange: Optional[str] = None,
     country: Optional[str] = None,
     is_active: Optional[bool] = None,
-    prefix: Optional[str] = None
-) -> List[Dict]:
-    """스트리밍으로 미보유 로고 수집 - 메모리 효율적 (랜덤 페이지 샘플링)"""
-    import random
+    prefix: Optional[str] = None,
+    priority: int = 0,
+    cursor: Optional[str] = None,
+    concurrency: Optional[int] = Query(None, ge=1, le=32)
+):
+    """미보유 로고 전체 스윕 - 작업을 먼저 만들고 스캔 결과를 백그라운드에서 작업 큐로 흘려보냄"""
+    try:
+        parse_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    collected = []
-    size = 100  # 한 번에 가져올 최대 수 (API 제한)
+    filters = {"fs_exchange": fs_exchange, "country": country, "is_active": is_active, "prefix": prefix}
+    job_id = submit_crawl_job(
+        [],
+        f"missing_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        kind="missing",
+        priority=priority,
+        sealed=False
+    )
+    get_journal(job_id, PROGRESS_DIR).update(
+        scan_status="running",
+        scan_filters=filters,
+        scan_start_cursor=cursor,
+        scan_concurrency=concurrency,
+        scan_heartbeat_at=time.time()
+    )
+    start_missing_sweep(job_id, filters, cursor=cursor, concurrency=concurrency)
     
-    # 필터 조건 준비
-    filters = {
-        "fs_exchange": fs_exchange,
-        "country": country,
-        "is_active": is_active,
-        "prefix": prefix
+    return {
+        "status": "started",
+        "job_id": job_id,
+        "message": "Missing logos sweep started; items are queued as pages are scanned",
+        "filters_applied": filters
     }
+
+def submit_crawl_job(tickers: List[Dict], job_id: str, kind: str, priority: int = 0, sealed: bool = True) -> str:
+    """크롤링 작업 등록 - 진행상황 파일 생성 후 작업 큐에 넣음"""
+    # 같은 초에 등록된 작업과 job_id가 겹치지 않도록 접미사 부여
+    base_job_id, n = job_id, 1
+    while job_queue.get(job_id) is not None and job_queue.get(job_id)["status"] in ("queued", "running"):
+        n += 1
+        job_id = f"{base_job_id}_{n}"
     
-    # 전체 페이지 수 확인 (조건에 맞는 총 페이지 수)
-    print(f"🎲 랜덤 페이지 샘플링 시작...")
+    # 진행상황 저널 생성
+    get_journal(job_id, PROGRESS_DIR).create({
+        "job_id": job_id,
+        "type": kind,
+        "status": "queued",
+        "created_at": datetime.now().isoformat(),
+        "total_items": len(tickers),
+        "processed_items": 0,
+        "successful_items": 0,
+        "failed_items": 0
+    })
     
-    # 조건에 맞는 총 페이지 수 확인
-    if prefix:
-        print(f"   prefix '{prefix}' 조건으로 총 페이지 수 확인...")
-        total_response = existing_api.query_table("raw_data", "logo_master_with_status", {
-            "search": prefix,
-            "search_column": "infomax_code",
-            "limit": 1
-        })
-    else:
-        print(f"   전체 데이터 조건으로 총 페이지 수 확인...")
-        total_response = existing_api.query_table("raw_data", "logo_master_with_status", {
-            "limit": 1
-        })
+    job_queue.enqueue(job_id, kind, {"tickers": tickers}, priority=priority, items=crawl_work_items(tickers), sealed=sealed)
     
-    total_pages = total_response.get('total_pages', 1)
-    print(f"   📊 조건에 맞는 전체 페이지 수: {total_pages}")
-    
-    # 랜덤하게 페이지들을 선택 (limit의 1/10만큼 페이지 선택, 최소 1개, 최대 전체 페이지 수)
-    pages_to_sample = max(1, min(limit // 10, total_pages))
-    selected_pages = random.sample(range(1, total_pages + 1), pages_to_sample)
-    print(f"   🎯 랜덤 선택된 페이지: {sorted(selected_pages)} (총 {len(selected_pages)}개)")
+    print(f"🔍 크롤링 작업 등록: {job_id} (우선순위: {priority})")
+    print(f"📊 크롤링 대상: {len(tickers)}개 종목")
+    return job_id
+
+def rebuild_job_registry_if_empty():
+    if job_registry.count() == 0:
+        count = job_registry.rebuild(PROGRESS_DIR)
+        if count:
+            print(f"✅ 작업 레지스트리 색인: {count}건")
+
+def crawl_work_items(tickers: List[Dict]) -> List[Dict]:
+    """종목 목록을 워커 임대 단위(CRAWL_LEASE_BATCH_SIZE) 작업 항목으로 분할"""
+    return [{"tickers": batch} for batch in split_batches(tickers, CRAWL_LEASE_BATCH_SIZE)]
+
+async def run_crawl_job(item: Dict):
+    """작업 큐 워커 핸들러 - 임대한 종목 배치 1개 처리"""
+    await execute_crawl_batch(item["payload"]["tickers"], item["job_id"])
+
+def finish_crawl_job(job_id: str, status: str):
+    """모든 작업 항목이 끝났을 때 진행상황 종료 처리"""
+    now = datetime.now().isoformat()
+    if status == "completed":
+        get_journal(job_id, PROGRESS_DIR).update(status="completed", completed_at=now)
+    else:
+        job = job_queue.get(job_id)
+        get_journal(job_id, PROGRESS_DIR).update(
+            status="failed",
+            error=job.get("error") if job else None,
+            failed_at=now
+        )
+    print(f"🎉 크롤링 작업 종료: {job_id} ({status})")
+
+def create_worker_pool(workers: int) -> JobWorkerPool:
+    """작업 큐 워커 풀 생성 (API 서버 내장 워커와 worker.py 공용)"""
+    return JobWorkerPool(
+        job_queue,
+        run_crawl_job,
+        workers=workers,
+        on_job_finished=finish_crawl_job,
+        # 처리할 항목이 없으면 미사용 쿼터 임대분 반환
+        on_idle=logo_dev_quota.release
+    )
+
+@app.get("/api/v1/crawl/queue")
+async def get_crawl_queue(status: Optional[str] = None, limit: int = 100):
+    """작업 큐 상태 조회"""
+    try:
+        worker_pool = getattr(app.state, "worker_pool", None)
+        return {
+            "scheduling": job_queue.scheduling,
+            "workers": CRAWL_WORKERS,
+            "lease_batch_size": CRAWL_LEASE_BATCH_SIZE,
+            "active_jobs": dict(worker_pool.active_jobs) if worker_pool else {},
+            "depth": job_queue.depth(),
+            "jobs": job_queue.list_jobs(status=status, limit=limit)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/crawl/resume/{job_id}")
+async def resume_crawl_job(job_id: str):
+    """중단/실패한 크롤링 작업 재개
+
+    job_id와 카운터는 그대로 유지하고, 성공한 종목은 건너뛰며
+    실패했거나 처리 중이던 종목만 다시 크롤링한다.
+    """
+    journal = get_journal(job_id, PROGRESS_DIR)
+    if not journal.exists():
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job = job_queue.get(job_id)
+    if job is None:
+        # 작업 큐 도입 이전 작업은 원본 종목 목록이 없음
+        raise HTTPException(status_code=409, detail="원본 종목 목록이 없어 재개할 수 없는 작업입니다")
+    if job["status"] in ("queued", "running"):
+        raise HTTPException(
+            status_code=409,
+            detail=f"이미 {job['status']} 상태인 작업입니다 (중단된 항목은 임대 만료 후 자동 재개됩니다)"
+        )
+
+    tickers = job["payload"]["tickers"]
+    outcomes = journal.item_outcomes()
+    remaining = [t for t in tickers if outcomes.get(t['infomax_code']) != "success"]
+    if not remaining:
+        return {
+            "status": "completed",
+            "job_id": job_id,
+            "message": "재개할 종목이 없습니다 (모두 성공)",
+            "remaining": 0
+        }
+
+    journal.update(status="queued", resume_requested_at=datetime.now().isoformat())
+    job_queue.enqueue(job_id, job["kind"], job["payload"], priority=job["priority"], items=crawl_work_items(remaining))
+    print(f"🔄 크롤링 작업 재개 등록: {job_id} (남은 {len(remaining)}/{len(tickers)}건)")
+
+    return {
+        "status": "started",
+        "job_id": job_id,
+        "message": f"크롤링 작업 재개가 큐에 등록되었습니다. 남은 종목: {len(remaining)}개",
+        "remaining": len(remaining),
+        "skipped": len(tickers) - len(remaining)
+    }
+
+async def collect_missing_logos_streaming(
+    limit: int = 100,
+    fs_exchange: Optional[str] = None,
+    country: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    prefix: Optional[str] = None,
+    cursor: Optional[str] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """미보유 로고 수집 - 뷰를 커서 순서대로 순회하며 limit개까지 (수집 목록, 다음 커서) 반환
     
-    # 선택된 페이지들을 순회
-    for page in selected_pages:
-        if len(collected) >= limit:
-            break
-            
-        print(f"🔍 페이지 {page} 조회 중... (현재 수집: {len(collected)}/{limit})")
-        
-        # 조건에 맞는 페이지 데이터 조회
-        if prefix:
-            print(f"   prefix '{prefix}'로 검색...")
-            response = existing_api.query_table("raw_data", "logo_master_with_status", {
-                "search": prefix,
-                "search_column": "infomax_code",
-                "page": page,
-                "size": size
-            })
-        else:
-            print(f"   전체 데이터 조회...")
-            response = existing_api.query_table("raw_data", "logo_master_with_status", {
-                "page": page,
-                "size": size
-            })
-        
-        if not response or not response.get('data'):
-            print(f"   ❌ 응답 없음 또는 데이터 없음")
-            continue
-        
-        print(f"   📊 페이지 {page}에서 {len(response['data'])}개 항목 조회")
-        
-        # 가져온 데이터를 실시간으로 필터링
-        page_missing_count = 0
-        for item in response['data']:
+    페이지는 MISSING_SCAN_CONCURRENCY개씩 미리 가져오며, 다음 커서로 이어서 수집하면 중복이 없다.
+    """
+    filters = {"fs_exchange": fs_exchange, "country": country, "is_active": is_active, "prefix": prefix}
+    collected = []
+    next_cursor = None
+    scan = scan_missing_logos(existing_api, filters, cursor=cursor)
+    try:
+        async for page in scan:
+            log.debug("missing_scan.page", "미보유 스캔 페이지", page=page['page'], total_pages=page['total_pages'],
+                      missing=len(page['missing']), rows=page['rows'])
+            for row_no, row in page["missing"]:
+                if len(collected) >= limit:
+                    # 이 행부터 다음 수집에서 이어서 처리
+                    next_cursor = format_cursor(page["page"], row_no)
+                    return collected, next_cursor
+                collected.append(row)
+            next_cursor = page["next_cursor"]
             if len(collected) >= limit:
                 break
-                
-            # has_any_file 필터링 확인
-            infomax_code = item.get('infomax_code', 'unknown')
-            has_any_file = item.get('has_any_file')
-            print(f"      🔍 필터링 확인: {infomax_code}, has_any_file={has_any_file}")
+    finally:
+        await scan.aclose()
+    return collected, next_cursor
+
+# 이 프로세스에서 스캔 중인 스윕 작업
+_active_sweeps = set()
+
+def start_missing_sweep(job_id: str, filters: Dict, cursor: Optional[str] = None, concurrency: Optional[int] = None,
+                        resumed: bool = False):
+    """스윕 스캔을 백그라운드 태스크로 시작"""
+    _active_sweeps.add(job_id)
+    task = asyncio.create_task(run_missing_sweep(job_id, filters, cursor=cursor, concurrency=concurrency, resumed=resumed))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    task.add_done_callback(lambda _: _active_sweeps.discard(job_id))
+
+async def run_missing_sweep(job_id: str, filters: Dict, cursor: Optional[str] = None, concurrency: Optional[int] = None,
+                            resumed: bool = False):
+    """미보유 로고 전체 스윕 - 스캔 결과를 페이지 단위로 작업 큐에 바로 흘려보냄
+
+    페이지의 종목을 모두 작업 큐에 넣은 뒤 scan_cursor를 기록하므로, 중단되어도 scan_cursor부터 이어서
+    스캔하면 빠지는 종목이 없다 (resumed=True면 이미 등록된 항목을 작업 payload에 이어 붙임).
+    """
+    journal = get_journal(job_id, PROGRESS_DIR)
+    tickers: List[Dict] = []
+    if resumed:
+        payloads = await asyncio.to_thread(job_queue.item_payloads, job_id)
+        tickers = [t for payload in payloads for t in payload.get("tickers", [])]
+    quota_skipped = journal.summary().get("quota_skipped") or 0
+    try:
+        async for page in scan_missing_logos(existing_api, filters, cursor=cursor, concurrency=concurrency):
+            page_tickers = [to_ticker(row) for _, row in page["missing"]]
+            logo_dev_count = sum(1 for t in page_tickers if t.get('api_domain') == 'logo_dev')
+            if logo_dev_count and not await asyncio.to_thread(logo_dev_quota.has_budget, logo_dev_count):
+                page_tickers = [t for t in page_tickers if t.get('api_domain') != 'logo_dev']
+                quota_skipped += logo_dev_count
             
-            # has_any_file이 false인 항목만 수집
-            if has_any_file == False:
-                collected.append(item)
-                page_missing_count += 1
-                print(f"      ✅ 수집: {infomax_code} (has_any_file=False)")
-            else:
-                print(f"      ❌ 제외: {infomax_code} (has_any_file={has_any_file})")
+            # 페이지 끝의 배치 크기 미만 나머지도 바로 등록 (기록한 커서 이전 종목이 메모리에만 남지 않도록)
+            if page_tickers:
+                await asyncio.to_thread(job_queue.add_items, job_id, crawl_work_items(page_tickers))
+            tickers.extend(page_tickers)
+            
+            journal.record_item(
+                inc={"total_items": len(page_tickers)} if page_tickers else None,
+                scan_page=page["page"],
+                scan_total_pages=page["total_pages"],
+                scan_cursor=page["next_cursor"],
+                scan_heartbeat_at=time.time(),
+                quota_skipped=quota_skipped
+            )
         
-        print(f"   📊 페이지 {page}에서 {page_missing_count}개 미보유 항목 수집")
-    
-    return collected
+        journal.update(scan_status="completed", scan_completed_at=datetime.now().isoformat())
+        print(f"✅ 미보유 로고 스윕 스캔 완료: {job_id} ({len(tickers)}개 종목 등록)")
+    except asyncio.CancelledError:
+        # 서버 종료 - 봉인하지 않고 남겨 두면 다음 기동 때 scan_cursor부터 이어받음
+        print(f"⏸️ 미보유 로고 스윕 스캔 중단: {job_id}")
+        raise
+    except Exception as e:
+        # 이미 등록한 항목은 계속 처리되며, scan_cursor부터 새 스윕으로 이어서 스캔할 수 있다
+        print(f"❌ 미보유 로고 스윕 스캔 오류: {job_id} - {e}")
+        journal.update(scan_status="failed", scan_error=str(e))
+    await seal_missing_sweep(job_id, tickers)
+
+async def seal_missing_sweep(job_id: str, tickers: Optional[List[Dict]] = None):
+    """스윕 작업 봉인 (tickers 미지정 시 등록된 작업 항목으로 payload 구성)"""
+    if tickers is None:
+        payloads = await asyncio.to_thread(job_queue.item_payloads, job_id)
+        tickers = [t for payload in payloads for t in payload.get("tickers", [])]
+    finished = await asyncio.to_thread(job_queue.seal, job_id, payload={"tickers": tickers})
+    if finished:
+        finish_crawl_job(job_id, finished)
+
+async def recover_missing_sweeps():
+    """봉인되지 않은 채 남은 스윕 작업 처리 (기동 시 1회, 아직 진행 기록이 새로우면 만료될 때까지 재확인)
+
+    - 스캔이 끝났거나 실패로 기록된 작업: 봉인만 함
+    - 스캔 진행 기록이 MISSING_SWEEP_STALE_SECONDS 이상 없는 작업: scan_cursor부터 스캔을 이어받음
+    - 마지막 페이지까지 기록된 작업(scan_cursor가 None): 스캔 완료로 보고 봉인
+    """
+    while True:
+        jobs = []
+        for status in ("queued", "running"):
+            jobs.extend(await asyncio.to_thread(job_queue.list_jobs, status))
+        waiting = False
+        for job in jobs:
+            job_id = job["job_id"]
+            if job.get("kind") != "missing" or job.get("sealed") or job_id in _active_sweeps:
+                continue
+            journal = get_journal(job_id, PROGRESS_DIR)
+            summary = await asyncio.to_thread(journal.summary)
+            if summary.get("scan_status") == "running" and "scan_cursor" in summary and summary["scan_cursor"] is None:
+                journal.update(scan_status="completed", scan_completed_at=datetime.now().isoformat())
+            elif summary.get("scan_status") == "running":
+                if time.time() - (summary.get("scan_heartbeat_at") or 0) < MISSING_SWEEP_STALE_SECONDS:
+                    waiting = True
+                    continue
+                cursor = summary["scan_cursor"] if "scan_cursor" in summary else summary.get("scan_start_cursor")
+                print(f"🔄 미보유 로고 스윕 스캔 이어받기: {job_id} (커서: {cursor})")
+                journal.update(scan_heartbeat_at=time.time(), scan_resumed_at=datetime.now().isoformat())
+                start_missing_sweep(job_id, summary.get("scan_filters") or {}, cursor=cursor,
+                                    concurrency=summary.get("scan_concurrency"), resumed=True)
+                continue
+            await seal_missing_sweep(job_id)
+        if not waiting:
+            return
+        await asyncio.sleep(MISSING_SWEEP_STALE_SECONDS)
 
 def should_include_item(item: Dict, filters: Dict) -> bool:
     """아이템이 필터 조건에 맞는지 확인 (사용하지 않음 - has_any_file 필터링으로 대체)"""
@@ -1679,249 +2071,412 @@ async def is_logo_missing(infomax_code: str) -> bool:
         files = files_response['data']
         for f in files:
             if f.get('logo_id') == logo_id and f.get('minio_object_key'):
-                # MinIO에서 실제 파일 존재 확인
-                try:
-                    minio_client.stat_object(MINIO_BUCKET, f['minio_object_key'])
+                # 실제 파일 존재 확인 (인벤토리)
+                if object_exists(object_key_of(f['minio_object_key'])):
                     return False  # 로고 있음
-                except:
-                    continue  # 파일 없음, 계속 확인
         
         return True  # 로고 없음
         
     except Exception as e:
-        print(f"⚠️ 로고 존재 확인 오류: {infomax_code} - {e}")
+        log.warning("is_logo_missing.error", "로고 존재 확인 오류", infomax_code=infomax_code, error=str(e))
         return True  # 오류 시 크롤링 대상으로 간주
 
 async def execute_crawl_batch(tickers: List[Dict], job_id: str):
-    """실제 크롤링 배치 실행"""
-    progress_file = PROGRESS_DIR / f"{job_id}.json"
+    """실제 크롤링 배치 실행 (작업 항목 1개 = 종목 배치 1개)
+    
+    같은 job_id의 저널에 결과가 남아 있으면 이어서 실행한다 (재시작/재개/임대 만료 후 재시도).
+    성공한 종목은 건너뛰고, 실패했거나 처리 중이던 종목만 다시 크롤링한다.
+    작업 전체의 종료 처리는 모든 항목이 끝난 뒤 finish_crawl_job에서 한다.
+    """
+    journal = get_journal(job_id, PROGRESS_DIR)
+    registration_buffer = RegistrationBuffer(logo_registry)
+    crawler = get_crawler()
+    
+    # 체크포인트: 종목별 마지막 결과
+    outcomes = journal.item_outcomes()
+    # DB 등록(flush) 대기 중인 성공 종목 - 등록이 끝나야 성공으로 기록
+    pending_items: Dict[str, Dict] = {}
+    
+    def checkpoint(flushed: Dict[str, bool]):
+        log_registration_results(flushed)
+        for code, ok in flushed.items():
+            item = pending_items.pop(code, None)
+            if item is not None:
+                record_item_outcome(journal, outcomes, item, "success" if ok else "failed")
     
     try:
+        if any(t['infomax_code'] in outcomes for t in tickers):
+            skipped = sum(1 for t in tickers if outcomes.get(t['infomax_code']) == "success")
+            print(f"🔄 작업 재개: {job_id} (완료 {skipped}건 건너뜀, 남은 {len(tickers) - skipped}건)")
+            journal.update(status="running", resumed_at=datetime.now().isoformat())
+        else:
+            # 여러 워커가 같은 작업의 다른 배치를 처리하므로 최초 시작 시각만 기록
+            summary = journal.summary()
+            if not summary.get("started_at"):
+                await update_progress(job_id, {
+                    "status": "running",
+                    "started_at": datetime.now().isoformat()
+                })
+            elif summary.get("status") != "running":
+                await update_progress(job_id, {"status": "running"})
+        
         for i, ticker in enumerate(tickers):
-            print(f"   {i+1}. {ticker['infomax_code']} ({ticker['ticker']}) - 크롤링 시작")
+            if outcomes.get(ticker['infomax_code']) == "success":
+                continue
+            
+            log.debug("crawl_batch.item", "크롤링 시작", job_id=job_id, index=i + 1, infomax_code=ticker['infomax_code'], ticker=ticker['ticker'])
             
             # 진행상황 업데이트
-            await update_progress(progress_file, {
-                "processed_items": i + 1,
+            await update_progress(job_id, {
                 "current_item": ticker['infomax_code']
             })
             
             # 실제 크롤링 실행
-            crawler = LogoCrawler()
+            deferred = False
             success = await crawler.crawl_logo(
                 ticker['infomax_code'], 
                 ticker['ticker'], 
-                ticker.get('api_domain')
+                ticker.get('api_domain'),
+                job_id=job_id
             )
             
             if success:
-                print(f"      ✅ 성공: {ticker['infomax_code']}")
-                
                 # DB 저장 처리
-                print(f"      🔍 DB 저장 처리 시작: {ticker['infomax_code']}")
                 try:
                     # master에서 logo_hash 조회
-                    print(f"      🔍 master 조회 시작: {ticker['infomax_code']}")
                     master_result = existing_api.query_table("raw_data", "logo_master", {
                         "search_column": "infomax_code",
                         "search": ticker['infomax_code'],
                         "limit": 1
                     })
-                    print(f"      🔍 master 조회 결과: {master_result}")
                     
                     if master_result and 'data' in master_result and master_result['data']:
                         logo_hash = master_result['data'][0]['logo_hash']
-                        print(f"      🔍 logo_hash 조회 성공: {logo_hash}")
                         
                         # MinIO에서 파일 정보 조회
-                        print(f"      🔍 MinIO 파일 조회 시작: {logo_hash}")
                         try:
-                            objects = minio_client.list_objects(MINIO_BUCKET, prefix=logo_hash, recursive=True)
-                            objects_list = list(objects)
-                            print(f"      🔍 MinIO 객체 목록: {objects_list}")
+                            # 크롤러가 저장(또는 같은 원본이라 재사용)한 다이제스트 객체를 로고별 행 키로 등록
+                            saved_files = crawler.pop_saved_files(ticker['infomax_code'])
+                            if saved_files is not None:
+                                processed_files = crawled_file_rows(saved_files, logo_hash)
+                            else:
+                                # 기존 키 형식 객체 ({logo_hash}_*) 목록으로 등록
+                                # 인벤토리에서 조회 (방금 저장한 파일은 record_put으로 이미 반영됨)
+                                if minio_inventory.ready:
+                                    objects_list = [(key, entry[0]) for key, entry in minio_inventory.objects(logo_hash).items()]
+                                else:
+                                    objects_list = [
+                                        (obj.object_name, obj.size)
+                                        for obj in minio_client.list_objects(MINIO_BUCKET, prefix=logo_hash, recursive=True)
+                                    ]
+                                log.debug("crawl_batch.objects", "MinIO 객체 목록", infomax_code=ticker['infomax_code'],
+                                          logo_hash=logo_hash, objects=len(objects_list))
                             
-                            # 모든 파일을 처리 (SVG 우선, 그 다음 PNG/WebP)
-                            processed_files = []
-                            for obj in objects_list:
-                                print(f"      🔍 MinIO 객체 확인: {obj.object_name}")
-                                if obj.object_name.endswith('_original.svg'):
-                                    print(f"      🔍 SVG 파일 발견: {obj.object_name}")
-                                    # 파일 정보 수집
-                                    stat = minio_client.stat_object(MINIO_BUCKET, obj.object_name)
-                                    file_info = {
-                                        "format": "svg",
-                                        "source": "website",
-                                        "upload_type": "crawled",
-                                        "width": None,
-                                        "height": None,
-                                        "size": stat.size,
-                                        "minio_key": obj.object_name,
-                                        "is_original": True
-                                    }
-                                    print(f"      🔍 파일 정보 수집: {file_info}")
-                                    processed_files.append(file_info)
-                                elif obj.object_name.endswith('.png') or obj.object_name.endswith('.webp'):
-                                    print(f"      🔍 이미지 파일 발견: {obj.object_name}")
-                                    # 파일 정보 수집
-                                    stat = minio_client.stat_object(MINIO_BUCKET, obj.object_name)
-                                    # 파일명에서 크기 추출 (예: _240.png -> 240)
-                                    size = None
-                                    if '_' in obj.object_name:
-                                        try:
-                                            size = int(obj.object_name.split('_')[-1].split('.')[0])
-                                        except:
-                                            size = None
+                                # 모든 파일을 처리 (SVG 우선, 그 다음 PNG/WebP)
+                                processed_files = []
+                                for object_name, object_size in objects_list:
+                                    if object_name.endswith('_original.svg'):
+                                        # 파일 정보 수집
+                                        file_info = {
+                                            "format": "svg",
+                                            "source": "website",
+                                            "upload_type": "crawled",
+                                            "width": None,
+                                            "height": None,
+                                            "size": object_size,
+                                            "minio_key": object_name,
+                                            "is_original": True
+                                        }
+                                        processed_files.append(file_info)
+                                    elif object_name.endswith('.png') or object_name.endswith('.webp'):
+                                        # 파일 정보 수집
+                                        # 파일명에서 크기 추출 (예: _240.png -> 240)
+                                        size = None
+                                        if '_' in object_name:
+                                            try:
+                                                size = int(object_name.split('_')[-1].split('.')[0])
+                                            except:
+                                                size = None
                                     
-                                    file_info = {
-                                        "format": "png" if obj.object_name.endswith('.png') else "webp",
-                                        "source": "logo_dev",  # logo.dev에서 온 파일
-                                        "upload_type": "crawled",
-                                        "width": size,
-                                        "height": size,
-                                        "size": stat.size,
-                                        "minio_key": obj.object_name,
-                                        "is_original": False
-                                    }
-                                    print(f"      🔍 파일 정보 수집: {file_info}")
-                                    processed_files.append(file_info)
-                                else:
-                                    print(f"      🔍 알 수 없는 파일: {obj.object_name}")
+                                        file_info = {
+                                            "format": "png" if object_name.endswith('.png') else "webp",
+                                            "source": "logo_dev",  # logo.dev에서 온 파일
+                                            "upload_type": "crawled",
+                                            "width": size,
+                                            "height": size,
+                                            "size": object_size,
+                                            "minio_key": object_name,
+                                            "is_original": False
+                                        }
+                                        processed_files.append(file_info)
+                                    else:
+                                        log.debug("crawl_batch.unknown_object", "알 수 없는 파일", object_key=object_name)
                             
-                            # DB 저장 (모든 파일)
+                            # DB 저장 (모든 파일, 여러 종목을 모아 일괄 기록)
                             if processed_files:
-                                print(f"      🔍 DB 저장 시도: {ticker['infomax_code']}, 파일 개수: {len(processed_files)}")
-                                for file_info in processed_files:
-                                    db_success = save_logo_data(ticker['infomax_code'], logo_hash, file_info)
-                                    if db_success:
-                                        print(f"      ✅ DB 저장 성공: {ticker['infomax_code']} - {file_info['format']}")
-                                    else:
-                                        print(f"      ❌ DB 저장 실패: {ticker['infomax_code']} - {file_info['format']}")
+                                log.debug("crawl_batch.register", "DB 저장 예약", infomax_code=ticker['infomax_code'], files=len(processed_files))
+                                pending_items[ticker['infomax_code']] = {
+                                    "infomax_code": ticker['infomax_code'],
+                                    "ticker": ticker['ticker']
+                                }
+                                deferred = True
+                                checkpoint(registration_buffer.add(ticker['infomax_code'], logo_hash, processed_files))
                             else:
-                                print(f"      ❌ 처리할 파일이 없음: {ticker['infomax_code']}")
+                                log.warning("crawl_batch.no_files", "처리할 파일이 없음", job_id=job_id, infomax_code=ticker['infomax_code'])
                         except Exception as minio_error:
-                            print(f"      ❌ MinIO 조회 오류: {minio_error}")
-                            import traceback
-                            print(f"      ❌ MinIO 오류 상세: {traceback.format_exc()}")
+                            log.error("crawl_batch.minio_error", "MinIO 조회 오류", exc_info=True, job_id=job_id,
+                                      infomax_code=ticker['infomax_code'], error=str(minio_error))
                     else:
-                        print(f"      ❌ master 조회 실패: {ticker['infomax_code']}")
-                        print(f"      ❌ master 결과: {master_result}")
+                        log.warning("crawl_batch.no_master", "master 조회 실패", job_id=job_id, infomax_code=ticker['infomax_code'])
                         
                 except Exception as db_error:
-                    print(f"      ❌ DB 저장 처리 오류: {db_error}")
-                    import traceback
-                    print(f"      ❌ DB 오류 상세: {traceback.format_exc()}")
-                
-                await update_progress(progress_file, {
-                    "successful_items": i + 1
-                })
+                    log.error("crawl_batch.db_error", "DB 저장 처리 오류", exc_info=True, job_id=job_id,
+                              infomax_code=ticker['infomax_code'], error=str(db_error))
             else:
-                print(f"      ❌ 실패: {ticker['infomax_code']}")
-                await update_progress(progress_file, {
-                    "failed_items": i + 1
-                })
+                log.debug("crawl_batch.failed", "크롤링 실패", job_id=job_id, infomax_code=ticker['infomax_code'])
             
-            # 진행상황에 아이템 정보 추가
-            item_info = {
-                "infomax_code": ticker['infomax_code'],
-                "ticker": ticker['ticker'],
-                "status": "success" if success else "failed",
-                "processed_at": datetime.now().isoformat()
-            }
-            
-            # 기존 진행상황 읽기
-            with open(progress_file, 'r', encoding='utf-8') as f:
-                progress_data = json.load(f)
-            
-            if "items" not in progress_data:
-                progress_data["items"] = []
-            progress_data["items"].append(item_info)
-            
-            # 파일 저장
-            with open(progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress_data, f, ensure_ascii=False, indent=2)
+            # 진행상황에 아이템 결과 기록 (DB 등록 대기 중이면 flush 후 기록)
+            # 크롤링은 성공했어도 등록을 예약하지 못했으면(master 없음, 파일 없음, 조회 오류) 실패로 남겨 재개 시 다시 처리
+            if not deferred:
+                record_item_outcome(journal, outcomes, {
+                    "infomax_code": ticker['infomax_code'],
+                    "ticker": ticker['ticker']
+                }, "failed")
             
             # 크롤링 간격 (1초)
             await asyncio.sleep(1)
         
-        # 작업 완료
-        await update_progress(progress_file, {
-            "status": "completed",
-            "completed_at": datetime.now().isoformat()
-        })
+        # 남은 DB 등록 요청 기록 (미사용 쿼터는 워커가 유휴 상태가 되면 반환)
+        checkpoint(registration_buffer.flush())
         
-        print(f"🎉 크롤링 작업 완료: {job_id}")
+        log.info("crawl_batch.done", "크롤링 배치 완료", job_id=job_id, items=len(tickers))
         
     except Exception as e:
-        print(f"❌ 크롤링 작업 오류: {job_id} - {e}")
-        await update_progress(progress_file, {
-            "status": "failed",
-            "error": str(e),
-            "failed_at": datetime.now().isoformat()
+        log.error("crawl_batch.error", "크롤링 작업 오류", job_id=job_id, error=str(e))
+        checkpoint(registration_buffer.flush())
+        await update_progress(job_id, {
+            "last_error": str(e),
+            "last_error_at": datetime.now().isoformat()
         })
+        # 작업 큐가 재시도 한도 내에서 항목을 다시 대기열에 넣는다
+        raise
+
+def record_item_outcome(journal, outcomes: Dict[str, str], item: Dict, status: str):
+    """종목 결과를 저널에 체크포인트로 기록
+    
+    재시도 결과는 카운터를 다시 세지 않고 보정만 한다 (failed → success).
+    """
+    code = item['infomax_code']
+    previous = outcomes.get(code)
+    if previous is None:
+        inc = {"processed_items": 1, "successful_items" if status == "success" else "failed_items": 1}
+    elif previous != "success" and status == "success":
+        inc = {"successful_items": 1, "failed_items": -1}
+    else:
+        inc = None
+    
+    item = dict(item, status=status, processed_at=datetime.now().isoformat())
+    if previous is not None:
+        item["retried"] = True
+    journal.record_item(item, inc=inc)
+    outcomes[code] = status
+
+def log_registration_results(results: Dict[str, bool]):
+    """일괄 DB 등록 결과 기록 (실패만 WARNING)"""
+    for infomax_code, ok in results.items():
+        if ok:
+            log.debug("registration.ok", "DB 저장 성공", infomax_code=infomax_code)
+        else:
+            log.warning("registration.failed", "DB 저장 실패", infomax_code=infomax_code)
 
 async def simulate_crawl_single(ticker: Dict) -> bool:
     """단일 크롤링 시뮬레이션"""
     try:
-        if LogoCrawler is None:
-            print("      ❌ LogoCrawler 미로딩: playwright 환경이 준비되지 않았습니다")
+        try:
+            crawler = get_crawler()
+        except RuntimeError:
+            log.error("crawl_single.no_crawler", "LogoCrawler 미로딩: playwright 환경이 준비되지 않았습니다")
             return False
 
-        print(f"      🚀 실제 크롤링 시작: {ticker['infomax_code']} ({ticker['ticker']})")
-        crawler = LogoCrawler()
+        log.debug("crawl_single.start", "실제 크롤링 시작", infomax_code=ticker['infomax_code'], ticker=ticker['ticker'])
         # api_domain은 환경변수에서 읽도록 설계되었을 수 있으므로 None 전달
         ok = await crawler.crawl_logo(ticker['infomax_code'], ticker['ticker'], None)
-        print(f"      ✅ 크롤링 결과: {'성공' if ok else '실패'} - {ticker['infomax_code']}")
-        return bool(ok)
+        registered = await asyncio.to_thread(register_crawled_files, ticker['infomax_code'], crawler.pop_saved_files(ticker['infomax_code']))
+        log.debug("crawl_single.done", "크롤링 결과", infomax_code=ticker['infomax_code'], ok=bool(ok), registered=registered)
+        return bool(ok) and registered
      
     except Exception as e:
-        print(f"      ❌ 크롤링 오류: {e}")
+        log.error("crawl_single.error", "크롤링 오류", infomax_code=ticker.get('infomax_code'), error=str(e))
         return False
 
-async def update_progress(progress_file: Path, updates: Dict):
-    """진행상황 파일 업데이트"""
+async def update_progress(job_id: str, updates: Dict):
+    """진행상황 필드 갱신 (저널에 이벤트 1줄 추가)"""
     try:
-        # 기존 진행상황 읽기
-        with open(progress_file, 'r', encoding='utf-8') as f:
-            progress_data = json.load(f)
-        
-        # 업데이트 적용
-        for key, value in updates.items():
-            if key == "items":
-                # items는 추가 (append)
-                if "items" not in progress_data:
-                    progress_data["items"] = []
-                if isinstance(value, list):
-                    progress_data["items"].extend(value)
-                else:
-                    progress_data["items"].append(value)
-            else:
-                progress_data[key] = value
-        
-        # 파일 저장
-        with open(progress_file, 'w', encoding='utf-8') as f:
-            json.dump(progress_data, f, ensure_ascii=False, indent=2)
-            
+        get_journal(job_id, PROGRESS_DIR).update(**updates)
     except Exception as e:
-        print(f"⚠️ 진행상황 업데이트 실패: {e}")
+        log.warning("progress.update_failed", "진행상황 업데이트 실패", job_id=job_id, error=str(e))
+
+RECONCILE_DIR = PROGRESS_DIR / "reconcile"
+
+async def run_reconcile(report_id: str, repair: bool, delete_orphans: bool, sample: int):
+    """정합성 점검 실행 후 보고서 저장"""
+    from reconcile import Reconciler
+    
+    report_file = RECONCILE_DIR / f"{report_id}.json"
+    try:
+        reconciler = Reconciler(
+            existing_api,
+            minio_client,
+            MINIO_BUCKET,
+            registry=logo_registry,
+            renderer=lambda data, logo_hash, encodings: get_crawler().convert_image(data, logo_hash, encodings)
+        )
+        report = await reconciler.run(repair=repair, delete_orphans=delete_orphans, sample=sample)
+        report.update({"report_id": report_id, "status": "completed"})
+    except Exception as e:
+        print(f"❌ 정합성 점검 오류: {report_id} - {e}")
+        report = {"report_id": report_id, "status": "failed", "error": str(e)}
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+
+@app.post("/api/v1/admin/reconcile", dependencies=[Depends(require_admin)])
+async def start_reconcile(
+    repair: bool = False,
+    delete_orphans: bool = False,
+    sample: int = Query(100, ge=0, le=10000)
+):
+    """버킷/DB 정합성 점검 시작 (백그라운드) - 결과는 GET /api/v1/admin/reconcile/{report_id}"""
+    RECONCILE_DIR.mkdir(parents=True, exist_ok=True)
+    report_id = f"reconcile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    with open(RECONCILE_DIR / f"{report_id}.json", 'w', encoding='utf-8') as f:
+        json.dump({"report_id": report_id, "status": "running", "repair": repair, "delete_orphans": delete_orphans}, f)
+    
+    task = asyncio.create_task(run_reconcile(report_id, repair, delete_orphans, sample))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    
+    return {"status": "started", "report_id": report_id}
+
+@app.get("/api/v1/admin/reconcile/{report_id}", dependencies=[Depends(require_admin)])
+async def get_reconcile_report(report_id: str):
+    """정합성 점검 보고서 조회"""
+    report_file = RECONCILE_DIR / f"{Path(report_id).name}.json"
+    if not report_file.exists():
+        raise HTTPException(status_code=404, detail="Report not found")
+    with open(report_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@app.get("/api/v1/admin/export", dependencies=[Depends(require_admin)])
+async def export_logo_archive(
+    logo_hash: Optional[List[str]] = Query(None),
+    format: Optional[List[str]] = Query(None),
+    size: Optional[List[int]] = Query(None),
+    include_deleted: bool = False,
+    compress: bool = False
+):
+    """로고 세트 내보내기 - logo_files 행(manifest.jsonl)과 객체(objects/...)를 tar로 스트리밍
+    
+    메모리에 아카이브 전체를 올리지 않으며, 객체는 ARCHIVE_CONCURRENCY개씩 동시에 읽는다.
+    logo_hash/format/size는 여러 번 지정 가능한 필터.
+    """
+    from logo_archive import ArchiveExporter, stream_export
+    
+    exporter = ArchiveExporter(existing_api, minio_client, MINIO_BUCKET)
+    filename = f"logos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.tar" + (".gz" if compress else "")
+    return StreamingResponse(
+        stream_export(exporter, logo_hashes=logo_hash, formats=format, sizes=size,
+                      include_deleted=include_deleted, compress=compress),
+        media_type="application/gzip" if compress else "application/x-tar",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.post("/api/v1/admin/import", dependencies=[Depends(require_admin)])
+async def import_logo_archive(file: UploadFile = File(...), skip_existing: bool = False):
+    """로고 세트 가져오기 - export로 만든 tar(.gz)의 객체를 동시 업로드한 뒤 logo_files를 일괄 등록"""
+    import tarfile
+    from logo_archive import ArchiveImporter
+    
+    importer = ArchiveImporter(existing_api, minio_client, MINIO_BUCKET, registry=logo_registry)
+    try:
+        return await asyncio.to_thread(importer.import_archive, file.file, skip_existing)
+    except (tarfile.TarError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"아카이브를 읽을 수 없습니다: {e}")
+
+@app.get("/api/v1/admin/profile", dependencies=[Depends(require_admin)])
+async def get_process_profile(
+    seconds: float = Query(10.0, gt=0, le=profiler.MAX_SECONDS),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope|summary)$"),
+    include_idle: bool = True
+):
+    """실행 중인 프로세스 샘플링 프로파일 (이벤트 루프 + 크롤링 워커 스레드)
+    
+    수집 중에도 이벤트 루프는 계속 요청을 처리하며 (메인 스레드는 타이머 신호, 워커 스레드는 샘플러 스레드로) 그대로 샘플링된다.
+    - collapsed : flamegraph.pl / speedscope에서 여는 접힌 스택 텍스트
+    - speedscope: speedscope.app JSON (스레드별 프로파일)
+    - summary   : 스레드별 샘플 수만
+    """
+    try:
+        profile = await profiler.profile_process(seconds, interval_ms / 1000, include_idle)
+    except profiler.ProfileBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    headers = {"X-Profile-Samples": str(profile.samples), "X-Profile-Duration": f"{profile.duration:.3f}"}
+    if format == "speedscope":
+        return JSONResponse(profile.speedscope(), headers={
+            **headers, "Content-Disposition": f'attachment; filename="profile_{os.getpid()}.speedscope.json"'
+        })
+    if format == "summary":
+        return profile.summary()
+    return Response(content=profile.collapsed(), media_type="text/plain; charset=utf-8", headers=headers)
+
+@app.get("/api/v1/admin/similar", dependencies=[Depends(require_admin)])
+async def find_similar_logos(
+    infomax_code: Optional[str] = None,
+    logo_hash: Optional[str] = None,
+    max_distance: int = Query(6, ge=0, le=64),
+    limit: int = Query(20, ge=1, le=500)
+):
+    """시각적으로 비슷한 로고 검색 (dHash 해밍 거리) - 다른 종목에 잘못 배정된 로고 확인용
+    
+    infomax_code 또는 logo_hash의 현재 로고를 기준으로, 자기 자신을 뺀 그룹을 거리순으로 반환한다.
+    """
+    if not similarity_index:
+        raise HTTPException(status_code=503, detail="유사도 색인이 비활성화되어 있습니다 (SIMILARITY_INDEX_ENABLED)")
+    if not logo_hash:
+        if not infomax_code:
+            raise HTTPException(status_code=400, detail="infomax_code 또는 logo_hash가 필요합니다")
+        logo_hash = await asyncio.to_thread(get_logo_hash_from_master, infomax_code)
+    group = similarity_index.current_group(logo_hash)
+    value = similarity_index.hash_of(group) if group else None
+    if value is None:
+        raise HTTPException(status_code=404, detail=f"유사도 색인에 없는 로고입니다: {logo_hash}")
+    started = time.perf_counter()
+    matches = similarity_index.search(value, max_distance, limit, exclude=[group])
+    took_ms = (time.perf_counter() - started) * 1000
+    return {
+        "query": {"infomax_code": infomax_code, "logo_hash": logo_hash, "group": group, "dhash": f"{value:016x}"},
+        "matches": [
+            {
+                "group": match,
+                "distance": distance,
+                "dhash": f"{similarity_index.hash_of(match) or 0:016x}",
+                "logo_hashes": similarity_index.owners_of(match)
+            }
+            for match, distance in matches
+        ],
+        "took_ms": round(took_ms, 3),
+        "index": similarity_index.stats()
+    }
 
 @app.get("/api/v1/quota/status")
-async def get_quota_status():
-    """API 쿼터 상태 조회"""
+async def get_quota_status(refresh: bool = False):
+    """API 쿼터 상태 조회 (refresh=true면 원장 사용량을 다시 조회)"""
     try:
-        today = date.today()
-        
-        # logo.dev 쿼터 상태
-        logo_dev_usage = logo_dev_quota._get_current_usage(today)
-        logo_dev_remaining = max(0, LOGO_DEV_DAILY_LIMIT - logo_dev_usage)
+        logo_dev_status = await asyncio.to_thread(logo_dev_quota.status, refresh)
         
         return {
-            "date_utc": today.isoformat(),
-            "logo_dev": {
-                "used": logo_dev_usage,
-                "limit": LOGO_DEV_DAILY_LIMIT,
-                "remaining": logo_dev_remaining,
-                "percentage": round((logo_dev_usage / LOGO_DEV_DAILY_LIMIT) * 100, 2)
-            }
+            "date_utc": logo_dev_status["date_utc"],
+            "logo_dev": logo_dev_status
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1961,13 +2516,14 @@ async def upload_logo(
         
         # 6. MinIO에 업로드 (logo_hash 사용)
         minio_key = f"{logo_hash}_{size}.{format.lower()}"
-        minio_client.put_object(
+        written = minio_client.put_object(
             MINIO_BUCKET, 
             minio_key, 
             io.BytesIO(processed_image),
             length=len(processed_image),
             content_type=f"image/{format.lower()}"
         )
+        notify_put(MINIO_BUCKET, minio_key, len(processed_image), written.etag)
         
         # 7. DB에 저장
         success = save_logo_data(infomax_code, logo_hash, {
@@ -2033,18 +2589,20 @@ async def update_logo(
         # 5. 기존 파일 삭제 (MinIO)
         try:
             minio_client.remove_object(MINIO_BUCKET, f"{logo_hash}_{size}.{format.lower()}")
+            notify_remove(MINIO_BUCKET, [f"{logo_hash}_{size}.{format.lower()}"])
         except:
             pass  # 파일이 없어도 계속 진행
         
         # 6. 새 파일 업로드 (logo_hash 사용)
         minio_key = f"{logo_hash}_{size}.{format.lower()}"
-        minio_client.put_object(
+        written = minio_client.put_object(
             MINIO_BUCKET, 
             minio_key, 
             io.BytesIO(processed_image),
             length=len(processed_image),
             content_type=f"image/{format.lower()}"
         )
+        notify_put(MINIO_BUCKET, minio_key, len(processed_image), written.etag)
         
         # 7. DB에 저장 (기존 데이터 업데이트)
         success = save_logo_data(infomax_code, logo_hash, {
@@ -0,0 +1,123 @@
+"""
+콘텐츠 주소 저장 모듈
+원본 이미지 바이트의 SHA-256 다이제스트로 객체 키를 만들어, 같은 로고를 쓰는 여러 종목
+(클래스 주식, 교차 상장 등 infomax_code만 다른 같은 회사)이 MinIO 객체를 공유하도록 한다
+
+- 객체 키 : cas/{digest[:2]}/{digest}/{size}.{fmt}, cas/{digest[:2]}/{digest}/original.svg
+- 행 키   : {객체 키}#{logo_hash}
+  logo_files.minio_object_key는 UNIQUE(upsert 충돌 컬럼)이므로 로고마다 다른 행 키가 필요하다.
+  객체를 읽을 때는 object_key_of()로 '#' 뒤를 떼어낸다.
+- 기존 키 : {logo_hash}_{size}.{fmt} (행 키 = 객체 키, 업로드/수정 API는 계속 이 형식 사용)
+"""
+
+import hashlib
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+CAS_ROOT = "cas/"
+# cas/{digest[:2]}/{digest}/{size|original}.{fmt}
+CAS_KEY_PATTERN = re.compile(
+    r"^cas/(?P<shard>[0-9a-f]{2})/(?P<digest>[0-9a-f]{64})/(?P<variant>original|\d+)\.(?P<fmt>[0-9A-Za-z]+)$"
+)
+# {logo_hash}_{size}.{fmt} 또는 {logo_hash}_original.{fmt}
+OBJECT_KEY_PATTERN = re.compile(r"^(?P<hash>[0-9A-Za-z]+)_(?P<variant>original|\d+)\.(?P<fmt>[0-9A-Za-z]+)$")
+RENDITION_FORMATS = ("png", "webp")
+
+
+def image_sizes() -> List[int]:
+    """표준 렌디션 크기 (IMAGE_SIZES, 기본 240,300)"""
+    try:
+        return [int(s.strip()) for s in os.getenv('IMAGE_SIZES', '240,300').split(',') if s.strip()]
+    except ValueError:
+        return [240, 300]
+
+
+def content_digest(data: bytes) -> str:
+    """원본 바이트의 SHA-256 (hex)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def cas_prefix(digest: str) -> str:
+    """다이제스트의 모든 렌디션이 놓이는 접두사"""
+    return f"{CAS_ROOT}{digest[:2]}/{digest}/"
+
+
+def cas_key(digest: str, size: Optional[int] = None, fmt: str = "svg") -> str:
+    """렌디션 객체 키 (size가 None이면 원본)"""
+    return f"{cas_prefix(digest)}{'original' if size is None else int(size)}.{fmt.lower()}"
+
+
+def is_cas_key(key: str) -> bool:
+    return bool(key) and key.startswith(CAS_ROOT)
+
+
+def parse_cas_key(key: str) -> Optional[Dict]:
+    """객체 키(또는 행 키) → {"digest", "size"(원본이면 None), "format", "is_original"}"""
+    match = CAS_KEY_PATTERN.match(object_key_of(key))
+    if not match or match.group("shard") != match.group("digest")[:2]:
+        return None
+    variant = match.group("variant")
+    return {
+        "digest": match.group("digest"),
+        "size": None if variant == "original" else int(variant),
+        "format": match.group("fmt").lower(),
+        "is_original": variant == "original",
+    }
+
+
+def parse_object_key(key: str) -> Optional[Dict]:
+    """객체 키 → {"logo_hash", "size"(원본이면 None), "format", "is_original"}
+
+    콘텐츠 주소 키(cas/...)는 logo_hash 대신 "digest"를 담고 logo_hash는 None
+    """
+    cas = parse_cas_key(key)
+    if cas:
+        return {"logo_hash": None, **cas}
+    match = OBJECT_KEY_PATTERN.match(key)
+    if not match:
+        return None
+    variant = match.group("variant")
+    return {
+        "logo_hash": match.group("hash"),
+        "size": None if variant == "original" else int(variant),
+        "format": match.group("fmt").lower(),
+        "is_original": variant == "original",
+    }
+
+
+def row_key(object_key: str, logo_hash: str) -> str:
+    """logo_files.minio_object_key 값 - 공유 객체는 로고별 '#logo_hash'를 붙이고, 기존 키는 그대로"""
+    return f"{object_key}#{logo_hash}" if is_cas_key(object_key) else object_key
+
+
+def object_key_of(key: str) -> str:
+    """행 키 → 실제 객체 키"""
+    return key.split("#", 1)[0] if key else key
+
+
+def row_logo_hash(key: str) -> Optional[str]:
+    """행 키에 기록된 소유 logo_hash (기존 키는 '_' 앞부분)"""
+    if not key:
+        return None
+    if is_cas_key(key):
+        _, sep, logo_hash = key.partition("#")
+        return logo_hash if sep and logo_hash else None
+    return key.split("_", 1)[0]
+
+
+def belongs_to(key: str, logo_hash: str) -> bool:
+    """logo_files 행 키가 logo_hash의 것인지 (기존 키: 접두사, 공유 키: '#logo_hash')"""
+    key = str(key or "")
+    if is_cas_key(key):
+        return key.endswith(f"#{logo_hash}")
+    return key.startswith(logo_hash)
+
+
+def expected_renditions(digest: str, sizes: Iterable[int], with_original: bool,
+                        formats: Iterable[str] = RENDITION_FORMATS) -> List[str]:
+    """변환 파이프라인이 만드는 객체 키 목록 (SVG 원본이면 original.svg 포함)"""
+    keys = [cas_key(digest, size, fmt) for size in sizes for fmt in formats]
+    if with_original:
+        keys.append(cas_key(digest))
+    return keys
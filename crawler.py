@@ -4,23 +4,34 @@
 """
 
 import asyncio
-import aiohttp
-import requests
 import hashlib
 import os
+import threading
+import time
 from datetime import datetime
-from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 from io import BytesIO
 import json
-
-from playwright.async_api import async_playwright
-from fake_useragent import UserAgent
-from PIL import Image
-from minio import Minio
 import logging
 
+from progress_journal import get_journal
+from content_store import cas_key, cas_prefix, content_digest, expected_renditions, image_sizes, parse_object_key
+from image_encoder import encode_rendition, prepare as prepare_for_encoding, rendition_formats
+from minio_inventory import get_inventory, notify_put, split_key
+from similarity_index import DUPLICATE_DISTANCE as SIMILARITY_DUPLICATE_DISTANCE, get_similarity_index, hamming, rendition_dhash
+from metrics import crawl_stage, instrument_minio, observe_crawl_stage, record_cache
+from tracing import crawl_trace, span
+from event_log import get_event_logger
+
+# NOTE: Playwright, fake_useragent, PIL, aiohttp, minio는 임포트 비용이 커서
+# 실제로 사용하는 메서드 안에서 임포트한다.
+if TYPE_CHECKING:
+    from fake_useragent import UserAgent
+    from minio import Minio
+
 logger = logging.getLogger(__name__)
+# 크롤링 단계별 진단은 이벤트 로그(DEBUG, 셀렉터 실패는 샘플링)로 기록
+log = get_event_logger(__name__)
 
 class DateTimeEncoder(json.JSONEncoder):
     """datetime 객체를 JSON으로 직렬화하는 커스텀 인코더"""
@@ -29,43 +40,100 @@ class DateTimeEncoder(json.JSONEncoder):
             return obj.isoformat()
         return super().default(obj)
 
+_shared_lock = threading.Lock()
+_shared_user_agent = None
+_shared_minio_client = None
+
+
+def get_shared_user_agent() -> "UserAgent":
+    """프로세스 전역 UserAgent (데이터셋 로딩은 최초 1회만)"""
+    global _shared_user_agent
+    if _shared_user_agent is None:
+        with _shared_lock:
+            if _shared_user_agent is None:
+                from fake_useragent import UserAgent
+                _shared_user_agent = UserAgent()
+    return _shared_user_agent
+
+
+def get_shared_minio_client() -> "Minio":
+    """프로세스 전역 MinIO 클라이언트"""
+    global _shared_minio_client
+    if _shared_minio_client is None:
+        with _shared_lock:
+            if _shared_minio_client is None:
+                from storage import create_storage_client
+                _shared_minio_client = instrument_minio(create_storage_client())
+    return _shared_minio_client
+
+
 class LogoCrawler:
-    """로고 크롤링 클래스"""
+    """로고 크롤링 클래스
+
+    앱 단위로 한 번 생성해 재사용하는 것을 전제로 하며,
+    UserAgent / MinIO / 기존 API 클라이언트는 최초 사용 시점에 초기화된다.
+    """
     
-    def __init__(self):
-        self.ua = UserAgent()
-        self.minio_client = Minio(
-            os.getenv('MINIO_ENDPOINT', 'minio:9000'),
-            access_key=os.getenv('MINIO_ACCESS_KEY', 'minioadmin'),
-            secret_key=os.getenv('MINIO_SECRET_KEY', 'minioadmin123'),
-            secure=False
-        )
+    def __init__(self, minio_client: Optional["Minio"] = None, existing_api=None, quota=None):
+        self._ua = None
+        self._minio_client = minio_client
+        self._existing_api = existing_api
+        self._quota = quota
         self.bucket = os.getenv('MINIO_BUCKET', 'logos')
         self.existing_api_base = os.getenv('EXISTING_API_BASE', 'http://10.150.2.150:8004')
         self.logo_dev_token = os.getenv('LOGO_DEV_TOKEN')
-        
-        # existing_api 인스턴스 생성
-        from api_server import existing_api
-        self.existing_api = existing_api
+        self.logo_dev_base_url = os.getenv('LOGO_DEV_BASE_URL', 'https://img.logo.dev').rstrip('/')
+        # infomax_code → 마지막 크롤링에서 저장(또는 재사용)한 파일 (API 서버가 DB 등록 시 pop_saved_files로 가져감)
+        self._saved_files: Dict[str, List[Dict]] = {}
+    
+    @property
+    def ua(self) -> "UserAgent":
+        if self._ua is None:
+            self._ua = get_shared_user_agent()
+        return self._ua
+    
+    @property
+    def minio_client(self) -> "Minio":
+        if self._minio_client is None:
+            self._minio_client = get_shared_minio_client()
+        return self._minio_client
+    
+    @property
+    def existing_api(self):
+        if self._existing_api is None:
+            from existing_api_client import get_existing_api
+            self._existing_api = get_existing_api()
+        return self._existing_api
+    
+    @property
+    def quota(self):
+        if self._quota is None:
+            from quota import get_quota_ledger
+            self._quota = get_quota_ledger('logo_dev')
+        return self._quota
         
     async def crawl_website(self, infomax_code: str, ticker: str) -> Optional[bytes]:
         """웹사이트에서 로고 크롤링 (재시도 로직 포함)"""
+        import aiohttp
+        from playwright.async_api import async_playwright
+        
         max_retries = 3
         base_timeout = 10000  # 10초
         
         for attempt in range(max_retries):
             try:
-                logger.info(f"웹사이트 크롤링 시도 {attempt + 1}/{max_retries}: {infomax_code}")
+                log.debug("website.attempt", "웹사이트 크롤링 시도", infomax_code=infomax_code, attempt=attempt + 1, max_retries=max_retries)
                 
                 # 시도마다 타임아웃 증가
                 timeout = base_timeout + (attempt * 5000)  # 10초, 15초, 20초
                 
-                async with async_playwright() as p:
-                    browser = await p.chromium.launch(headless=True)
-                    context = await browser.new_context(
-                        viewport={'width': 1920, 'height': 1080},
-                        user_agent=self.ua.random
-                    )
+                async with span("attempt", source="website", attempt=attempt + 1, timeout_ms=timeout) as attempt_span, async_playwright() as p:
+                    with crawl_stage("browser_launch", "crawl_website"):
+                        browser = await p.chromium.launch(headless=True)
+                        context = await browser.new_context(
+                            viewport={'width': 1920, 'height': 1080},
+                            user_agent=self.ua.random
+                        )
                     # 페이지 타임아웃 설정
                     context.set_default_timeout(timeout)
                     
@@ -74,8 +142,10 @@ class LogoCrawler:
                     # 웹사이트 페이지로 이동
                     base_url = os.getenv('WEBSITE_BASE_URL', 'https://example.com')
                     url = f"{base_url}/symbols/{ticker}/news"
-                    print(f"🔍 웹사이트 URL: {url} (타임아웃: {timeout}ms)")
-                    await page.goto(url, timeout=timeout)
+                    log.debug("website.navigate", "웹사이트 이동", infomax_code=infomax_code, url=url, timeout_ms=timeout)
+                    with crawl_stage("navigation", "crawl_website"):
+                        await page.goto(url, timeout=timeout)
+                    search_started = time.perf_counter()
                     
                     # 로고 이미지 선택자 (여러 가능성 시도)
                     selectors = [
@@ -110,22 +180,25 @@ class LogoCrawler:
                     # XPath 셀렉터 우선 시도
                     for xpath in xpath_selectors:
                         try:
-                            element = await page.wait_for_selector(f"xpath={xpath}", timeout=3000, state="attached")
+                            with span("selector_probe", kind="xpath", selector=xpath) as probe:
+                                element = await page.wait_for_selector(f"xpath={xpath}", timeout=3000, state="attached")
+                                probe["outcome"] = "hit" if element else "miss"
                             if element:
+                                observe_crawl_stage("selector_search", "crawl_website", search_started)
                                 # SVG인 경우
                                 if 'svg' in xpath:
                                     svg_content = await element.inner_html()
                                     await browser.close()
-                                    print(f"✅ SVG 크롤링 성공 (XPath): {infomax_code}")
+                                    log.debug("website.found", "SVG 크롤링 성공", infomax_code=infomax_code, via="xpath", kind="svg")
                                     return svg_content.encode('utf-8')
                                 # IMG인 경우
                                 else:
                                     src = await element.get_attribute('src')
-                                    print(f"🔍 XPath IMG src 발견: {src}")
                                     if src:
                                         # 국기 이미지 제외 (country/로 시작하고 .svg로 끝나는 경우)
                                         if 'country/' in src and src.endswith('.svg'):
-                                            print(f"🔍 국기 이미지 제외: {src}")
+                                            log.debug("website.flag_image", "국기 이미지 제외", infomax_code=infomax_code, src=src)
+                                            attempt_span["outcome"] = "flag_image"
                                             await browser.close()
                                             return None  # logo.dev로 폴백
                                         
@@ -134,43 +207,48 @@ class LogoCrawler:
                                             base_url = os.getenv('WEBSITE_BASE_URL', 'https://example.com')
                                             src = f"{base_url}{src}" if src.startswith('/') else f"{base_url}/{src}"
                                         
-                                        print(f"🔍 최종 URL: {src}")
                                         timeout_http = aiohttp.ClientTimeout(total=10)  # 10초 타임아웃
-                                        async with aiohttp.ClientSession(timeout=timeout_http) as session:
-                                            async with session.get(src) as response:
-                                                if response.status == 200:
-                                                    data = await response.read()
-                                                    await browser.close()
-                                                    print(f"✅ IMG 크롤링 성공 (XPath): {infomax_code}, 크기: {len(data)} bytes")
-                                                    return data
-                                                else:
-                                                    print(f"🔍 HTTP 응답 실패: {response.status}")
+                                        data = None
+                                        with crawl_stage("download", "crawl_website", url=src) as fetch:
+                                            async with aiohttp.ClientSession(timeout=timeout_http) as session:
+                                                async with session.get(src) as response:
+                                                    if response.status == 200:
+                                                        data = await response.read()
+                                                    else:
+                                                        fetch["outcome"] = f"http_{response.status}"
+                                                        log.debug("website.download_failed", "HTTP 응답 실패", infomax_code=infomax_code, url=src, status=response.status)
+                                        if data is not None:
+                                            await browser.close()
+                                            log.debug("website.found", "IMG 크롤링 성공", infomax_code=infomax_code, via="xpath", bytes=len(data))
+                                            return data
                                     else:
-                                        print(f"🔍 XPath IMG src 없음: {xpath}")
                                         continue
                         except Exception as e:
-                            print(f"🔍 XPath 셀렉터 실패: {xpath} - {e}")
+                            log.debug("website.selector_miss", "XPath 셀렉터 실패", sample=0.05, infomax_code=infomax_code, selector=xpath, error=str(e)[:200])
                             continue
                     
                     # CSS 셀렉터 시도 (XPath 실패 시)
                     for selector in selectors:
                         try:
-                            element = await page.wait_for_selector(selector, timeout=3000, state="attached")  # 3초로 단축
+                            with span("selector_probe", kind="css", selector=selector) as probe:
+                                element = await page.wait_for_selector(selector, timeout=3000, state="attached")  # 3초로 단축
+                                probe["outcome"] = "hit" if element else "miss"
                             if element:
+                                observe_crawl_stage("selector_search", "crawl_website", search_started)
                                 # SVG인 경우
                                 if 'svg' in selector:
                                     svg_content = await element.inner_html()
                                     await browser.close()
-                                    print(f"✅ SVG 크롤링 성공 (CSS): {infomax_code}")
+                                    log.debug("website.found", "SVG 크롤링 성공", infomax_code=infomax_code, via="css", kind="svg")
                                     return svg_content.encode('utf-8')
                                 # IMG인 경우
                                 else:
                                     src = await element.get_attribute('src')
-                                    print(f"🔍 CSS IMG src 발견: {src}")
                                     if src:
                                         # 국기 이미지 제외 (country/로 시작하고 .svg로 끝나는 경우)
                                         if 'country/' in src and src.endswith('.svg'):
-                                            print(f"🔍 국기 이미지 제외: {src}")
+                                            log.debug("website.flag_image", "국기 이미지 제외", infomax_code=infomax_code, src=src)
+                                            attempt_span["outcome"] = "flag_image"
                                             await browser.close()
                                             return None  # logo.dev로 폴백
                                         
@@ -179,32 +257,35 @@ class LogoCrawler:
                                             base_url = os.getenv('WEBSITE_BASE_URL', 'https://example.com')
                                             src = f"{base_url}{src}" if src.startswith('/') else f"{base_url}/{src}"
                                         
-                                        print(f"🔍 최종 URL: {src}")
                                         timeout_http = aiohttp.ClientTimeout(total=10)  # 10초 타임아웃
-                                        async with aiohttp.ClientSession(timeout=timeout_http) as session:
-                                            async with session.get(src) as response:
-                                                if response.status == 200:
-                                                    data = await response.read()
-                                                    await browser.close()
-                                                    print(f"✅ IMG 크롤링 성공 (CSS): {infomax_code}, 크기: {len(data)} bytes")
-                                                    return data
-                                                else:
-                                                    print(f"🔍 HTTP 응답 실패: {response.status}")
+                                        data = None
+                                        with crawl_stage("download", "crawl_website", url=src) as fetch:
+                                            async with aiohttp.ClientSession(timeout=timeout_http) as session:
+                                                async with session.get(src) as response:
+                                                    if response.status == 200:
+                                                        data = await response.read()
+                                                    else:
+                                                        fetch["outcome"] = f"http_{response.status}"
+                                                        log.debug("website.download_failed", "HTTP 응답 실패", infomax_code=infomax_code, url=src, status=response.status)
+                                        if data is not None:
+                                            await browser.close()
+                                            log.debug("website.found", "IMG 크롤링 성공", infomax_code=infomax_code, via="css", bytes=len(data))
+                                            return data
                         except Exception as e:
-                            print(f"🔍 CSS 셀렉터 실패: {selector} - {e}")
+                            log.debug("website.selector_miss", "CSS 셀렉터 실패", sample=0.05, infomax_code=infomax_code, selector=selector, error=str(e)[:200])
                             continue
                     
+                    observe_crawl_stage("selector_search", "crawl_website", search_started)
+                    attempt_span["outcome"] = "no_logo"
                     await browser.close()
-                    print(f"❌ 모든 셀렉터 실패: {infomax_code}")
+                    log.debug("website.no_logo", "모든 셀렉터 실패", infomax_code=infomax_code, attempt=attempt + 1)
                     if attempt < max_retries - 1:
-                        print(f"🔄 재시도 예정: {infomax_code}")
                         continue
                     return None
                     
             except Exception as e:
-                print(f"웹사이트 크롤링 오류 ({infomax_code}, 시도 {attempt + 1}): {e}")
+                log.warning("website.error", "웹사이트 크롤링 오류", infomax_code=infomax_code, attempt=attempt + 1, error=str(e)[:200])
                 if attempt < max_retries - 1:
-                    print(f"🔄 재시도 예정: {infomax_code}")
                     continue
                 return None
         
@@ -212,133 +293,83 @@ class LogoCrawler:
     
     async def crawl_logo_dev(self, infomax_code: str, api_domain: str) -> Optional[bytes]:
         """logo.dev API에서 로고 크롤링"""
-        print(f"🔍 logo.dev 크롤링 시작: {infomax_code}, api_domain: {api_domain}")
+        import aiohttp
+        
+        log.debug("logo_dev.start", "logo.dev 크롤링 시작", infomax_code=infomax_code, api_domain=api_domain)
         try:
             if not self.logo_dev_token:
-                print("❌ LOGO_DEV_TOKEN이 설정되지 않았습니다")
+                log.warning("logo_dev.no_token", "LOGO_DEV_TOKEN이 설정되지 않았습니다")
                 return None
             
-            print(f"🔍 logo.dev 토큰 확인: {self.logo_dev_token[:10]}...")
             
-            # API 쿼터 확인
-            if not await self._check_quota('logo_dev'):
-                print("logo.dev 일일 쿼터 초과")
+            # API 쿼터 소모 (성공·실패 불문 호출당 1건, 로컬 임대분에서 차감)
+            # 로컬 임대분이 없을 때만 원장 임대(블로킹 HTTP)를 이벤트 루프 밖에서 실행
+            if not self.quota.try_consume_local(1) and not await asyncio.to_thread(self.quota.try_consume, 1):
+                log.warning("logo_dev.quota_exceeded", "logo.dev 일일 쿼터 초과", infomax_code=infomax_code)
                 return None
             
-            url = f"https://img.logo.dev/{api_domain}?token={self.logo_dev_token}&format=png&size=300&fallback=404"
-            print(f"🔍 logo.dev API URL: {url}")
+            url = f"{self.logo_dev_base_url}/{api_domain}?token={self.logo_dev_token}&format=png&size=300&fallback=404"
             
             timeout = aiohttp.ClientTimeout(total=15)  # 15초 타임아웃
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                print(f"🔍 logo.dev API 호출 시작: {api_domain}")
-                async with session.get(url) as response:
-                    print(f"🔍 logo.dev API 응답: {response.status}")
-                    if response.status == 200:
-                        data = await response.read()
-                        print(f"✅ logo.dev 크롤링 성공: {infomax_code}, 크기: {len(data)} bytes")
-                        # 쿼터 사용량 업데이트
-                        await self._update_quota('logo_dev')
-                        return data
-                    else:
-                        print(f"❌ logo.dev API 오류: {response.status}")
-                        return None
+            with crawl_stage("download", "crawl_logo_dev", api_domain=api_domain) as fetch:
+                async with aiohttp.ClientSession(timeout=timeout) as session:
+                    async with session.get(url) as response:
+                        fetch["outcome"] = "ok" if response.status == 200 else f"http_{response.status}"
+                        if response.status == 200:
+                            data = await response.read()
+                            log.debug("logo_dev.found", "logo.dev 크롤링 성공", infomax_code=infomax_code, bytes=len(data))
+                            return data
+                        else:
+                            log.debug("logo_dev.http_error", "logo.dev API 오류", infomax_code=infomax_code, api_domain=api_domain, status=response.status)
+                            return None
                         
         except Exception as e:
-            print(f"logo.dev 크롤링 오류 ({infomax_code}): {e}")
+            log.warning("logo_dev.error", "logo.dev 크롤링 오류", infomax_code=infomax_code, error=str(e)[:200])
             return None
     
-    async def _check_quota(self, provider: str) -> bool:
-        """API 쿼터 확인"""
-        try:
-            # 기존 API를 통해 쿼터 확인
-            timeout = aiohttp.ClientTimeout(total=10)  # 10초 타임아웃
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                url = f"{self.existing_api_base}/api/query/raw_data/ext_api_quota"
-                params = {
-                    "api_name": provider,
-                    "quota_date": datetime.now().strftime('%Y-%m-%d'),
-                    "limit": 1
-                }
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        print(f"🔍 쿼터 확인 응답: {data}")
-                        # 페이지네이션된 응답 구조 확인
-                        if 'data' in data and data['data'] and len(data['data']) > 0:
-                            used_count = data['data'][0].get('used_count', 0)
-                            max_count = data['data'][0].get('max_count', 5000)
-                            print(f"🔍 쿼터 사용량: {used_count}/{max_count}")
-                            return used_count < max_count
-                        elif data and len(data) > 0:
-                            used_count = data[0].get('used_count', 0)
-                            max_count = data[0].get('max_count', 5000)
-                            print(f"🔍 쿼터 사용량 (직접): {used_count}/{max_count}")
-                            return used_count < max_count
-            print(f"🔍 쿼터 확인 실패, 기본값 True 반환")
-            return True
-        except:
-            return True
-    
-    async def _update_quota(self, provider: str):
-        """API 쿼터 사용량 업데이트"""
-        try:
-            # 기존 API를 통해 쿼터 업데이트
-            timeout = aiohttp.ClientTimeout(total=10)  # 10초 타임아웃
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                url = f"{self.existing_api_base}/api/schemas/raw_data/tables/ext_api_quota/upsert"
-                data = {
-                    "api_name": provider,
-                    "quota_date": datetime.now().strftime('%Y-%m-%d'),
-                    "used_count": 1,
-                    "max_count": 5000
-                }
-                async with session.post(url, json=data) as response:
-                    pass  # 결과는 무시
-        except:
-            pass
-    
-    def convert_image(self, image_data: bytes, infomax_code: str) -> Dict[str, bytes]:
-        """이미지를 다양한 크기로 변환 (SVG → PNG/WebP 포함)"""
-        print(f"🔍 convert_image 함수 진입: {infomax_code}")
+    def convert_image(self, image_data: bytes, infomax_code: str, encodings: Optional[Dict[str, int]] = None) -> Dict[str, bytes]:
+        """이미지를 다양한 크기로 변환 (SVG → PNG/WebP 포함)
+
+        렌디션마다 image_encoder의 후보 중 화질 기준을 통과한 가장 작은 인코딩을 사용하고,
+        encodings가 주어지면 {"png_240": quality 값}을 채운다 (logo_files.quality 기록용)
+        """
+        from PIL import Image
+        
         try:
             results = {}
             image = None
             
             # SVG인 경우 PNG/WebP로 변환
-            print(f"🔍 이미지 데이터 확인: {infomax_code}, 시작 바이트: {image_data[:50]}")
             if image_data.startswith(b'<svg') or image_data.startswith(b'<?xml'):
-                print(f"🔍 SVG 파일 감지: {infomax_code}")
                 
                 # SVG를 PIL Image로 변환하기 위해 cairosvg 사용 시도
                 try:
                     import cairosvg
                     # SVG를 PNG로 변환
                     png_data = cairosvg.svg2png(bytestring=image_data)
-                    print(f"🔍 SVG → PNG 변환 완료: {infomax_code} ({len(png_data)} bytes)")
                     
                     # PNG 데이터를 PIL Image로 열기
                     png_buffer = BytesIO(png_data)
                     image = Image.open(png_buffer)
-                    print(f"✅ SVG → PNG → PIL Image 변환 성공: {infomax_code}, 크기: {image.size}")
+                    log.debug("convert.svg_rasterized", "SVG → PNG 변환", infomax_code=infomax_code, bytes=len(png_data), size=image.size)
                 except ImportError:
-                    print("❌ cairosvg가 설치되지 않음. SVG 원본만 저장")
+                    log.error("convert.no_cairosvg", "cairosvg가 설치되지 않음. SVG 원본만 저장")
                     return {"original": image_data}
                 except Exception as e:
-                    print(f"❌ SVG 변환 실패: {e}")
-                    print(f"🔍 PNG 데이터 확인: {png_data[:50] if 'png_data' in locals() else 'None'}")
+                    log.warning("convert.svg_failed", "SVG 변환 실패", infomax_code=infomax_code, error=str(e)[:200])
                     return {"original": image_data}
             else:
                 # 일반 이미지 파일
-                print(f"🔍 일반 이미지 파일 감지: {infomax_code}")
                 image_buffer = BytesIO(image_data)
                 image = Image.open(image_buffer)
             
             # image가 None이면 변환 실패
             if image is None:
-                print(f"❌ 이미지 변환 실패: {infomax_code}")
+                log.warning("convert.no_image", "이미지 변환 실패", infomax_code=infomax_code)
                 return {"original": image_data}
             
-            print(f"🔍 이미지 변환 시작: {infomax_code}, 크기: {image.size}")
+            log.debug("convert.start", "이미지 변환 시작", infomax_code=infomax_code, size=image.size, mode=image.mode)
+            image = prepare_for_encoding(image)
             
             # 표준 사이즈로 변환 (환경변수 IMAGE_SIZES 사용, 기본 240,300)
             sizes_env = os.getenv('IMAGE_SIZES', '240,300')
@@ -347,60 +378,104 @@ class LogoCrawler:
             except Exception:
                 sizes = [240, 300]
             
-            formats = ['PNG', 'WebP']
+            formats = rendition_formats()
             
             # 원본도 저장 (SVG인 경우)
             if image_data.startswith(b'<svg') or image_data.startswith(b'<?xml'):
                 results["original"] = image_data
             
             for size in sizes:
+                # 리사이즈 (형식마다 같은 결과이므로 크기당 1회)
+                resized = image.resize((size, size), Image.Resampling.LANCZOS)
                 for format_type in formats:
+                    rendition = f"{format_type}_{size}"
                     try:
-                        # 리사이즈
-                        resized = image.resize((size, size), Image.Resampling.LANCZOS)
-                        
-                        # 바이트로 변환
-                        output = BytesIO()
-                        if format_type == 'PNG':
-                            resized.save(output, format='PNG', optimize=True)
-                        else:  # WebP
-                            resized.save(output, format='WebP', quality=85, optimize=True)
-                        
-                        converted_data = output.getvalue()
-                        results[f"{format_type.lower()}_{size}"] = converted_data
-                        print(f"✅ 이미지 변환 완료: {format_type.lower()}_{size}px ({len(converted_data)} bytes)")
+                        # 후보 인코딩 중 가장 작은 것 (AVIF는 기준 통과 후보가 없으면 생략)
+                        encoded = encode_rendition(resized, format_type)
+                        if encoded is None:
+                            log.debug("convert.rendition_skipped", "화질 기준을 만족하는 인코딩 없음", infomax_code=infomax_code, rendition=rendition)
+                            continue
+                        results[rendition], quality = encoded
+                        if encodings is not None:
+                            encodings[rendition] = quality
                         
                     except Exception as e:
-                        print(f"❌ 이미지 변환 실패 ({format_type}_{size}px): {e}")
+                        log.warning("convert.rendition_failed", "이미지 변환 실패", infomax_code=infomax_code, rendition=rendition, error=str(e)[:200])
                         continue
             
-            logger.info(f"이미지 변환 완료: {infomax_code}, {len(results)}개 파일")
+            log.debug("convert.done", "이미지 변환 완료", infomax_code=infomax_code, renditions=len(results))
             return results
             
         except Exception as e:
-            logger.error(f"이미지 변환 오류 ({infomax_code}): {e}")
             # 변환 실패해도 원본은 저장
-            result = {"original": image_data}
-            logger.info(f"변환 실패로 원본만 반환: {len(result)}개")
-            return result
+            log.error("convert.error", "이미지 변환 오류, 원본만 반환", infomax_code=infomax_code, error=str(e)[:200])
+            return {"original": image_data}
+    
+    def stored_renditions(self, digest: str) -> Dict[str, int]:
+        """다이제스트 접두사 아래 저장된 객체 {객체 키: 크기}
+
+        다른 프로세스가 방금 쓴 객체를 인벤토리가 아직 모르면 다시 변환/업로드한다 (같은 내용이므로 무해).
+        """
+        return self.stored_objects(cas_prefix(digest))
+    
+    def stored_objects(self, prefix: str) -> Dict[str, int]:
+        """인벤토리 접두사(logo_hash 또는 다이제스트 디렉터리)의 객체 {객체 키: 크기}
+
+        API 서버 프로세스는 인벤토리(네트워크 호출 없음), 그 밖에는 접두사 list_objects 1회.
+        """
+        inventory = get_inventory(self.bucket)
+        if inventory and inventory.ready:
+            return {key: entry[0] for key, entry in inventory.objects(prefix).items()}
+        return {
+            obj.object_name: obj.size
+            for obj in self.minio_client.list_objects(self.bucket, prefix=prefix, recursive=True)
+            if split_key(obj.object_name)[0] == prefix
+        }
+    
+    @staticmethod
+    def _reused_files(objects: Dict[str, int], data_source: str) -> List[Dict]:
+        """이미 저장된 객체 {키: 크기} → 등록용 파일 정보 (렌디션 키가 아닌 객체는 제외)"""
+        files = []
+        for object_key, file_size in sorted(objects.items()):
+            parsed = parse_object_key(object_key)
+            if not parsed:
+                continue
+            files.append({
+                'object_key': object_key,
+                'format': parsed['format'],
+                'dimension_width': parsed['size'],
+                'dimension_height': parsed['size'],
+                'file_size': file_size,
+                'is_original': parsed['is_original'],
+                'data_source': data_source
+            })
+        return files
+    
+    def pop_saved_files(self, infomax_code: str) -> Optional[List[Dict]]:
+        """crawl_logo가 저장한 파일 목록을 꺼냄 (없으면 None)"""
+        return self._saved_files.pop(infomax_code, None)
     
     async def save_to_minio(self, image_data: bytes, object_key: str, content_type: str = "image/png"):
         """MinIO에 이미지 저장"""
         try:
-            self.minio_client.put_object(
-                self.bucket,
-                object_key,
-                BytesIO(image_data),
-                len(image_data),
-                content_type=content_type
-            )
+            with crawl_stage("upload", "save_to_minio", object_key=object_key, bytes=len(image_data)):
+                written = self.minio_client.put_object(
+                    self.bucket,
+                    object_key,
+                    BytesIO(image_data),
+                    len(image_data),
+                    content_type=content_type
+                )
+            notify_put(self.bucket, object_key, len(image_data), written.etag)
             return True
         except Exception as e:
-            print(f"MinIO 저장 오류: {e}")
+            log.error("minio.put_failed", "MinIO 저장 오류", object_key=object_key, error=str(e))
             return False
     
     async def save_to_database(self, infomax_code: str, logo_hash: str, file_info: Dict):
         """데이터베이스에 로고 정보 저장 (직접 API 호출)"""
+        import aiohttp
+        
         print(f"🔍 DB 저장 시작: {infomax_code}, {logo_hash}")
         print(f"🔍 file_info: {file_info}")
         try:
@@ -479,132 +554,155 @@ class LogoCrawler:
             print(f"데이터베이스 저장 오류: {e}")
             return False
     
-    async def crawl_logo(self, infomax_code: str, ticker: str, api_domain: str = None) -> bool:
-        """로고 크롤링 메인 함수"""
-        print(f"🔍🔍🔍 CRAWL_LOGO 함수 진입: {infomax_code}")
-        print(f"🔍🔍🔍 파라미터: ticker={ticker}, api_domain={api_domain}")
-        try:
-            print(f"🔍 크롤링 시작: {infomax_code}, ticker={ticker}, api_domain={api_domain}")
-            print(f"🔍 함수 진입 확인: {infomax_code}")
-            
-            # 타임아웃 설정 (30초)
-            import asyncio
+    async def crawl_logo(self, infomax_code: str, ticker: str, api_domain: str = None, job_id: str = None) -> bool:
+        """로고 크롤링 메인 함수 (호출 1건마다 크롤링 트레이스를 job_id 작업에 기록)"""
+        with crawl_trace(infomax_code, job_id, ticker=ticker, api_domain=api_domain) as trace:
             try:
-                print(f"🔍 _crawl_logo_internal 호출 전: {infomax_code}")
-                print(f"🔍 asyncio.wait_for 시작: {infomax_code}")
-                result = await asyncio.wait_for(
-                    self._crawl_logo_internal(infomax_code, ticker, api_domain),
-                    timeout=30.0
-                )
-                print(f"🔍 _crawl_logo_internal 호출 후: {infomax_code}, 결과: {result}")
-                print(f"🔍🔍🔍 CRAWL_LOGO 함수 완료: {infomax_code}, 결과: {result}")
-                return result
-            except asyncio.TimeoutError:
-                print(f"🔍 크롤링 타임아웃: {infomax_code}")
-                return False
+                log.debug("crawl.start", "크롤링 시작", infomax_code=infomax_code, ticker=ticker, api_domain=api_domain)
+                
+                # 타임아웃 설정 (30초)
+                import asyncio
+                try:
+                    result = await asyncio.wait_for(
+                        self._crawl_logo_internal(infomax_code, ticker, api_domain),
+                        timeout=30.0
+                    )
+                    log.debug("crawl.done", "크롤링 완료", infomax_code=infomax_code, ok=result)
+                    trace.outcome = "success" if result else "failed"
+                    return result
+                except asyncio.TimeoutError:
+                    log.warning("crawl.timeout", "크롤링 타임아웃", infomax_code=infomax_code)
+                    trace.outcome = "timeout"
+                    return False
+                except Exception as e:
+                    log.error("crawl.error", "크롤링 오류", exc_info=True, infomax_code=infomax_code, error=str(e)[:200])
+                    trace.outcome = "error"
+                    return False
+                    
             except Exception as e:
-                print(f"🔍 asyncio.wait_for 오류: {infomax_code} - {e}")
-                import traceback
-                print(f"🔍 asyncio 오류 상세: {traceback.format_exc()}")
+                log.error("crawl.error", "크롤링 함수 오류", exc_info=True, infomax_code=infomax_code, error=str(e)[:200])
+                trace.outcome = "error"
                 return False
-                
-        except Exception as e:
-            print(f"🔍 크롤링 함수 오류: {infomax_code} - {e}")
-            import traceback
-            print(f"🔍 오류 상세: {traceback.format_exc()}")
-            return False
     
     async def _crawl_logo_internal(self, infomax_code: str, ticker: str, api_domain: str = None) -> bool:
         """로고 크롤링 내부 함수"""
         try:
-            print(f"🔍 내부 함수 진입: {infomax_code}")
             image_data = None
             data_source = None
             logo_hash = None
             
             # 웹사이트에서 크롤링 시도 (ticker가 있을 때만)
             if ticker and ticker.strip():
-                print(f"🔍 웹사이트 크롤링 시도: {infomax_code}")
                 try:
                     image_data = await self.crawl_website(infomax_code, ticker)
-                    print(f"🔍 crawl_website 반환값 확인: {infomax_code}, 타입: {type(image_data)}, 길이: {len(image_data) if image_data else 'None'}")
                     if image_data:
                         data_source = "website"
                         logo_hash = hashlib.md5(f"website_{infomax_code}".encode()).hexdigest()
-                        print(f"🔍 웹사이트 크롤링 성공: {infomax_code}")
                     else:
-                        print(f"🔍 웹사이트 크롤링 실패: {infomax_code}")
+                        log.debug("crawl.website_miss", "웹사이트 크롤링 실패", infomax_code=infomax_code)
                 except Exception as e:
-                    print(f"🔍 웹사이트 크롤링 오류: {infomax_code} - {e}")
+                    log.warning("crawl.website_error", "웹사이트 크롤링 오류", infomax_code=infomax_code, error=str(e)[:200])
             
             # 웹사이트 실패 시 logo.dev 시도
             if not image_data and api_domain:
-                print(f"🔍 logo.dev 크롤링 시도: {infomax_code}")
                 try:
                     image_data = await self.crawl_logo_dev(infomax_code, api_domain)
                     if image_data:
                         data_source = "logo_dev"
                         logo_hash = hashlib.md5(f"logo_dev_{infomax_code}".encode()).hexdigest()
-                        print(f"🔍 logo.dev 크롤링 성공: {infomax_code}")
                     else:
-                        print(f"🔍 logo.dev 크롤링 실패: {infomax_code}")
+                        log.debug("crawl.logo_dev_miss", "logo.dev 크롤링 실패", infomax_code=infomax_code)
                 except Exception as e:
-                    print(f"🔍 logo.dev 크롤링 오류: {infomax_code} - {e}")
+                    log.warning("crawl.logo_dev_error", "logo.dev 크롤링 오류", infomax_code=infomax_code, error=str(e)[:200])
             
             if not image_data:
-                print(f"❌ 모든 크롤링 시도 실패: {infomax_code}")
+                log.debug("crawl.no_image", "모든 크롤링 시도 실패", infomax_code=infomax_code)
                 return False
             
-            # 이미지 변환
-            print(f"🔍 이미지 변환 시작: {infomax_code}")
-            try:
-                converted_images = self.convert_image(image_data, infomax_code)
-                print(f"🔍 이미지 변환 완료: {infomax_code}")
-            except Exception as e:
-                print(f"❌ 이미지 변환 중 오류: {infomax_code} - {e}")
-                converted_images = {"original": image_data}
+            # 원본 다이제스트로 기존 객체 확인 (다른 종목이 같은 로고를 이미 저장했으면 변환/업로드 생략)
+            digest = content_digest(image_data)
+            is_svg = image_data.startswith(b'<svg') or image_data.startswith(b'<?xml')
+            with crawl_stage("dedup", "stored_renditions", digest=digest[:12]):
+                stored = self.stored_renditions(digest)
+            expected = expected_renditions(digest, image_sizes(), with_original=is_svg)
+            deduplicated = bool(stored) and all(key in stored for key in expected)
+            record_cache("content_store", deduplicated)
+            
+            converted_images = {}
+            encodings: Dict[str, int] = {}
+            if not deduplicated:
+                # 이미지 변환
+                try:
+                    with crawl_stage("convert", "convert_image"):
+                        # 후보 인코딩 비교로 CPU 시간이 길어 이벤트 루프 밖에서 실행 (Pillow 인코더는 GIL 해제)
+                        converted_images = await asyncio.to_thread(self.convert_image, image_data, infomax_code, encodings)
+                except Exception as e:
+                    log.error("crawl.convert_error", "이미지 변환 중 오류", infomax_code=infomax_code, error=str(e)[:200])
+                    converted_images = {"original": image_data}
             
             # master에서 logo_hash 조회
-            print(f"🔍 master에서 logo_hash 조회: {infomax_code}")
             try:
                 master_result = self.existing_api.query_table("raw_data", "logo_master", {
                     "search_column": "infomax_code",
                     "search": infomax_code,
                     "limit": 1
                 })
-                print(f"🔍 master 조회 결과: {master_result}")
                 
                 if master_result and 'data' in master_result and master_result['data']:
                     logo_hash = master_result['data'][0]['logo_hash']
-                    print(f"🔍 master logo_hash 조회 성공: {logo_hash}")
                 else:
-                    print(f"❌ master logo_hash 조회 실패: {infomax_code}")
+                    log.warning("crawl.no_master", "master logo_hash 조회 실패", infomax_code=infomax_code)
                     return False
             except Exception as e:
-                print(f"❌ master 조회 오류: {e}")
+                log.error("crawl.master_error", "master 조회 오류", infomax_code=infomax_code, error=str(e)[:200])
                 return False
             
-            # MinIO에 저장
+            # 지각 해시: 현재 로고와 시각적으로 같으면(바이트만 다른 재크롤링) 업로드하지 않고 현재 객체를 다시 등록
+            group = cas_prefix(digest)
+            similarity = get_similarity_index(self.bucket)
+            perceptual_hash = None
+            visual_duplicate = False
+            if similarity is not None and converted_images:
+                perceptual_hash = rendition_dhash(converted_images)
+                current = similarity.current_group(logo_hash)
+                current_hash = similarity.hash_of(current) if current else None
+                if perceptual_hash is not None and current_hash is not None and current != group:
+                    distance = hamming(perceptual_hash, current_hash)
+                    if distance <= SIMILARITY_DUPLICATE_DISTANCE:
+                        current_objects = self.stored_objects(current)
+                        if current_objects:
+                            visual_duplicate = True
+                            group, stored = current, current_objects
+                            converted_images = {}
+                            log.debug("crawl.visual_duplicate", "현재 로고와 시각적으로 같음 - 업로드 생략", infomax_code=infomax_code,
+                                      group=current, distance=distance)
+                record_cache("similarity", visual_duplicate)
+            
+            # MinIO에 저장 (다이제스트 키 - 행 키의 '#logo_hash'는 API 서버가 등록 시 붙임)
             saved_files = []
-            print(f"🔍 변환된 이미지 개수: {len(converted_images)}")
+            if deduplicated:
+                # 선택 렌디션(AVIF)은 저장되어 있으면 함께 등록
+                optional = expected_renditions(digest, image_sizes(), with_original=False, formats=rendition_formats())
+                reused = {key: stored[key] for key in (*expected, *optional) if key in stored}
+                saved_files = self._reused_files(reused, data_source)
+                log.debug("crawl.dedup_hit", "동일 원본 객체 재사용", infomax_code=infomax_code, digest=digest, files=len(saved_files))
+            elif visual_duplicate:
+                saved_files = self._reused_files(stored, data_source)
+            
             for format_key, img_data in converted_images.items():
                 if format_key == "original":
-                    # master의 logo_hash 사용
-                    object_key = f"{logo_hash}_original.svg"
+                    object_key = cas_key(digest)
                     content_type = "image/svg+xml"
                     is_original = True
                     format_type = "svg"
                     size = None
                 else:
                     format_type, size = format_key.split('_')
-                    # master의 logo_hash 사용
-                    object_key = f"{logo_hash}_{size}.{format_type.lower()}"
+                    object_key = cas_key(digest, int(size), format_type)
                     content_type = f"image/{format_type.lower()}"
                     is_original = False
                 
-                print(f"🔍 MinIO 저장 시도: {object_key}, 크기: {len(img_data)} bytes")
                 if await self.save_to_minio(img_data, object_key, content_type):
-                    print(f"✅ MinIO 저장 성공: {object_key}")
                     file_info = {
                         'object_key': object_key,
                         'format': format_type.lower(),
@@ -612,31 +710,30 @@ class LogoCrawler:
                         'dimension_height': int(size) if size else None,
                         'file_size': len(img_data),
                         'is_original': is_original,
-                        'data_source': data_source
+                        'data_source': data_source,
+                        'quality': encodings.get(format_key)
                     }
                     saved_files.append(file_info)
-                    print(f"🔍 파일 정보 추가: {file_info}")
                 else:
-                    print(f"❌ MinIO 저장 실패: {object_key}")
+                    log.warning("crawl.put_failed", "MinIO 저장 실패", infomax_code=infomax_code, object_key=object_key)
             
-            # 데이터베이스에 저장
-            print(f"🔍 saved_files 개수: {len(saved_files)}")
+            # 데이터베이스 저장은 API 서버에서 처리 (save_to_database 호출 제거)
             if not saved_files:
-                print(f"❌ 저장할 파일이 없음: {infomax_code}")
+                log.warning("crawl.nothing_saved", "저장할 파일이 없음", infomax_code=infomax_code)
                 return False
-                
-            for file_info in saved_files:
-                print(f"🔍 파일 저장: {file_info}")
-                # DB 저장은 API 서버에서 처리하도록 함
-                print(f"✅ 파일 저장 완료 (DB는 별도 처리): {infomax_code}")
-                # DB 저장 비활성화 - API 서버에서 처리
-                # save_to_database 함수 호출 완전 제거
             
-            print(f"로고 크롤링 성공: {infomax_code} ({len(saved_files)}개 파일)")
+            if similarity is not None:
+                if perceptual_hash is not None and not visual_duplicate:
+                    similarity.record(group, perceptual_hash, owner=logo_hash)
+                else:
+                    similarity.set_current(logo_hash, group)
+            self._saved_files[infomax_code] = saved_files
+            log.debug("crawl.saved", "로고 크롤링 성공", infomax_code=infomax_code, files=len(saved_files),
+                      source=data_source, deduplicated=deduplicated)
             return True
             
         except Exception as e:
-            print(f"로고 크롤링 오류 ({infomax_code}): {e}")
+            log.error("crawl.internal_error", "로고 크롤링 오류", exc_info=True, infomax_code=infomax_code, error=str(e)[:200])
             return False
     
     async def crawl_batch(self, tickers: List[Dict], job_id: str = None) -> str:
@@ -644,11 +741,9 @@ class LogoCrawler:
         if not job_id:
             job_id = f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        # 진행상황 파일 생성
-        progress_file = Path("progress") / f"{job_id}.json"
-        progress_file.parent.mkdir(exist_ok=True)
-        
-        progress_data = {
+        # 진행상황 저널 생성
+        journal = get_journal(job_id, os.getenv('PROGRESS_DIR', 'progress'))
+        journal.create({
             "job_id": job_id,
             "status": "running",
             "total": len(tickers),
@@ -658,10 +753,7 @@ class LogoCrawler:
             "current": "",
             "started_at": datetime.now().isoformat(),
             "errors": []
-        }
-        
-        with open(progress_file, 'w', encoding='utf-8') as f:
-            json.dump(progress_data, f, ensure_ascii=False, indent=2)
+        })
         
         try:
             for i, ticker_info in enumerate(tickers):
@@ -670,37 +762,27 @@ class LogoCrawler:
                 api_domain = ticker_info.get('api_domain')
                 
                 # 진행상황 업데이트
-                progress_data['current'] = f"{infomax_code} ({ticker})"
-                progress_data['completed'] = i
-                
-                with open(progress_file, 'w', encoding='utf-8') as f:
-                    json.dump(progress_data, f, ensure_ascii=False, indent=2)
+                journal.update(current=f"{infomax_code} ({ticker})")
                 
                 # 크롤링 실행
-                success = await self.crawl_logo(infomax_code, ticker, api_domain)
+                success = await self.crawl_logo(infomax_code, ticker, api_domain, job_id=job_id)
+                self.pop_saved_files(infomax_code)  # 단독 실행 - DB 등록은 하지 않음
                 
                 if success:
-                    progress_data['success'] += 1
+                    journal.record_item(inc={"completed": 1, "success": 1})
                 else:
-                    progress_data['failed'] += 1
-                    progress_data['errors'].append(f"Failed: {infomax_code}")
-            
-            # 완료 처리
-            progress_data['status'] = "completed"
-            progress_data['completed'] = len(tickers)
-            progress_data['finished_at'] = datetime.now().isoformat()
+                    journal.record_item(
+                        inc={"completed": 1, "failed": 1},
+                        append={"errors": f"Failed: {infomax_code}"}
+                    )
             
-            with open(progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress_data, f, ensure_ascii=False, indent=2)
+            # 완료 처리 (미사용 쿼터 반환 - 원장 호출은 이벤트 루프 밖에서)
+            await asyncio.to_thread(self.quota.release)
+            journal.update(status="completed", finished_at=datetime.now().isoformat())
             
             return job_id
             
         except Exception as e:
-            progress_data['status'] = "error"
-            progress_data['error'] = str(e)
-            progress_data['finished_at'] = datetime.now().isoformat()
-            
-            with open(progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress_data, f, ensure_ascii=False, indent=2)
+            journal.update(status="error", error=str(e), finished_at=datetime.now().isoformat())
             
             raise e
@@ -0,0 +1,138 @@
+"""
+구조화 로깅 모듈
+핫패스 진단 출력을 print 대신 레벨/샘플링/비동기 큐를 거치는 이벤트 로그로 기록
+
+- setup_logging()       : 루트 로거에 QueueHandler 설치 (포맷/출력은 별도 리스너 스레드에서 처리)
+- get_event_logger(name): log.debug("get_logo.lookup", "로고 조회", infomax_code=..., rows=3)
+  - 레벨이 꺼져 있으면 isEnabledFor 한 번으로 끝남 (메시지 포맷/쓰기 없음)
+  - sample=0.01 이면 이벤트 100건 중 약 1건만 기록 (LOG_SAMPLE_RATES로 이벤트별 재정의)
+
+환경변수
+- LOG_LEVEL        : 기본 INFO (요청/행 단위 진단은 DEBUG)
+- LOG_FORMAT       : text(기본) | json
+- LOG_SAMPLE_RATES : "get_logo.files=0.1,missing_scan.row=0" 형식의 이벤트별 샘플링 비율
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+def _parse_rates(text: str) -> Dict[str, float]:
+    rates = {}
+    for part in (text or "").split(","):
+        name, _, rate = part.partition("=")
+        if name.strip() and rate.strip():
+            try:
+                rates[name.strip()] = max(0.0, min(1.0, float(rate)))
+            except ValueError:
+                pass
+    return rates
+
+
+SAMPLE_RATES = _parse_rates(os.getenv('LOG_SAMPLE_RATES', ''))
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON: ts, level, logger, event, msg + 이벤트 필드"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "msg": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """사람이 읽는 한 줄: 시각 레벨 로거 [이벤트] key=value ... 메시지 (예외 트레이스백은 메시지 뒤)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        parts = [self.formatTime(record), record.levelname, record.name]
+        event = getattr(record, "event", None)
+        message = record.getMessage()
+        if event:
+            parts.append(f"[{event}]")
+        fields = getattr(record, "fields", None)
+        if fields:
+            parts.extend(f"{k}={v}" for k, v in fields.items())
+        if message and message != event:
+            parts.append(message)
+        text = " ".join(parts)
+        if record.exc_info:
+            text += "\n" + self.formatException(record.exc_info)
+        return text
+
+
+def setup_logging(level: Optional[str] = None, fmt: Optional[str] = None):
+    """루트 로거 구성 (프로세스당 1회) - 호출 스레드는 큐에 넣기만 하고 포맷/쓰기는 리스너 스레드가 담당"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+        fmt = (fmt or os.getenv('LOG_FORMAT', 'text')).lower()
+
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+        log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        root = logging.getLogger()
+        root.handlers = [logging.handlers.QueueHandler(log_queue)]
+        root.setLevel(getattr(logging, level, logging.INFO))
+
+
+class EventLogger:
+    """이벤트 이름 + 필드로 기록하는 로거 래퍼"""
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(name)
+
+    def enabled(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level: int, event: str, msg: str = "", sample: float = 1.0, exc_info=None, **fields):
+        if not self.logger.isEnabledFor(level):
+            return
+        rate = SAMPLE_RATES.get(event, sample)
+        if rate < 1.0:
+            if rate <= 0.0 or random.random() >= rate:
+                return
+            fields["sample_rate"] = rate
+        self.logger.log(level, msg or event, exc_info=exc_info, extra={"event": event, "fields": fields}, stacklevel=3)
+
+    def debug(self, event: str, msg: str = "", sample: float = 1.0, **fields):
+        self.log(logging.DEBUG, event, msg, sample, **fields)
+
+    def info(self, event: str, msg: str = "", sample: float = 1.0, **fields):
+        self.log(logging.INFO, event, msg, sample, **fields)
+
+    def warning(self, event: str, msg: str = "", sample: float = 1.0, **fields):
+        self.log(logging.WARNING, event, msg, sample, **fields)
+
+    def error(self, event: str, msg: str = "", sample: float = 1.0, exc_info=None, **fields):
+        self.log(logging.ERROR, event, msg, sample, exc_info=exc_info, **fields)
+
+
+def get_event_logger(name: str) -> EventLogger:
+    return EventLogger(name)
@@ -0,0 +1,145 @@
+"""
+기존 API 클라이언트 모듈
+기존 API 서버(/api/schemas/{schema}/tables/{table}/query|upsert) 호출 기능을 제공
+"""
+
+import asyncio
+import os
+import threading
+from collections import deque
+from typing import AsyncIterator, Dict, Optional, Tuple
+import requests
+import logging
+
+from metrics import UPSTREAM_REQUEST_DURATION, timed
+
+logger = logging.getLogger(__name__)
+
+
+class ExistingAPIClient:
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+    
+    async def query_table_async(self, schema: str, table: str, params: dict = None):
+        """테이블 쿼리 실행"""
+        try:
+            url = f"{self.base_url}/api/schemas/{schema}/tables/{table}/query"
+            with timed(UPSTREAM_REQUEST_DURATION, table=table, operation="query", outcome="ok"):
+                response = requests.get(url, params=params or {}, timeout=10)
+                response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"기존 API 쿼리 오류: {e}")
+            return None
+    
+    async def upsert_data_async(self, schema: str, table: str, data: dict):
+        """데이터 삽입/업데이트"""
+        try:
+            url = f"{self.base_url}/api/schemas/{schema}/tables/{table}/upsert"
+            with timed(UPSTREAM_REQUEST_DURATION, table=table, operation="upsert", outcome="ok"):
+                response = requests.post(url, json=data, timeout=10)
+                response.raise_for_status()
+            try:
+                return response.json()
+            except Exception:
+                return {"text": response.text}
+        except Exception as e:
+            logger.error(f"기존 API 데이터 입력 오류: {e}")
+            return None
+
+    def query_table(self, schema: str, table: str, params: dict = None):
+        """테이블 쿼리 실행 (동기)"""
+        try:
+            url = f"{self.base_url}/api/schemas/{schema}/tables/{table}/query"
+            with timed(UPSTREAM_REQUEST_DURATION, table=table, operation="query", outcome="ok"):
+                response = requests.get(url, params=params or {}, timeout=10)
+                response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"기존 API 쿼리 오류: {e}")
+            return None
+
+    def upsert_data(self, schema: str, table: str, data: dict):
+        """데이터 삽입/업데이트 (동기)"""
+        return self.upsert_data_status(schema, table, data)[0]
+
+    def upsert_data_status(self, schema: str, table: str, data: dict) -> Tuple[Optional[dict], Optional[int]]:
+        """데이터 삽입/업데이트 (동기) - (응답 또는 실패 시 None, HTTP 상태 코드 또는 연결 오류 시 None)"""
+        url = f"{self.base_url}/api/schemas/{schema}/tables/{table}/upsert"
+        try:
+            with timed(UPSTREAM_REQUEST_DURATION, table=table, operation="upsert", outcome="ok"):
+                response = requests.post(url, json=data, timeout=10)
+                response.raise_for_status()
+            try:
+                return response.json(), response.status_code
+            except Exception:
+                return {"text": response.text}, response.status_code
+        except Exception as e:
+            logger.error(f"기존 API 데이터 입력 오류: {e}")
+            print(f"❌ upsert_data 오류 상세: {e}")
+            print(f"❌ URL: {url}")
+            print(f"❌ 데이터: {data}")
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            return None, status
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_existing_api() -> ExistingAPIClient:
+    """EXISTING_API_BASE 환경변수 기반 프로세스 전역 클라이언트"""
+    global _default_client
+    if _default_client is None:
+        with _default_lock:
+            if _default_client is None:
+                _default_client = ExistingAPIClient(
+                    os.getenv('EXISTING_API_BASE', 'http://10.150.2.150:8004')
+                )
+    return _default_client
+
+
+async def iter_table_pages(
+    api: ExistingAPIClient,
+    schema: str,
+    table: str,
+    params: Optional[Dict] = None,
+    start_page: int = 1,
+    concurrency: int = 4,
+    retries: int = 3,
+) -> AsyncIterator[Tuple[int, int, Dict]]:
+    """테이블을 페이지 순서대로 순회하며 (page, total_pages, 응답)을 yield
+
+    첫 페이지 응답의 total_pages를 기준으로 다음 concurrency개 페이지를 동시에 미리 가져오되,
+    결과는 항상 페이지 순서대로 내보낸다. 페이지 조회가 retries회 실패하면 RuntimeError.
+    """
+    params = dict(params or {})
+    concurrency = max(1, concurrency)
+
+    async def fetch(page: int) -> Dict:
+        delay = 0.5
+        for attempt in range(1, retries + 1):
+            response = await asyncio.to_thread(api.query_table, schema, table, dict(params, page=page))
+            if response is not None:
+                return response
+            if attempt < retries:
+                await asyncio.sleep(delay)
+                delay *= 2
+        raise RuntimeError(f"{schema}.{table} {page}페이지 조회 실패")
+
+    first = await fetch(start_page)
+    total_pages = first.get("total_pages") or start_page
+    yield start_page, total_pages, first
+
+    pending = deque()
+    next_page = start_page + 1
+    try:
+        while next_page <= total_pages or pending:
+            while len(pending) < concurrency and next_page <= total_pages:
+                pending.append((next_page, asyncio.create_task(fetch(next_page))))
+                next_page += 1
+            page, task = pending.popleft()
+            yield page, total_pages, await task
+    finally:
+        for _, task in pending:
+            task.cancel()
@@ -0,0 +1,180 @@
+"""
+렌디션 인코더 모듈
+렌디션마다 후보 인코딩 몇 가지를 만들어, 화질 기준을 통과하는 것 중 가장 작은 결과를 고른다
+
+- PNG  : 팔레트(2^ENCODER_PALETTE_BITS색 양자화, 기본 4,6,8 → 16/64/256색) / 트루컬러 (zlib 최대 압축)
+- WebP : 무손실 / 손실 (ENCODER_WEBP_QUALITIES, 기본 90,80,70)
+- AVIF : ENCODER_AVIF=true이고 Pillow가 AVIF 저장을 지원할 때만 (손실, ENCODER_AVIF_QUALITIES)
+         logo_files.chk_file_format에 'avif'를 추가한 뒤 켜야 한다
+- 메타데이터(EXIF, ICC, XMP, PNG 텍스트 청크)는 쓰지 않는다
+- 화질 기준: 원본 렌디션 대비 가중 PSNR >= ENCODER_MIN_PSNR dB (기본 40)
+  흰 배경에 합성한 YCbCr과 알파의 MSE를 Y:Cb:Cr:A = 6:1:1:6으로 가중 (WebP 손실의 색차 서브샘플링을 과하게 벌하지 않도록)
+  무손실 후보는 항상 통과하므로 PNG/WebP는 늘 결과가 있고, AVIF는 통과 후보가 없으면 만들지 않는다
+
+logo_files.quality 값 (chk_quality 1~100 범위, file_format과 함께 해석 - describe_quality 참고)
+- 100 : 무손실 (트루컬러 PNG, 무손실 WebP)
+- PNG 1~8     : 팔레트 PNG의 색 비트 수 (색 수 = 2^값)
+- WebP/AVIF 1~99 : 손실 인코딩의 quality 설정값
+"""
+
+import math
+import os
+from io import BytesIO
+from typing import Callable, List, Optional, Tuple
+
+MIN_PSNR = float(os.getenv('ENCODER_MIN_PSNR', '40'))
+LOSSLESS = 100
+
+
+def _int_list(name: str, default: str) -> Tuple[int, ...]:
+    try:
+        return tuple(int(v.strip()) for v in os.getenv(name, default).split(',') if v.strip())
+    except ValueError:
+        return tuple(int(v) for v in default.split(','))
+
+
+PALETTE_BITS = tuple(b for b in _int_list('ENCODER_PALETTE_BITS', '4,6,8') if 1 <= b <= 8)
+WEBP_QUALITIES = tuple(q for q in _int_list('ENCODER_WEBP_QUALITIES', '90,80,70') if 1 <= q <= 99)
+AVIF_QUALITIES = tuple(q for q in _int_list('ENCODER_AVIF_QUALITIES', '80,65,50') if 1 <= q <= 99)
+AVIF_ENABLED = os.getenv('ENCODER_AVIF', 'false').lower() == 'true'
+
+_avif_supported: Optional[bool] = None
+
+
+def avif_supported() -> bool:
+    """Pillow가 AVIF를 저장할 수 있는지 (Pillow 11.2+ 내장 또는 pillow-avif-plugin)"""
+    global _avif_supported
+    if _avif_supported is None:
+        from PIL import Image
+        try:
+            import pillow_avif  # noqa: F401 - 임포트 시 AVIF 플러그인 등록
+        except ImportError:
+            pass
+        Image.init()
+        _avif_supported = "AVIF" in Image.SAVE
+    return _avif_supported
+
+
+def rendition_formats() -> List[str]:
+    """변환 파이프라인이 만드는 렌디션 형식 (선호 순서와 무관, AVIF는 설정/지원 시에만)"""
+    formats = ["png", "webp"]
+    if AVIF_ENABLED and avif_supported():
+        formats.append("avif")
+    return formats
+
+
+def describe_quality(file_format: Optional[str], quality: Optional[int]) -> Optional[str]:
+    """logo_files.quality → "lossless" / "palette-64" / "lossy-80" (기록이 없으면 None)"""
+    if quality is None:
+        return None
+    quality = int(quality)
+    if quality == LOSSLESS:
+        return "lossless"
+    if (file_format or "").lower() == "png":
+        return f"palette-{2 ** quality}"
+    return f"lossy-{quality}"
+
+
+def prepare(image):
+    """인코딩 전 정규화 - 알파가 실제로 쓰이면 RGBA, 아니면 RGB로 바꾸고 메타데이터(info) 제거"""
+    has_alpha = image.mode in ("RGBA", "LA", "PA", "RGBa") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+    if has_alpha and image.getextrema()[3][0] == 255:
+        image = image.convert("RGB")
+    image.info = {}
+    return image
+
+
+PLANE_WEIGHTS = (6, 1, 1, 6)  # Y, Cb, Cr, A
+
+
+def _planes(image, mode: str):
+    """비교용 밴드 (Y, Cb, Cr[, A]) - 알파가 있으면 흰 배경에 합성해 투명 픽셀의 숨은 색 차이는 무시"""
+    from PIL import Image
+
+    image = image.convert(mode)
+    if mode != "RGBA":
+        return image.convert("YCbCr").split()
+    background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+    background.alpha_composite(image)
+    return (*background.convert("RGB").convert("YCbCr").split(), image.getchannel("A"))
+
+
+def psnr(reference, candidate) -> float:
+    """두 이미지의 가중 PSNR(dB) - 같으면 inf (reference는 prepare된 이미지)"""
+    from PIL import ImageChops, ImageStat
+
+    mode = reference.mode
+    pixels = reference.size[0] * reference.size[1]
+    weighted = weights = 0
+    for weight, a, b in zip(PLANE_WEIGHTS, _planes(reference, mode), _planes(candidate, mode)):
+        weighted += weight * ImageStat.Stat(ImageChops.difference(a, b)).sum2[0] / pixels
+        weights += weight
+    mse = weighted / weights
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def _save(image, format: str, **params) -> bytes:
+    output = BytesIO()
+    image.save(output, format=format, **params)
+    return output.getvalue()
+
+
+def _decoded(data: bytes):
+    from PIL import Image
+
+    image = Image.open(BytesIO(data))
+    image.load()
+    return image
+
+
+# 후보: (quality 값, 인코딩 함수 → (bytes, 비교할 디코딩 이미지 또는 None=무손실))
+Candidate = Tuple[int, Callable[[object], Tuple[bytes, object]]]
+
+
+def _palette(bits: int) -> Candidate:
+    def encode(image):
+        from PIL import Image
+
+        method = Image.Quantize.FASTOCTREE if image.mode == "RGBA" else Image.Quantize.MEDIANCUT
+        quantized = image.quantize(colors=2 ** bits, method=method)
+        return _save(quantized, "PNG", optimize=True), quantized
+    return bits, encode
+
+
+def _lossy(format: str, quality: int, **params) -> Candidate:
+    def encode(image):
+        data = _save(image, format, quality=quality, **params)
+        return data, _decoded(data)
+    return quality, encode
+
+
+def candidates(fmt: str) -> List[Candidate]:
+    """형식별 후보 목록"""
+    fmt = fmt.lower()
+    if fmt == "png":
+        return [(LOSSLESS, lambda image: (_save(image, "PNG", optimize=True), None))] + [_palette(b) for b in PALETTE_BITS]
+    if fmt == "webp":
+        return [(LOSSLESS, lambda image: (_save(image, "WEBP", lossless=True), None))] + [
+            _lossy("WEBP", q) for q in WEBP_QUALITIES
+        ]
+    if fmt == "avif":
+        return [_lossy("AVIF", q) for q in AVIF_QUALITIES]
+    raise ValueError(f"지원하지 않는 렌디션 형식: {fmt}")
+
+
+def encode_rendition(image, fmt: str, min_psnr: float = None) -> Optional[Tuple[bytes, int]]:
+    """prepare된 이미지를 fmt로 인코딩 - 화질 기준을 통과한 가장 작은 후보의 (bytes, quality 값)
+
+    통과 후보가 없으면 None (PNG/WebP는 무손실 후보가 있으므로 AVIF에서만 발생)
+    """
+    threshold = MIN_PSNR if min_psnr is None else min_psnr
+    best: Optional[Tuple[bytes, int]] = None
+    for quality, encode in candidates(fmt):
+        data, decoded = encode(image)
+        if best is not None and len(data) >= len(best[0]):
+            continue
+        if decoded is not None and psnr(image, decoded) < threshold:
+            continue
+        best = (data, quality)
+    return best
@@ -0,0 +1,876 @@
+"""
+크롤링 작업 큐 모듈
+작업(job)을 종목 배치 단위 작업 항목(work item)으로 나눠 임대(lease)하는 영속 작업 큐와
+비동기 워커 풀을 제공
+
+- 저장소는 BaseJobQueue 인터페이스를 따르며 기본 구현은 로컬 SQLite 파일(JobQueue)
+- 여러 노드(컨테이너)가 같은 저장소를 공유하면 작업 항목을 나눠 처리한다
+  SQLite는 한 호스트(로컬 볼륨) 안의 프로세스/컨테이너끼리만 공유할 수 있고 (네트워크 파일시스템에서는 WAL 잠금을 믿을 수 없음),
+  여러 호스트가 나눠 처리하려면 Postgres 저장소(PostgresJobQueue, JOB_QUEUE_BACKEND=postgres)를 쓴다
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('queued', 'running', 'completed', 'failed')
+ITEM_STATUSES = ('pending', 'leased', 'done', 'failed')
+
+
+def default_worker_id(index: int = 0) -> str:
+    """호스트/프로세스 단위로 고유한 워커 식별자"""
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+class BaseJobQueue(ABC):
+    """작업 큐 저장소 인터페이스
+
+    작업(job) 1건은 작업 항목(work item) N개로 나뉜다. 워커는 항목을 visibility timeout 동안
+    임대하고 heartbeat로 연장하며, 만료된 임대는 다른 워커가 다시 가져간다.
+    모든 항목이 끝나면 작업은 completed(실패 항목이 있으면 failed)가 된다.
+    """
+
+    scheduling = 'fifo'
+
+    @abstractmethod
+    def enqueue(
+        self, job_id: str, kind: str, payload: Dict, priority: int = 0,
+        items: Optional[List[Dict]] = None, sealed: bool = True
+    ) -> Dict:
+        """작업 등록 - items 미지정 시 payload 전체가 항목 1개가 된다
+
+        sealed=False면 add_items()로 항목을 계속 추가할 수 있고, seal() 전에는 종료되지 않는다.
+        """
+
+    @abstractmethod
+    def add_items(self, job_id: str, items: List[Dict]) -> int:
+        """열린(sealed=False) 작업에 항목 추가 - 추가한 항목 수 반환"""
+
+    @abstractmethod
+    def seal(self, job_id: str, payload: Optional[Dict] = None) -> Optional[str]:
+        """작업 항목 추가 종료 (payload를 주면 작업 payload 갱신) - 이미 모두 끝났으면 작업의 최종 상태를 반환"""
+
+    @abstractmethod
+    def lease(self, worker_id: str, visibility_timeout: float) -> Optional[Dict]:
+        """처리할 항목 1개를 원자적으로 임대 (없으면 None)"""
+
+    @abstractmethod
+    def extend_lease(self, item_id: int, worker_id: str, visibility_timeout: float) -> bool:
+        """임대 연장 (heartbeat) - 임대를 잃었으면 False"""
+
+    @abstractmethod
+    def expire_leases(self) -> List[Tuple[str, str]]:
+        """재시도 한도를 넘긴 만료 항목 정리 - 종료된 작업의 (job_id, 상태) 목록"""
+
+    @abstractmethod
+    def ack(self, item_id: int, worker_id: str) -> Optional[str]:
+        """항목 완료 - 작업이 끝났으면 작업의 최종 상태를 반환"""
+
+    @abstractmethod
+    def nack(self, item_id: int, worker_id: str, error: str) -> Optional[str]:
+        """항목 실패 - 재시도 한도 내면 다시 대기열로, 작업이 끝났으면 최종 상태를 반환"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict]:
+        """작업 조회"""
+
+    @abstractmethod
+    def item_payloads(self, job_id: str) -> List[Dict]:
+        """작업 항목 payload 목록 (등록 순)"""
+
+    @abstractmethod
+    def depth(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+
+    @abstractmethod
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """작업 목록"""
+
+
+class JobQueue(BaseJobQueue):
+    """SQLite 기반 영속 작업 큐 (로컬/단일 볼륨 공유용 기본 구현)
+
+    - 여러 프로세스(컨테이너)가 같은 파일을 공유해도 임대는 BEGIN IMMEDIATE로 원자적으로 처리된다.
+    - scheduling: 'fifo'(등록 순) 또는 'priority'(priority 내림차순 → 등록 순)
+    - 항목은 max_attempts회까지 재시도하고 그 이후에는 failed로 남는다.
+    """
+
+    def __init__(self, path, scheduling: str = 'fifo', max_attempts: int = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if scheduling not in ('fifo', 'priority'):
+            raise ValueError(f"지원하지 않는 스케줄링 방식: {scheduling}")
+        self.scheduling = scheduling
+        self.max_attempts = max_attempts or int(os.getenv('JOB_ITEM_MAX_ATTEMPTS', '3'))
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # autocommit 모드 - 원자성이 필요한 곳은 BEGIN IMMEDIATE로 직접 묶는다
+        conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL UNIQUE,
+                    kind TEXT NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    heartbeat_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_priority ON jobs(status, priority DESC, seq)")
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+            if 'sealed' not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN sealed INTEGER NOT NULL DEFAULT 1")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS work_items (
+                    item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    batch_no INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    lease_until REAL,
+                    error TEXT,
+                    updated_at TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_work_items_job ON work_items(job_id, status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_work_items_status ON work_items(status, lease_until)")
+            # 항목 분할 도입 이전에 등록된 미완료 작업은 작업 전체를 항목 1개로 변환
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("""
+                INSERT INTO work_items (job_id, batch_no, status, payload, updated_at)
+                SELECT job_id, 0, 'pending', payload, created_at FROM jobs
+                WHERE status IN ('queued', 'running')
+                AND NOT EXISTS (SELECT 1 FROM work_items w WHERE w.job_id = jobs.job_id)
+            """)
+            conn.execute("COMMIT")
+
+    def _order_by(self) -> str:
+        return "priority DESC, seq" if self.scheduling == 'priority' else "seq"
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        return job
+
+    def enqueue(
+        self, job_id: str, kind: str, payload: Dict, priority: int = 0,
+        items: Optional[List[Dict]] = None, sealed: bool = True
+    ) -> Dict:
+        """작업 등록 (같은 job_id가 완료/실패 상태면 항목을 새로 만들어 다시 대기열에 넣음)"""
+        now = datetime.now().isoformat()
+        items = items if items is not None else [payload]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if existing is None:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, kind, priority, status, payload, created_at, sealed) "
+                    "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                    (job_id, kind, priority, json.dumps(payload, ensure_ascii=False), now, int(sealed))
+                )
+            elif existing['status'] in ('completed', 'failed'):
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', payload = ?, priority = ?, owner = NULL, error = NULL, "
+                    "finished_at = NULL, heartbeat_at = NULL, sealed = ? WHERE job_id = ?",
+                    (json.dumps(payload, ensure_ascii=False), priority, int(sealed), job_id)
+                )
+                conn.execute("DELETE FROM work_items WHERE job_id = ?", (job_id,))
+            else:
+                # 대기/실행 중인 작업은 그대로 둔다
+                conn.execute("COMMIT")
+                return self.get(job_id)
+            conn.executemany(
+                "INSERT INTO work_items (job_id, batch_no, status, payload, updated_at) VALUES (?, ?, 'pending', ?, ?)",
+                [(job_id, i, json.dumps(item, ensure_ascii=False), now) for i, item in enumerate(items)]
+            )
+            conn.execute("COMMIT")
+        return self.get(job_id)
+
+    def add_items(self, job_id: str, items: List[Dict]) -> int:
+        if not items:
+            return 0
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            job = conn.execute("SELECT status, sealed FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if job is None or job['sealed'] or job['status'] not in ('queued', 'running'):
+                conn.execute("COMMIT")
+                raise ValueError(f"항목을 추가할 수 없는 작업: {job_id}")
+            start = conn.execute(
+                "SELECT COALESCE(MAX(batch_no) + 1, 0) FROM work_items WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            conn.executemany(
+                "INSERT INTO work_items (job_id, batch_no, status, payload, updated_at) VALUES (?, ?, 'pending', ?, ?)",
+                [(job_id, start + i, json.dumps(item, ensure_ascii=False), now) for i, item in enumerate(items)]
+            )
+            conn.execute("COMMIT")
+        return len(items)
+
+    def seal(self, job_id: str, payload: Optional[Dict] = None) -> Optional[str]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("UPDATE jobs SET sealed = 1 WHERE job_id = ?", (job_id,))
+            if payload is not None:
+                conn.execute(
+                    "UPDATE jobs SET payload = ? WHERE job_id = ?", (json.dumps(payload, ensure_ascii=False), job_id)
+                )
+            finished = self._finish_job_if_done(conn, job_id)
+            conn.execute("COMMIT")
+        return finished
+
+    def lease(self, worker_id: str, visibility_timeout: float) -> Optional[Dict]:
+        """대기 중이거나 임대가 만료된 항목을 원자적으로 임대"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            order = "j.priority DESC, j.seq" if self.scheduling == 'priority' else "j.seq"
+            row = conn.execute(
+                f"""
+                SELECT w.*, j.kind, j.priority FROM work_items w JOIN jobs j ON j.job_id = w.job_id
+                WHERE j.status IN ('queued', 'running')
+                AND (w.status = 'pending' OR (w.status = 'leased' AND w.lease_until < ? AND w.attempts < ?))
+                ORDER BY {order}, w.batch_no LIMIT 1
+                """,
+                (now, self.max_attempts)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE work_items SET status = 'leased', owner = ?, attempts = attempts + 1, lease_until = ?, "
+                "updated_at = ? WHERE item_id = ?",
+                (worker_id, now + visibility_timeout, datetime.now().isoformat(), row['item_id'])
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = COALESCE(started_at, ?), "
+                "heartbeat_at = ? WHERE job_id = ?",
+                (datetime.now().isoformat(), now, row['job_id'])
+            )
+            conn.execute("COMMIT")
+        item = dict(row)
+        item['payload'] = json.loads(item['payload'])
+        item['status'] = 'leased'
+        item['owner'] = worker_id
+        item['attempts'] += 1
+        return item
+
+    def expire_leases(self) -> List[Tuple[str, str]]:
+        """재시도 한도를 넘긴 만료 항목을 실패 처리하고 종료된 작업의 (job_id, 상태) 목록을 반환"""
+        finished = []
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT item_id, job_id FROM work_items WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (time.time(), self.max_attempts)
+            ).fetchall()
+            for row in rows:
+                conn.execute(
+                    "UPDATE work_items SET status = 'failed', owner = NULL, lease_until = NULL, "
+                    "error = COALESCE(error, 'lease expired'), updated_at = ? WHERE item_id = ?",
+                    (datetime.now().isoformat(), row['item_id'])
+                )
+                status = self._finish_job_if_done(conn, row['job_id'])
+                if status:
+                    finished.append((row['job_id'], status))
+            conn.execute("COMMIT")
+        return finished
+
+    def extend_lease(self, item_id: int, worker_id: str, visibility_timeout: float) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE work_items SET lease_until = ? WHERE item_id = ? AND owner = ? AND status = 'leased'",
+                (now + visibility_timeout, item_id, worker_id)
+            )
+            if cur.rowcount > 0:
+                conn.execute(
+                    "UPDATE jobs SET heartbeat_at = ? WHERE job_id = (SELECT job_id FROM work_items WHERE item_id = ?)",
+                    (now, item_id)
+                )
+            return cur.rowcount > 0
+
+    def ack(self, item_id: int, worker_id: str) -> Optional[str]:
+        return self._settle(item_id, worker_id, 'done', None)
+
+    def nack(self, item_id: int, worker_id: str, error: str) -> Optional[str]:
+        return self._settle(item_id, worker_id, None, error)
+
+    def _settle(self, item_id: int, worker_id: str, status: Optional[str], error: Optional[str]) -> Optional[str]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT job_id, attempts FROM work_items WHERE item_id = ? AND owner = ? AND status = 'leased'",
+                (item_id, worker_id)
+            ).fetchone()
+            if row is None:
+                # 임대가 만료되어 다른 워커가 가져간 항목
+                conn.execute("COMMIT")
+                return None
+            if status is None:
+                status = 'pending' if row['attempts'] < self.max_attempts else 'failed'
+            conn.execute(
+                "UPDATE work_items SET status = ?, owner = NULL, lease_until = NULL, error = ?, updated_at = ? "
+                "WHERE item_id = ?",
+                (status, error, datetime.now().isoformat(), item_id)
+            )
+            finished = self._finish_job_if_done(conn, row['job_id'])
+            conn.execute("COMMIT")
+        return finished
+
+    def _finish_job_if_done(self, conn: sqlite3.Connection, job_id: str) -> Optional[str]:
+        """남은 항목이 없으면 작업을 종료 상태로 전환 (트랜잭션 안에서 호출)"""
+        job = conn.execute("SELECT sealed FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if job is None or not job['sealed']:
+            return None
+        counts = {
+            r['status']: r['n'] for r in conn.execute(
+                "SELECT status, COUNT(*) AS n FROM work_items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall()
+        }
+        if counts.get('pending') or counts.get('leased'):
+            return None
+        status = 'failed' if counts.get('failed') else 'completed'
+        error = f"{counts['failed']}개 항목 실패" if counts.get('failed') else None
+        cur = conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, heartbeat_at = NULL "
+            "WHERE job_id = ? AND status IN ('queued', 'running')",
+            (status, error, datetime.now().isoformat(), job_id)
+        )
+        return status if cur.rowcount > 0 else None
+
+    def item_counts(self, job_id: str) -> Dict[str, int]:
+        """작업의 항목 상태별 개수"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS n FROM work_items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall()
+        counts = {status: 0 for status in ITEM_STATUSES}
+        counts.update({row['status']: row['n'] for row in rows})
+        return counts
+
+    def item_payloads(self, job_id: str) -> List[Dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM work_items WHERE job_id = ? ORDER BY batch_no", (job_id,)
+            ).fetchall()
+        return [json.loads(row['payload']) for row in rows]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def depth(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({row['status']: row['n'] for row in rows})
+        return counts
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    f"SELECT * FROM jobs WHERE status = ? ORDER BY {self._order_by()} LIMIT ?", (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY seq DESC LIMIT ?", (limit,)).fetchall()
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job.pop('payload', None)
+            jobs.append(job)
+        return jobs
+
+
+class PostgresJobQueue(BaseJobQueue):
+    """Postgres 기반 작업 큐 (여러 호스트가 하나의 작업을 나눠 처리할 때)
+
+    - 임대는 SELECT ... FOR UPDATE SKIP LOCKED로 잠긴 항목을 건너뛰며 원자적으로 가져온다.
+    - 작업 상태를 바꾸는 트랜잭션은 jobs 행을 먼저 잠그므로, 마지막 항목들이 동시에 끝나도 종료 처리가 빠지지 않는다.
+    - 스키마/의미는 JobQueue와 같다 (psycopg 3 필요, 호출마다 연결).
+    """
+
+    def __init__(self, dsn: str, scheduling: str = 'fifo', max_attempts: int = None):
+        try:
+            import psycopg
+            from psycopg.rows import dict_row
+        except ImportError as e:
+            raise RuntimeError("JOB_QUEUE_BACKEND=postgres에는 psycopg(3.x) 설치가 필요합니다") from e
+        if not dsn:
+            raise ValueError("JOB_QUEUE_DSN이 설정되지 않았습니다")
+        if scheduling not in ('fifo', 'priority'):
+            raise ValueError(f"지원하지 않는 스케줄링 방식: {scheduling}")
+        self._psycopg = psycopg
+        self._dict_row = dict_row
+        self.dsn = dsn
+        self.scheduling = scheduling
+        self.max_attempts = max_attempts or int(os.getenv('JOB_ITEM_MAX_ATTEMPTS', '3'))
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        # with 블록이 끝나면 커밋(예외 시 롤백) 후 연결 종료
+        with self._psycopg.connect(self.dsn, row_factory=self._dict_row) as conn:
+            yield conn
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    seq BIGSERIAL PRIMARY KEY,
+                    job_id TEXT NOT NULL UNIQUE,
+                    kind TEXT NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    heartbeat_at DOUBLE PRECISION,
+                    sealed BOOLEAN NOT NULL DEFAULT TRUE
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_priority ON jobs(status, priority DESC, seq)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS work_items (
+                    item_id BIGSERIAL PRIMARY KEY,
+                    job_id TEXT NOT NULL,
+                    batch_no INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    lease_until DOUBLE PRECISION,
+                    error TEXT,
+                    updated_at TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_work_items_job ON work_items(job_id, status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_work_items_status ON work_items(status, lease_until)")
+
+    def _order_by(self) -> str:
+        return "priority DESC, seq" if self.scheduling == 'priority' else "seq"
+
+    @staticmethod
+    def _row_to_job(row: Dict) -> Dict:
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        return job
+
+    @staticmethod
+    def _insert_items(conn, job_id: str, start: int, items: List[Dict], now: str):
+        with conn.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO work_items (job_id, batch_no, status, payload, updated_at) VALUES (%s, %s, 'pending', %s, %s)",
+                [(job_id, start + i, json.dumps(item, ensure_ascii=False), now) for i, item in enumerate(items)]
+            )
+
+    def enqueue(
+        self, job_id: str, kind: str, payload: Dict, priority: int = 0,
+        items: Optional[List[Dict]] = None, sealed: bool = True
+    ) -> Dict:
+        """작업 등록 (같은 job_id가 완료/실패 상태면 항목을 새로 만들어 다시 대기열에 넣음)"""
+        now = datetime.now().isoformat()
+        items = items if items is not None else [payload]
+        encoded = json.dumps(payload, ensure_ascii=False)
+        with self._connect() as conn:
+            inserted = conn.execute(
+                "INSERT INTO jobs (job_id, kind, priority, status, payload, created_at, sealed) "
+                "VALUES (%s, %s, %s, 'queued', %s, %s, %s) ON CONFLICT (job_id) DO NOTHING RETURNING seq",
+                (job_id, kind, priority, encoded, now, sealed)
+            ).fetchone()
+            if inserted is None:
+                existing = conn.execute("SELECT status FROM jobs WHERE job_id = %s FOR UPDATE", (job_id,)).fetchone()
+                if existing['status'] not in ('completed', 'failed'):
+                    # 대기/실행 중인 작업은 그대로 둔다
+                    items = []
+                else:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'queued', payload = %s, priority = %s, owner = NULL, error = NULL, "
+                        "finished_at = NULL, heartbeat_at = NULL, sealed = %s WHERE job_id = %s",
+                        (encoded, priority, sealed, job_id)
+                    )
+                    conn.execute("DELETE FROM work_items WHERE job_id = %s", (job_id,))
+            if items:
+                self._insert_items(conn, job_id, 0, items, now)
+        return self.get(job_id)
+
+    def add_items(self, job_id: str, items: List[Dict]) -> int:
+        if not items:
+            return 0
+        with self._connect() as conn:
+            job = conn.execute("SELECT status, sealed FROM jobs WHERE job_id = %s FOR UPDATE", (job_id,)).fetchone()
+            if job is None or job['sealed'] or job['status'] not in ('queued', 'running'):
+                raise ValueError(f"항목을 추가할 수 없는 작업: {job_id}")
+            start = conn.execute(
+                "SELECT COALESCE(MAX(batch_no) + 1, 0) AS start FROM work_items WHERE job_id = %s", (job_id,)
+            ).fetchone()['start']
+            self._insert_items(conn, job_id, start, items, datetime.now().isoformat())
+        return len(items)
+
+    def seal(self, job_id: str, payload: Optional[Dict] = None) -> Optional[str]:
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET sealed = TRUE WHERE job_id = %s", (job_id,))
+            if payload is not None:
+                conn.execute(
+                    "UPDATE jobs SET payload = %s WHERE job_id = %s", (json.dumps(payload, ensure_ascii=False), job_id)
+                )
+            return self._finish_job_if_done(conn, job_id)
+
+    def lease(self, worker_id: str, visibility_timeout: float) -> Optional[Dict]:
+        """대기 중이거나 임대가 만료된 항목을 원자적으로 임대 (다른 워커가 잠근 항목은 건너뜀)"""
+        now = time.time()
+        order = "j.priority DESC, j.seq" if self.scheduling == 'priority' else "j.seq"
+        with self._connect() as conn:
+            row = conn.execute(
+                f"""
+                SELECT w.*, j.kind, j.priority FROM work_items w JOIN jobs j ON j.job_id = w.job_id
+                WHERE j.status IN ('queued', 'running')
+                AND (w.status = 'pending' OR (w.status = 'leased' AND w.lease_until < %s AND w.attempts < %s))
+                ORDER BY {order}, w.batch_no LIMIT 1
+                FOR UPDATE OF w SKIP LOCKED
+                """,
+                (now, self.max_attempts)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE work_items SET status = 'leased', owner = %s, attempts = attempts + 1, lease_until = %s, "
+                "updated_at = %s WHERE item_id = %s",
+                (worker_id, now + visibility_timeout, datetime.now().isoformat(), row['item_id'])
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = COALESCE(started_at, %s), "
+                "heartbeat_at = %s WHERE job_id = %s",
+                (datetime.now().isoformat(), now, row['job_id'])
+            )
+        item = dict(row)
+        item['payload'] = json.loads(item['payload'])
+        item['status'] = 'leased'
+        item['owner'] = worker_id
+        item['attempts'] += 1
+        return item
+
+    def expire_leases(self) -> List[Tuple[str, str]]:
+        """재시도 한도를 넘긴 만료 항목을 실패 처리하고 종료된 작업의 (job_id, 상태) 목록을 반환"""
+        finished = []
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT item_id, job_id FROM work_items WHERE status = 'leased' AND lease_until < %s AND attempts >= %s "
+                "FOR UPDATE SKIP LOCKED",
+                (time.time(), self.max_attempts)
+            ).fetchall()
+            for row in rows:
+                conn.execute(
+                    "UPDATE work_items SET status = 'failed', owner = NULL, lease_until = NULL, "
+                    "error = COALESCE(error, 'lease expired'), updated_at = %s WHERE item_id = %s",
+                    (datetime.now().isoformat(), row['item_id'])
+                )
+            for job_id in dict.fromkeys(row['job_id'] for row in rows):
+                status = self._finish_job_if_done(conn, job_id)
+                if status:
+                    finished.append((job_id, status))
+        return finished
+
+    def extend_lease(self, item_id: int, worker_id: str, visibility_timeout: float) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE work_items SET lease_until = %s WHERE item_id = %s AND owner = %s AND status = 'leased'",
+                (now + visibility_timeout, item_id, worker_id)
+            )
+            if cur.rowcount > 0:
+                conn.execute(
+                    "UPDATE jobs SET heartbeat_at = %s WHERE job_id = (SELECT job_id FROM work_items WHERE item_id = %s)",
+                    (now, item_id)
+                )
+            return cur.rowcount > 0
+
+    def ack(self, item_id: int, worker_id: str) -> Optional[str]:
+        return self._settle(item_id, worker_id, 'done', None)
+
+    def nack(self, item_id: int, worker_id: str, error: str) -> Optional[str]:
+        return self._settle(item_id, worker_id, None, error)
+
+    def _settle(self, item_id: int, worker_id: str, status: Optional[str], error: Optional[str]) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, attempts FROM work_items WHERE item_id = %s AND owner = %s AND status = 'leased' FOR UPDATE",
+                (item_id, worker_id)
+            ).fetchone()
+            if row is None:
+                # 임대가 만료되어 다른 워커가 가져간 항목
+                return None
+            if status is None:
+                status = 'pending' if row['attempts'] < self.max_attempts else 'failed'
+            conn.execute(
+                "UPDATE work_items SET status = %s, owner = NULL, lease_until = NULL, error = %s, updated_at = %s "
+                "WHERE item_id = %s",
+                (status, error, datetime.now().isoformat(), item_id)
+            )
+            return self._finish_job_if_done(conn, row['job_id'])
+
+    def _finish_job_if_done(self, conn, job_id: str) -> Optional[str]:
+        """남은 항목이 없으면 작업을 종료 상태로 전환 (트랜잭션 안에서 호출)
+
+        jobs 행을 잠근 뒤 항목을 세므로, 먼저 커밋한 다른 트랜잭션의 항목 상태까지 보고 판단한다.
+        """
+        job = conn.execute("SELECT sealed FROM jobs WHERE job_id = %s FOR UPDATE", (job_id,)).fetchone()
+        if job is None or not job['sealed']:
+            return None
+        counts = {
+            r['status']: r['n'] for r in conn.execute(
+                "SELECT status, COUNT(*) AS n FROM work_items WHERE job_id = %s GROUP BY status", (job_id,)
+            ).fetchall()
+        }
+        if counts.get('pending') or counts.get('leased'):
+            return None
+        status = 'failed' if counts.get('failed') else 'completed'
+        error = f"{counts['failed']}개 항목 실패" if counts.get('failed') else None
+        cur = conn.execute(
+            "UPDATE jobs SET status = %s, error = %s, finished_at = %s, heartbeat_at = NULL "
+            "WHERE job_id = %s AND status IN ('queued', 'running')",
+            (status, error, datetime.now().isoformat(), job_id)
+        )
+        return status if cur.rowcount > 0 else None
+
+    def item_counts(self, job_id: str) -> Dict[str, int]:
+        """작업의 항목 상태별 개수"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS n FROM work_items WHERE job_id = %s GROUP BY status", (job_id,)
+            ).fetchall()
+        counts = {status: 0 for status in ITEM_STATUSES}
+        counts.update({row['status']: row['n'] for row in rows})
+        return counts
+
+    def item_payloads(self, job_id: str) -> List[Dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM work_items WHERE job_id = %s ORDER BY batch_no", (job_id,)
+            ).fetchall()
+        return [json.loads(row['payload']) for row in rows]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = %s", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def depth(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({row['status']: row['n'] for row in rows})
+        return counts
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    f"SELECT * FROM jobs WHERE status = %s ORDER BY {self._order_by()} LIMIT %s", (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY seq DESC LIMIT %s", (limit,)).fetchall()
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job.pop('payload', None)
+            jobs.append(job)
+        return jobs
+
+
+def create_job_queue(path, scheduling: str = 'fifo', backend: str = None) -> BaseJobQueue:
+    """JOB_QUEUE_BACKEND 설정에 맞는 작업 큐 저장소 생성
+
+    - sqlite(기본): path의 SQLite 파일 - 한 호스트 안에서만 공유
+    - postgres: JOB_QUEUE_DSN의 Postgres - 여러 호스트가 공유
+    """
+    backend = backend or os.getenv('JOB_QUEUE_BACKEND', 'sqlite')
+    if backend == 'sqlite':
+        return JobQueue(path, scheduling=scheduling)
+    if backend == 'postgres':
+        return PostgresJobQueue(os.getenv('JOB_QUEUE_DSN', ''), scheduling=scheduling)
+    raise ValueError(f"지원하지 않는 작업 큐 저장소: {backend}")
+
+
+def split_batches(items: List, batch_size: int) -> List[List]:
+    """리스트를 batch_size 단위로 분할"""
+    batch_size = max(1, batch_size)
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+class JobWorkerPool:
+    """작업 큐를 소비하는 워커 풀
+
+    워커마다 전용 스레드와 이벤트 루프를 사용한다. 크롤링 경로에 동기 HTTP/MinIO 호출이
+    섞여 있으므로 서버의 이벤트 루프를 막지 않기 위함이다.
+    워커는 작업 항목을 visibility_timeout 동안 임대하고 heartbeat_interval마다 연장한다.
+    """
+
+    def __init__(
+        self,
+        queue: BaseJobQueue,
+        handler: Callable[[Dict], Awaitable[None]],
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float = 15.0,
+        visibility_timeout: float = None,
+        on_job_finished: Optional[Callable[[str, str], None]] = None,
+        on_idle: Optional[Callable[[], None]] = None,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.visibility_timeout = visibility_timeout or float(os.getenv('JOB_LEASE_TIMEOUT', '120'))
+        self.on_job_finished = on_job_finished
+        self.on_idle = on_idle
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.active_jobs: Dict[str, str] = {}
+
+    def start(self):
+        """워커 스레드 시작"""
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run_worker,
+                args=(default_worker_id(i),),
+                name=f"crawl-worker-{i}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        print(f"✅ 크롤링 워커 {self.workers}개 시작 (스케줄링: {self.queue.scheduling}, 임대: {self.visibility_timeout:.0f}초)")
+
+    def stop(self, timeout: float = 5.0):
+        """워커 종료 신호 - 진행 중인 항목은 임대 만료 후 다른 워커가 다시 가져간다"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def run_forever(self):
+        """별도 워커 프로세스용 - 종료 신호까지 블로킹"""
+        self.start()
+        try:
+            while not self._stop.is_set():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def _run_worker(self, worker_id: str):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._worker_loop(worker_id))
+        finally:
+            loop.close()
+
+    async def _worker_loop(self, worker_id: str):
+        busy = False
+        while not self._stop.is_set():
+            try:
+                item = self.queue.lease(worker_id, self.visibility_timeout)
+            except Exception as e:
+                print(f"❌ 작업 큐 조회 오류 ({worker_id}): {e}")
+                item = None
+
+            if item is None:
+                # 다른 워커/노드가 버린 항목 중 재시도 한도를 넘긴 것 정리
+                try:
+                    for job_id, status in self.queue.expire_leases():
+                        self._job_finished(job_id, status)
+                except Exception:
+                    pass
+                if busy and self.on_idle:
+                    # 처리할 항목이 없어지면 한 번만 호출 (예: 미사용 쿼터 반환)
+                    try:
+                        await asyncio.to_thread(self.on_idle)
+                    except Exception as e:
+                        print(f"⚠️ 유휴 처리 실패 ({worker_id}): {e}")
+                busy = False
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            busy = True
+            await self._run_item(item, worker_id)
+
+    async def _run_item(self, item: Dict, worker_id: str):
+        job_id = item['job_id']
+        item_id = item['item_id']
+        self.active_jobs[worker_id] = f"{job_id}#{item['batch_no']}"
+        heartbeat_task = asyncio.create_task(self._heartbeat(item_id, worker_id))
+        finished = None
+        try:
+            print(f"🚀 작업 항목 실행: {job_id}#{item['batch_no']} ({worker_id}, 시도 {item['attempts']})")
+            await self.handler(item)
+            finished = self.queue.ack(item_id, worker_id)
+        except Exception as e:
+            print(f"❌ 작업 항목 실패: {job_id}#{item['batch_no']} - {e}")
+            finished = self.queue.nack(item_id, worker_id, str(e))
+        finally:
+            heartbeat_task.cancel()
+            self.active_jobs.pop(worker_id, None)
+
+        if finished:
+            self._job_finished(job_id, finished)
+
+    def _job_finished(self, job_id: str, status: str):
+        print(f"🏁 작업 종료: {job_id} ({status})")
+        if self.on_job_finished:
+            try:
+                self.on_job_finished(job_id, status)
+            except Exception as e:
+                print(f"⚠️ 작업 종료 처리 실패: {job_id} - {e}")
+
+    async def _heartbeat(self, item_id: int, worker_id: str):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                if not self.queue.extend_lease(item_id, worker_id, self.visibility_timeout):
+                    print(f"⚠️ 임대 상실: 항목 {item_id} ({worker_id})")
+            except Exception as e:
+                print(f"⚠️ heartbeat 실패: 항목 {item_id} - {e}")
@@ -0,0 +1,163 @@
+"""
+크롤링 작업 레지스트리 모듈
+작업별 요약 필드를 SQLite 테이블에 색인해 작업 목록 조회를 작업 크기와 무관하게 처리
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 진행상황 형식별 필드명 (api_server: *_items, crawler.crawl_batch: total/completed/...)
+_COUNTER_ALIASES = {
+    "total_items": ("total_items", "total"),
+    "processed_items": ("processed_items", "completed"),
+    "successful_items": ("successful_items", "success"),
+    "failed_items": ("failed_items", "failed"),
+}
+
+
+def _job_type(job_id: str, summary: Dict) -> str:
+    if summary.get("type"):
+        return summary["type"]
+    # 저널 도입 이전 파일은 type이 없으므로 job_id 접두사로 구분 (crawl_*, missing_*)
+    return job_id.split("_", 1)[0] if "_" in job_id else "crawl"
+
+
+def summary_to_row(job_id: str, summary: Dict) -> Dict:
+    """진행상황 요약을 레지스트리 행으로 변환"""
+    row = {
+        "job_id": job_id,
+        "type": _job_type(job_id, summary),
+        "status": summary.get("status", "unknown"),
+        "created_at": summary.get("created_at") or summary.get("started_at"),
+        "started_at": summary.get("started_at"),
+        "finished_at": summary.get("completed_at") or summary.get("finished_at") or summary.get("failed_at"),
+        "updated_at": datetime.now().isoformat(),
+    }
+    for column, keys in _COUNTER_ALIASES.items():
+        row[column] = next((summary[k] for k in keys if isinstance(summary.get(k), int)), 0)
+    return row
+
+
+class JobRegistry:
+    """작업 요약 색인 (SQLite)
+
+    진행상황 저널이 스냅샷을 쓸 때마다 record()로 갱신된다.
+    목록 조회는 이 테이블만 읽으므로 items 수와 무관하다.
+    """
+
+    COLUMNS = (
+        "job_id", "type", "status", "created_at", "started_at", "finished_at",
+        "total_items", "processed_items", "successful_items", "failed_items", "updated_at",
+    )
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_registry (
+                    job_id TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at TEXT,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    total_items INTEGER NOT NULL DEFAULT 0,
+                    processed_items INTEGER NOT NULL DEFAULT 0,
+                    successful_items INTEGER NOT NULL DEFAULT 0,
+                    failed_items INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_registry_created ON job_registry(created_at DESC)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_registry_status ON job_registry(status, created_at DESC)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_registry_type ON job_registry(type, created_at DESC)")
+
+    def record(self, job_id: str, summary: Dict):
+        """작업 요약 저장 (있으면 갱신)"""
+        row = summary_to_row(job_id, summary)
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in self.COLUMNS if c != "job_id")
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO job_registry ({', '.join(self.COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(job_id) DO UPDATE SET {updates}",
+                tuple(row[c] for c in self.COLUMNS)
+            )
+
+    def remove(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM job_registry WHERE job_id = ?", (job_id,))
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM job_registry").fetchone()[0]
+
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        job_type: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Dict:
+        """필터/페이징 목록 (생성 시각 최신순) - {"total": 전체 건수, "jobs": [...]}"""
+        where, params = [], []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if job_type:
+            where.append("type = ?")
+            params.append(job_type)
+        if created_from:
+            where.append("created_at >= ?")
+            params.append(created_from)
+        if created_to:
+            where.append("created_at <= ?")
+            params.append(created_to)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM job_registry {clause}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT * FROM job_registry {clause} ORDER BY created_at DESC, job_id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return {"total": total, "jobs": [dict(row) for row in rows]}
+
+    def rebuild(self, progress_dir) -> int:
+        """진행상황 디렉터리의 요약 파일({job_id}.json)로 레지스트리 재구성 (최초 1회/복구용)"""
+        count = 0
+        for progress_file in Path(progress_dir).glob("*.json"):
+            try:
+                with open(progress_file, 'r', encoding='utf-8') as f:
+                    summary = json.load(f)
+                if not isinstance(summary, dict):
+                    continue
+                summary.pop("items", None)
+                self.record(progress_file.stem, summary)
+                count += 1
+            except Exception as e:
+                print(f"⚠️ 진행상황 파일 읽기 실패: {progress_file} - {e}")
+        return count
@@ -0,0 +1,433 @@
+"""
+로고 세트 일괄 내보내기/가져오기 모듈
+logo_files 전체(또는 필터)와 객체를 tar 하나로 스트리밍해 환경 간 이전/시딩에 사용
+
+아카이브 구성 (순서대로)
+- export.json    : 형식 버전, 내보낸 시각, 버킷, 필터
+- objects/{key}  : 객체 원본 바이트 (공유 객체는 한 번만)
+- manifest.jsonl : logo_files 행 한 줄씩 (logo_hash + 행 필드, 객체를 읽지 못한 행은 제외)
+- summary.json   : 건수/바이트 집계
+
+- 내보내기: logo_files 페이지를 순서대로 받으며 객체를 concurrency개씩 동시에 읽고 받은 순서대로 tar에 기록
+  (메모리 = 진행 중인 객체 + 한 페이지, manifest는 일정 크기를 넘으면 임시 파일로 넘김)
+- 가져오기: tar를 스트림으로 읽으며 객체를 concurrency개씩 동시에 업로드한 뒤,
+  manifest 행을 logos 덤프로 logo_id를 미리 채운 LogoRegistry로 일괄 upsert (quality 등 행 필드 그대로)
+
+사용법: python logo_archive.py export --output logos.tar [--gzip] [--format png] [--size 240] [--logo-hash ...]
+        python logo_archive.py import logos.tar [--skip-existing]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import queue
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from typing import AsyncIterator, Dict, IO, Iterable, List, Optional
+import logging
+
+from content_store import object_key_of
+from existing_api_client import iter_table_pages
+from logo_registry import LogoRegistry
+from minio_inventory import get_inventory, notify_put
+from reconcile import CONTENT_TYPES
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "raw_data"
+FORMAT_VERSION = 1
+OBJECT_DIR = "objects/"
+# manifest에 싣는 logo_files 컬럼 (file_id/logo_id/created_at은 환경마다 다르므로 제외)
+ROW_FIELDS = (
+    "minio_object_key", "file_format", "data_source", "upload_type", "uploaded_by",
+    "dimension_width", "dimension_height", "quality", "file_size", "is_original",
+)
+
+
+def _add_bytes(tar: tarfile.TarFile, name: str, data: bytes, mtime: float):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(mtime)
+    info.mode = 0o644
+    tar.addfile(info, BytesIO(data))
+
+
+def _json_bytes(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+
+
+class ArchiveExporter:
+    """logo_files + 객체 → tar 스트림"""
+
+    def __init__(self, api, minio_client, bucket: str, concurrency: int = None, page_size: int = 100):
+        self.api = api
+        self.minio_client = minio_client
+        self.bucket = bucket
+        self.concurrency = concurrency or int(os.getenv('ARCHIVE_CONCURRENCY', '16'))
+        self.page_size = page_size
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.minio_client.get_object(self.bucket, key)
+        except Exception as e:
+            logger.warning(f"내보내기 객체 읽기 실패: {key} - {e}")
+            return None
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    async def _logo_hashes(self, include_deleted: bool) -> Dict[int, str]:
+        """logo_id → logo_hash (삭제된 로고는 include_deleted일 때만)"""
+        mapping = {}
+        async for _, _, response in iter_table_pages(self.api, SCHEMA, "logos", {"size": self.page_size}):
+            for logo in response.get("data") or []:
+                if include_deleted or not logo.get("is_deleted"):
+                    mapping[logo["logo_id"]] = logo["logo_hash"]
+        return mapping
+
+    async def export(
+        self,
+        fileobj: IO[bytes],
+        logo_hashes: Optional[Iterable[str]] = None,
+        formats: Optional[Iterable[str]] = None,
+        sizes: Optional[Iterable[int]] = None,
+        include_deleted: bool = False,
+        compress: bool = False,
+    ) -> Dict:
+        """tar(compress면 tar.gz)를 fileobj에 순차 기록 - 탐색(seek) 없이 쓰므로 파이프/HTTP 응답에도 사용 가능
+
+        반환값: summary.json과 같은 집계
+        """
+        started = time.monotonic()
+        now = time.time()
+        filters = {
+            "logo_hashes": sorted(set(logo_hashes)) if logo_hashes else None,
+            "formats": sorted({f.lower() for f in formats}) if formats else None,
+            "sizes": sorted({int(s) for s in sizes}) if sizes else None,
+            "include_deleted": include_deleted,
+        }
+        summary = {"rows": 0, "objects": 0, "bytes": 0, "missing_objects": 0, "skipped_rows": 0}
+
+        tar = tarfile.open(fileobj=fileobj, mode="w|gz" if compress else "w|", format=tarfile.PAX_FORMAT)
+        manifest = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="archive-export")
+        loop = asyncio.get_running_loop()
+        try:
+            _add_bytes(tar, "export.json", _json_bytes({
+                "format_version": FORMAT_VERSION,
+                "exported_at": datetime.now().isoformat(),
+                "bucket": self.bucket,
+                "filters": filters,
+            }), now)
+
+            hash_by_id = await self._logo_hashes(include_deleted)
+            wanted = set(filters["logo_hashes"] or ())
+            written: Dict[str, bool] = {}  # 객체 키 → 기록 성공 여부 (공유 객체는 한 번만 읽음)
+            in_flight = deque()            # (객체 키, future) - 제출 순서대로 기록
+            rows_waiting: Dict[str, List[dict]] = {}
+
+            def finish(key: str, data: Optional[bytes]):
+                written[key] = data is not None
+                if data is None:
+                    summary["missing_objects"] += 1
+                else:
+                    _add_bytes(tar, OBJECT_DIR + key, data, now)
+                    summary["objects"] += 1
+                    summary["bytes"] += len(data)
+                for row in rows_waiting.pop(key, ()):
+                    write_row(row, written[key])
+
+            def write_row(row: dict, ok: bool):
+                if ok:
+                    manifest.write(json.dumps(row, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+                    summary["rows"] += 1
+                else:
+                    summary["skipped_rows"] += 1
+
+            async for _, _, response in iter_table_pages(self.api, SCHEMA, "logo_files", {"size": self.page_size}):
+                for file_row in response.get("data") or []:
+                    logo_hash = hash_by_id.get(file_row.get("logo_id"))
+                    row_key = file_row.get("minio_object_key")
+                    if not logo_hash or not row_key or (wanted and logo_hash not in wanted):
+                        continue
+                    if filters["formats"] and (file_row.get("file_format") or "").lower() not in filters["formats"]:
+                        continue
+                    if filters["sizes"] and file_row.get("dimension_width") not in filters["sizes"]:
+                        continue
+                    row = {"logo_hash": logo_hash, **{field: file_row.get(field) for field in ROW_FIELDS}}
+                    key = object_key_of(row_key)
+                    if key in written:
+                        write_row(row, written[key])
+                    elif key in rows_waiting:
+                        rows_waiting[key].append(row)
+                    else:
+                        rows_waiting[key] = [row]
+                        in_flight.append((key, loop.run_in_executor(pool, self._read, key)))
+                    while len(in_flight) >= self.concurrency * 2:
+                        key, future = in_flight.popleft()
+                        finish(key, await future)
+            while in_flight:
+                key, future = in_flight.popleft()
+                finish(key, await future)
+
+            info = tarfile.TarInfo("manifest.jsonl")
+            info.size = manifest.tell()
+            info.mtime = int(now)
+            info.mode = 0o644
+            manifest.seek(0)
+            tar.addfile(info, manifest)
+
+            summary["duration_s"] = round(time.monotonic() - started, 3)
+            _add_bytes(tar, "summary.json", _json_bytes(summary), now)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            manifest.close()
+            tar.close()
+        print(
+            f"📦 로고 내보내기: 객체 {summary['objects']}개 ({summary['bytes']} bytes), 행 {summary['rows']}개, "
+            f"누락 객체 {summary['missing_objects']}개 ({summary['duration_s']}s)",
+            file=sys.stderr
+        )
+        return summary
+
+
+class ArchiveImporter:
+    """tar 스트림 → 객체 업로드 + logo_files 일괄 등록"""
+
+    def __init__(self, api, minio_client, bucket: str, registry: Optional[LogoRegistry] = None,
+                 concurrency: int = None, page_size: int = 100, batch_rows: int = 500):
+        self.api = api
+        self.minio_client = minio_client
+        self.bucket = bucket
+        self.registry = registry or LogoRegistry(api)
+        self.concurrency = concurrency or int(os.getenv('ARCHIVE_CONCURRENCY', '16'))
+        self.page_size = page_size
+        self.batch_rows = batch_rows
+
+    def _put(self, key: str, data: bytes) -> bool:
+        fmt = key.rsplit(".", 1)[-1].lower()
+        try:
+            written = self.minio_client.put_object(
+                self.bucket, key, BytesIO(data), len(data),
+                content_type=CONTENT_TYPES.get(fmt, "application/octet-stream")
+            )
+        except Exception as e:
+            logger.warning(f"가져오기 객체 업로드 실패: {key} - {e}")
+            return False
+        notify_put(self.bucket, key, len(data), written.etag)
+        return True
+
+    async def _preload_logo_ids(self) -> int:
+        logos = []
+        async for _, _, response in iter_table_pages(self.api, SCHEMA, "logos", {"size": self.page_size}):
+            logos.extend({"logo_hash": l.get("logo_hash"), "logo_id": l.get("logo_id")} for l in response.get("data") or [])
+        return self.registry.preload(logos)
+
+    def _register(self, rows: List[dict], pool: ThreadPoolExecutor, summary: Dict):
+        """manifest 행 묶음 등록 - 처음 보는 logo_hash는 동시에 확보(없으면 생성)한 뒤 행을 그대로 일괄 upsert"""
+        logo_hashes = sorted({row["logo_hash"] for row in rows})
+        logo_ids = dict(zip(logo_hashes, pool.map(self.registry.resolve_logo_id, logo_hashes)))
+        file_rows = []
+        for row in rows:
+            logo_id = logo_ids.get(row["logo_hash"])
+            if logo_id is None:
+                summary["failed_rows"] += 1
+                summary["errors"].append(f"logo_id 확보 실패: {row['logo_hash']}")
+                continue
+            file_rows.append({"logo_id": logo_id, **{field: row.get(field) for field in ROW_FIELDS}})
+        if not file_rows:
+            return
+        results = self.registry.upsert_file_rows(file_rows)
+        ok = sum(1 for result in results if result)
+        summary["rows"] += ok
+        summary["failed_rows"] += len(file_rows) - ok
+
+    def import_archive(self, fileobj: IO[bytes], skip_existing: bool = False) -> Dict:
+        """tar(.gz) 스트림 가져오기 (동기 - 스레드에서 호출)
+
+        skip_existing: 인벤토리에 같은 크기로 이미 있는 객체는 업로드 생략
+        """
+        started = time.monotonic()
+        summary = {"objects": 0, "skipped_objects": 0, "failed_objects": 0, "bytes": 0,
+                   "rows": 0, "failed_rows": 0, "skipped_rows": 0, "errors": []}
+        asyncio.run(self._preload_logo_ids())
+        inventory = get_inventory(self.bucket) if skip_existing else None
+
+        uploaded: Dict[str, bool] = {}
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="archive-import") as pool:
+            def drain(limit: int):
+                while len(in_flight) > limit:
+                    key, future = in_flight.popleft()
+                    ok = future.result()
+                    uploaded[key] = ok
+                    summary["objects" if ok else "failed_objects"] += 1
+
+            with tarfile.open(fileobj=fileobj, mode="r|*") as tar:
+                for member in tar:
+                    if not member.isfile():
+                        continue
+                    if member.name == "export.json":
+                        header = json.load(tar.extractfile(member))
+                        if header.get("format_version") != FORMAT_VERSION:
+                            raise ValueError(f"지원하지 않는 아카이브 형식: {header.get('format_version')}")
+                    elif member.name.startswith(OBJECT_DIR):
+                        key = member.name[len(OBJECT_DIR):]
+                        existing = inventory.stat(key) if inventory else None
+                        if existing and existing[0] == member.size:
+                            uploaded[key] = True
+                            summary["skipped_objects"] += 1
+                            continue
+                        data = tar.extractfile(member).read()
+                        summary["bytes"] += len(data)
+                        in_flight.append((key, pool.submit(self._put, key, data)))
+                        drain(self.concurrency * 2)
+                    elif member.name == "manifest.jsonl":
+                        # manifest는 객체 뒤에 오므로 업로드를 모두 끝낸 뒤 등록
+                        drain(0)
+                        batch = []
+                        for line in tar.extractfile(member):
+                            if not line.strip():
+                                continue
+                            row = json.loads(line)
+                            if not uploaded.get(object_key_of(row.get("minio_object_key") or "")):
+                                summary["skipped_rows"] += 1
+                                continue
+                            batch.append(row)
+                            if len(batch) >= self.batch_rows:
+                                self._register(batch, pool, summary)
+                                batch = []
+                        if batch:
+                            self._register(batch, pool, summary)
+            drain(0)
+
+        summary["duration_s"] = round(time.monotonic() - started, 3)
+        summary["errors"] = summary["errors"][:100]
+        print(
+            f"📥 로고 가져오기: 객체 {summary['objects']}개 (생략 {summary['skipped_objects']}, 실패 {summary['failed_objects']}), "
+            f"행 {summary['rows']}개 (실패 {summary['failed_rows']}) ({summary['duration_s']}s)",
+            file=sys.stderr
+        )
+        return summary
+
+
+class _QueueWriter:
+    """tar 출력을 크기 제한 큐로 넘기는 파일 객체 (소비자가 느리면 내보내기가 기다림)"""
+
+    def __init__(self, chunks: "queue.Queue", cancelled: threading.Event):
+        self.chunks = chunks
+        self.cancelled = cancelled
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        while True:
+            if self.cancelled.is_set():
+                raise IOError("내보내기 스트림이 닫혔습니다")
+            try:
+                self.chunks.put(chunk, timeout=1)
+                return len(chunk)
+            except queue.Full:
+                continue
+
+    def flush(self):
+        pass
+
+
+async def stream_export(exporter: ArchiveExporter, **options) -> AsyncIterator[bytes]:
+    """내보내기를 별도 스레드(자체 이벤트 루프)에서 실행하며 tar 조각을 순서대로 yield (HTTP 스트리밍 응답용)
+
+    클라이언트가 연결을 끊으면 다음 쓰기에서 내보내기를 중단한다.
+    """
+    chunks: "queue.Queue" = queue.Queue(maxsize=64)
+    cancelled = threading.Event()
+    done = object()
+
+    def run():
+        try:
+            asyncio.run(exporter.export(_QueueWriter(chunks, cancelled), **options))
+        except Exception as e:
+            if not cancelled.is_set():
+                logger.error(f"로고 내보내기 실패: {e}")
+        finally:
+            while not cancelled.is_set():
+                try:
+                    chunks.put(done, timeout=1)
+                    break
+                except queue.Full:
+                    continue
+
+    threading.Thread(target=run, name="archive-export", daemon=True).start()
+    try:
+        while True:
+            chunk = await asyncio.to_thread(chunks.get)
+            if chunk is done:
+                break
+            yield chunk
+    finally:
+        cancelled.set()
+        # 연결이 끊겨 chunks.get()을 기다리던 스레드가 남아 있으면 깨움 (큐가 차 있으면 이미 깨어 있음)
+        try:
+            chunks.put_nowait(done)
+        except queue.Full:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로고 세트 일괄 내보내기/가져오기 (tar)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_parser = sub.add_parser("export", help="logo_files + 객체를 tar로 내보내기")
+    export_parser.add_argument("--output", required=True, help="아카이브 경로 (- 이면 표준출력)")
+    export_parser.add_argument("--gzip", action="store_true", help="tar.gz로 압축")
+    export_parser.add_argument("--logo-hash", action="append", help="특정 logo_hash만 (여러 번 지정 가능)")
+    export_parser.add_argument("--format", action="append", help="파일 포맷 필터 (png, webp, svg ...)")
+    export_parser.add_argument("--size", action="append", type=int, help="크기 필터 (dimension_width)")
+    export_parser.add_argument("--include-deleted", action="store_true", help="삭제된 로고도 포함")
+    import_parser = sub.add_parser("import", help="tar 아카이브 가져오기")
+    import_parser.add_argument("archive", help="아카이브 경로 (- 이면 표준입력)")
+    import_parser.add_argument("--skip-existing", action="store_true", help="같은 크기로 이미 있는 객체는 업로드 생략")
+    for p in (export_parser, import_parser):
+        p.add_argument("--concurrency", type=int, default=None, help="동시 객체 읽기/쓰기 수 (기본 ARCHIVE_CONCURRENCY=16)")
+        p.add_argument("--page-size", type=int, default=100, help="테이블 페이지 크기")
+    args = parser.parse_args()
+
+    from crawler import get_shared_minio_client
+    from existing_api_client import get_existing_api
+
+    api, minio_client, bucket = get_existing_api(), get_shared_minio_client(), os.getenv('MINIO_BUCKET', 'logos')
+    if args.command == "export":
+        exporter = ArchiveExporter(api, minio_client, bucket, args.concurrency, args.page_size)
+        output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        try:
+            summary = asyncio.run(exporter.export(
+                output, args.logo_hash, args.format, args.size, args.include_deleted, args.gzip
+            ))
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+    else:
+        if args.skip_existing:
+            # 인벤토리로 존재 확인 (버킷 전체 목록 1회)
+            from minio_inventory import MinioInventory
+            MinioInventory(minio_client, bucket).refresh()
+        importer = ArchiveImporter(api, minio_client, bucket, concurrency=args.concurrency, page_size=args.page_size)
+        source = sys.stdin.buffer if args.archive == "-" else open(args.archive, "rb")
+        try:
+            summary = importer.import_archive(source, skip_existing=args.skip_existing)
+        finally:
+            if source is not sys.stdin.buffer:
+                source.close()
+    print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
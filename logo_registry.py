@@ -0,0 +1,245 @@
+"""
+로고 DB 등록 모듈
+logos / logo_files 테이블에 대한 일괄(bulk) 등록 기능을 제공
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from metrics import observe_crawl_stage, record_cache
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "raw_data"
+
+
+def build_file_row(logo_id: int, file_info: dict) -> dict:
+    """save_logo_data 형식의 file_info를 logo_files 행으로 변환
+
+    quality(인코딩 파라미터, image_encoder 참고)는 알려진 경우에만 포함 - 재사용 객체를 다시 등록할 때 기존 값을 지우지 않도록
+    """
+    row = {
+        "logo_id": logo_id,
+        "file_format": file_info["format"],
+        "dimension_width": file_info["width"],
+        "dimension_height": file_info["height"],
+        "file_size": file_info["size"],
+        "minio_object_key": file_info["minio_key"],
+        "data_source": file_info["source"],
+        "upload_type": file_info["upload_type"],
+        "is_original": file_info.get("is_original", True)
+    }
+    if file_info.get("quality") is not None:
+        row["quality"] = file_info["quality"]
+    return row
+
+
+class LogoRegistry:
+    """logo_hash → logo_id 해석(메모이즈) 및 logo_files 일괄 upsert"""
+
+    def __init__(self, api, batch_upsert: Optional[bool] = None):
+        self.api = api
+        self._logo_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # None: 아직 확인되지 않음, True/False: 기존 API의 리스트 upsert 지원 여부
+        self._batch_supported = batch_upsert
+
+    def resolve_logo_id(self, logo_hash: str) -> Optional[int]:
+        """logo_hash에 해당하는 logo_id 조회, 없으면 생성 (해시당 1회만 호출)"""
+        with self._lock:
+            if logo_hash in self._logo_ids:
+                record_cache("logo_id", True)
+                return self._logo_ids[logo_hash]
+        record_cache("logo_id", False)
+
+        existing_logo = self.api.query_table(SCHEMA, "logos", {
+            "search_column": "logo_hash",
+            "search": logo_hash,
+            "limit": 1
+        })
+
+        logo_id = None
+        if existing_logo and 'data' in existing_logo and existing_logo['data']:
+            logo_id = existing_logo['data'][0]['logo_id']
+        else:
+            logo_result = self.api.upsert_data(SCHEMA, "logos", {
+                "data": {
+                    "logo_hash": logo_hash,
+                    "is_deleted": False
+                },
+                "conflict_columns": ["logo_hash"]
+            })
+            if logo_result and isinstance(logo_result.get('data'), dict):
+                logo_id = logo_result['data'].get('logo_id')
+
+        if logo_id is None:
+            logger.error(f"logos 테이블 logo_id 확보 실패: {logo_hash}")
+            return None
+
+        with self._lock:
+            self._logo_ids[logo_hash] = logo_id
+        return logo_id
+
+    def preload(self, logos: List[dict]) -> int:
+        """logos 테이블 덤프로 logo_hash → logo_id 메모이즈 채우기 (대량 등록 전 조회 호출 절약)"""
+        with self._lock:
+            for logo in logos:
+                if logo.get("logo_hash") and logo.get("logo_id") is not None:
+                    self._logo_ids[logo["logo_hash"]] = logo["logo_id"]
+            return len(self._logo_ids)
+
+    def forget(self, logo_hash: str):
+        """메모이즈된 logo_id 제거"""
+        with self._lock:
+            self._logo_ids.pop(logo_hash, None)
+
+    def register_files(self, logo_hash: str, files: List[dict]) -> bool:
+        """하나의 logo_hash에 속한 모든 렌디션을 등록"""
+        results = self.register_many([(logo_hash, files)])
+        return results.get(logo_hash, False)
+
+    def register_many(self, entries: List[Tuple[str, List[dict]]]) -> Dict[str, bool]:
+        """여러 logo_hash의 렌디션을 최소 호출로 등록
+
+        반환값: logo_hash별 성공 여부
+        """
+        started = time.perf_counter()
+        results: Dict[str, bool] = {}
+        rows: List[dict] = []
+        row_owners: List[str] = []
+
+        for logo_hash, files in entries:
+            if not files:
+                results.setdefault(logo_hash, True)
+                continue
+            logo_id = self.resolve_logo_id(logo_hash)
+            if logo_id is None:
+                results[logo_hash] = False
+                continue
+            results.setdefault(logo_hash, True)
+            for file_info in files:
+                rows.append(build_file_row(logo_id, file_info))
+                row_owners.append(logo_hash)
+
+        if rows:
+            row_results = self._upsert_rows("logo_files", rows, ["minio_object_key"])
+            for owner, ok in zip(row_owners, row_results):
+                if not ok:
+                    results[owner] = False
+
+        observe_crawl_stage("db_registration", "register_many", started)
+        return results
+
+    def upsert_file_rows(self, rows: List[dict]) -> List[bool]:
+        """logo_files 행을 그대로 upsert (minio_object_key 기준) - 행별 성공 여부"""
+        return self._upsert_rows("logo_files", rows, ["minio_object_key"])
+
+    def _upsert_rows(self, table: str, rows: List[dict], conflict_columns: List[str]) -> List[bool]:
+        """행 목록 upsert - 컬럼 구성이 같은 행끼리 나눠 기록 (행별 성공 여부는 입력 순서)"""
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for index, row in enumerate(rows):
+            groups.setdefault(tuple(sorted(row)), []).append(index)
+        if len(groups) == 1:
+            return self._upsert_group(table, rows, conflict_columns)
+        results = [False] * len(rows)
+        for indexes in groups.values():
+            group_results = self._upsert_group(table, [rows[i] for i in indexes], conflict_columns)
+            for index, ok in zip(indexes, group_results):
+                results[index] = ok
+        return results
+
+    def _upsert_group(self, table: str, rows: List[dict], conflict_columns: List[str]) -> List[bool]:
+        """같은 컬럼의 행 목록 upsert - 리스트 upsert를 우선 시도하고, 실패하면 그 배치를 행 단위로 재시도
+
+        리스트 upsert 미지원 판단은 확실한 신호일 때만 한다: 리스트 요청이 4xx로 거부되었는데
+        같은 행을 단건으로는 모두 기록할 수 있는 경우 (행 하나의 제약 위반이나 일시 오류로는 끄지 않음)
+        """
+        batch_rejected = False
+        if len(rows) > 1 and self._batch_supported is not False:
+            result, status = self.api.upsert_data_status(SCHEMA, table, {
+                "data": rows,
+                "conflict_columns": conflict_columns
+            })
+            if result is not None:
+                self._batch_supported = True
+                return [True] * len(rows)
+            batch_rejected = status is not None and 400 <= status < 500
+            logger.warning(f"{table} 일괄 upsert 실패 (HTTP {status}): {len(rows)}건 - 행 단위로 재시도")
+
+        row_results = []
+        for row in rows:
+            result = self.api.upsert_data(SCHEMA, table, {
+                "data": row,
+                "conflict_columns": conflict_columns
+            })
+            row_results.append(result is not None)
+
+        if batch_rejected and self._batch_supported is None and all(row_results):
+            # 리스트는 4xx로 거부됐지만 단건은 모두 성공 → 리스트 upsert 미지원으로 판단
+            logger.info(f"기존 API가 리스트 upsert를 지원하지 않음: {table} 단건 upsert로 전환")
+            self._batch_supported = False
+        elif not all(row_results):
+            logger.error(f"{table} upsert 실패: {row_results.count(False)}/{len(rows)}건")
+        return row_results
+
+
+class RegistrationBuffer:
+    """여러 종목의 등록 요청을 모아 일정 건수/간격마다 일괄 기록하는 버퍼"""
+
+    def __init__(self, registry: LogoRegistry, max_rows: int = None, flush_interval: float = None):
+        self.registry = registry
+        self.max_rows = max_rows or int(os.getenv('DB_REGISTRATION_BATCH_SIZE', '200'))
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.getenv('DB_REGISTRATION_FLUSH_INTERVAL', '5')
+        )
+        self._pending: List[Tuple[str, str, List[dict]]] = []
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, infomax_code: str, logo_hash: str, files: List[dict]) -> Dict[str, bool]:
+        """등록 요청 추가 - 건수 또는 간격 조건을 만족하면 즉시 flush
+
+        반환값: 이번 호출에서 flush된 infomax_code별 성공 여부 (flush가 없었으면 빈 dict)
+        """
+        with self._lock:
+            self._pending.append((infomax_code, logo_hash, files))
+            self._pending_rows += len(files)
+            due = (
+                self._pending_rows >= self.max_rows
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            return self.flush()
+        return {}
+
+    def flush(self) -> Dict[str, bool]:
+        """버퍼에 쌓인 등록 요청을 기록"""
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+            self._pending_rows = 0
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return {}
+
+        merged: Dict[str, List[dict]] = {}
+        for _, logo_hash, files in pending:
+            merged.setdefault(logo_hash, []).extend(files)
+
+        hash_results = self.registry.register_many(list(merged.items()))
+        return {
+            infomax_code: hash_results.get(logo_hash, False)
+            for infomax_code, logo_hash, _ in pending
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
@@ -0,0 +1,215 @@
+"""
+Prometheus 메트릭 모듈
+HTTP 핸들러/기존 API/MinIO 호출 지연, 크롤링 단계별 소요 시간, 캐시 적중, 큐 깊이, 쿼터 잔량을 노출
+
+- 레이블 값은 api_server.py/crawler.py의 함수 이름과 맞춘다 (handler="get_logo", function="crawl_website" 등)
+- prometheus_client가 설치되지 않은 환경에서는 모든 메트릭이 아무 일도 하지 않는다
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+import logging
+
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+    PROMETHEUS_AVAILABLE = True
+except ImportError:  # pragma: no cover - 선택 의존성
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _NoopMetric:
+    """prometheus_client 미설치 시 사용하는 빈 메트릭"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, *args, **kwargs):
+        pass
+
+    def inc(self, *args, **kwargs):
+        pass
+
+    def set(self, *args, **kwargs):
+        pass
+
+
+if not PROMETHEUS_AVAILABLE:
+    Counter = Gauge = Histogram = _NoopMetric
+
+# 지연 버킷: 캐시 적중(ms 미만)부터 브라우저 크롤링(수십 초)까지
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "logo_http_request_duration_seconds",
+    "API 요청 처리 시간 (handler = api_server.py 엔드포인트 함수 이름)",
+    ["handler", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "logo_upstream_request_duration_seconds",
+    "기존 API 호출 시간 (ExistingAPIClient.query_table/upsert_data)",
+    ["table", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+MINIO_REQUEST_DURATION = Histogram(
+    "logo_minio_request_duration_seconds",
+    "MinIO 호출 시간 (operation = Minio 메서드 이름)",
+    ["operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+MINIO_BYTES = Counter(
+    "logo_minio_bytes_total",
+    "MinIO 전송 바이트 (get_object: 응답 Content-Length, put_object: 업로드 크기)",
+    ["operation"],
+)
+CRAWL_STAGE_DURATION = Histogram(
+    "logo_crawl_stage_duration_seconds",
+    "크롤링 단계별 소요 시간 (function = 단계를 수행하는 함수 이름)",
+    ["stage", "function"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "logo_cache_requests_total",
+    "캐시 조회 건수 (result = hit|miss)",
+    ["cache", "result"],
+)
+CACHE_HIT_RATIO = Gauge(
+    "logo_cache_hit_ratio",
+    "프로세스 기동 이후 캐시 적중률",
+    ["cache"],
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "logo_job_queue_items",
+    "작업 큐 항목 수 (상태별)",
+    ["state"],
+)
+QUOTA_REMAINING = Gauge(
+    "logo_quota_remaining",
+    "남은 일일 외부 API 쿼터",
+    ["api"],
+)
+
+_cache_counts: Dict[str, list] = {}
+
+
+@contextmanager
+def timed(histogram, **labels) -> Iterator[Dict]:
+    """블록 실행 시간을 histogram에 기록
+
+    레이블에 outcome이 있으면 예외 시 "error"로 바꾸고, yield한 dict에 outcome을 넣으면 그 값으로 기록한다.
+    """
+    state = {}
+    started = time.perf_counter()
+    try:
+        yield state
+    except GeneratorExit:
+        raise
+    except BaseException:
+        state.setdefault("outcome", "error")
+        raise
+    finally:
+        if "outcome" in labels:
+            labels["outcome"] = state.get("outcome", labels["outcome"])
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def crawl_stage(stage: str, function: str, **attrs) -> Iterator[Dict]:
+    """크롤링 단계 타이머 - with crawl_stage("navigation", "crawl_website"): ...
+
+    진행 중인 크롤링 트레이스가 있으면 같은 이름의 span도 기록한다 (yield 값 = span 레코드).
+    """
+    with span(stage, function=function, **attrs) as record:
+        with timed(CRAWL_STAGE_DURATION, stage=stage, function=function):
+            yield record
+
+
+def observe_crawl_stage(stage: str, function: str, started: float):
+    """time.perf_counter() 기준 시작 시각부터의 단계 소요 시간 기록 (with 블록으로 감싸기 어려운 경우)"""
+    CRAWL_STAGE_DURATION.labels(stage=stage, function=function).observe(time.perf_counter() - started)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+    counts = _cache_counts.setdefault(cache, [0, 0])
+    counts[0 if hit else 1] += 1
+    CACHE_HIT_RATIO.labels(cache=cache).set(counts[0] / (counts[0] + counts[1]))
+
+
+def set_queue_depth(depth: Dict[str, int]):
+    for state, count in depth.items():
+        JOB_QUEUE_DEPTH.labels(state=state).set(count)
+
+
+def set_quota_remaining(api: str, remaining: Optional[int]):
+    if remaining is not None:
+        QUOTA_REMAINING.labels(api=api).set(remaining)
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """/metrics 응답 본문과 Content-Type"""
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client not installed\n", CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class InstrumentedMinio:
+    """Minio 클라이언트 프록시 - 주요 메서드 호출 시간과 전송 바이트를 기록
+
+    list_objects/remove_objects는 결과를 순회할 때 요청이 나가므로 순회가 끝날 때까지를 잰다.
+    나머지 메서드는 그대로 위임한다.
+    """
+
+    _TIMED = ("get_object", "put_object", "stat_object", "remove_object", "bucket_exists", "make_bucket")
+    _LAZY = ("list_objects", "remove_objects")
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name in self._TIMED:
+            return self._wrap(name, attr)
+        if name in self._LAZY:
+            return self._wrap_iter(name, attr)
+        return attr
+
+    @staticmethod
+    def _wrap(name, method):
+        def call(*args, **kwargs):
+            with timed(MINIO_REQUEST_DURATION, operation=name, outcome="ok"):
+                result = method(*args, **kwargs)
+            if name == "put_object":
+                length = kwargs.get("length", args[3] if len(args) > 3 else 0)
+                if length and length > 0:
+                    MINIO_BYTES.labels(operation=name).inc(length)
+            elif name == "get_object":
+                try:
+                    MINIO_BYTES.labels(operation=name).inc(int(result.headers.get("Content-Length") or 0))
+                except (AttributeError, ValueError):
+                    pass
+            return result
+        return call
+
+    @staticmethod
+    def _wrap_iter(name, method):
+        def call(*args, **kwargs):
+            with timed(MINIO_REQUEST_DURATION, operation=name, outcome="ok"):
+                yield from method(*args, **kwargs)
+        return call
+
+
+def instrument_minio(client):
+    """Minio 클라이언트를 계측 프록시로 감싸기 (이미 감싼 경우 그대로)"""
+    if isinstance(client, InstrumentedMinio):
+        return client
+    return InstrumentedMinio(client)
@@ -0,0 +1,250 @@
+"""
+MinIO 인벤토리 모듈
+버킷 객체(키, 크기, etag)를 logo_hash 접두사로 색인해 메모리에 유지하고,
+주기적 전체 목록 갱신 + 자체 쓰기 반영 + 로컬 디스크 스냅샷(웜 재시작)을 제공
+
+- 존재 확인/렌디션 조회는 네트워크 호출 없이 메모리에서 처리
+- 다른 프로세스가 쓴 객체는 다음 갱신(MINIO_INVENTORY_REFRESH_INTERVAL초) 때 반영
+"""
+
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (size, etag)
+Entry = Tuple[int, str]
+
+
+def split_key(key: str) -> Tuple[str, str]:
+    """객체 키 → (logo_hash 접두사, 나머지)  예: "abc_240.png" → ("abc", "_240.png")
+
+    콘텐츠 주소 키는 다이제스트 디렉터리 단위로 색인
+    예: "cas/ab/ab12.../240.png" → ("cas/ab/ab12.../", "240.png")
+    """
+    if key.startswith("cas/"):
+        index = key.rfind("/") + 1
+        return key[:index], sys.intern(key[index:])
+    index = key.find("_")
+    if index < 0:
+        return key, ""
+    # 나머지("_240.png" 등)는 종류가 몇 개뿐이므로 intern으로 문자열을 공유
+    return key[:index], sys.intern(key[index:])
+
+
+def _etag(value: Optional[str]) -> str:
+    return (value or "").strip('"')
+
+
+class MinioInventory:
+    """버킷 객체 인벤토리 (logo_hash → {나머지 키: (size, etag)})
+
+    사용 전 load()로 디스크 스냅샷을 읽고, refresh()로 버킷 전체 목록을 다시 가져온다.
+    자신이 쓰거나 지운 객체는 record_put()/record_remove()로 즉시 반영한다.
+    갱신 중에 들어온 쓰기는 따로 모아 두었다가 새 목록 위에 다시 적용한다.
+    """
+
+    def __init__(self, minio_client, bucket: str, path=None, refresh_interval: float = None):
+        self.minio_client = minio_client
+        self.bucket = bucket
+        self.path = Path(path or Path(os.getenv('PROGRESS_DIR', 'progress')) / "inventory" / f"{bucket}.json.gz")
+        self.refresh_interval = refresh_interval if refresh_interval is not None else float(
+            os.getenv('MINIO_INVENTORY_REFRESH_INTERVAL', '600')
+        )
+        self._lock = threading.RLock()
+        self._index: Dict[str, Dict[str, Entry]] = {}
+        self._count = 0
+        self._pending: Optional[Dict[str, Optional[Entry]]] = None  # 갱신 중 들어온 쓰기 (None = 삭제)
+        self._refreshing = threading.Lock()
+        self.refreshed_at: Optional[str] = None
+        self.ready = False
+        _inventories[bucket] = self
+
+    # ------------------------------------------------------------------
+    # 조회 (네트워크 호출 없음)
+    # ------------------------------------------------------------------
+    def stat(self, key: str) -> Optional[Entry]:
+        """객체 (size, etag) - 없으면 None"""
+        prefix, rest = split_key(key)
+        with self._lock:
+            return self._index.get(prefix, {}).get(rest)
+
+    def exists(self, key: str) -> bool:
+        return self.stat(key) is not None
+
+    def objects(self, logo_hash: str) -> Dict[str, Entry]:
+        """logo_hash(또는 content_store.cas_prefix)의 전체 객체 {객체 키: (size, etag)}"""
+        with self._lock:
+            entries = self._index.get(logo_hash)
+            if not entries:
+                return {}
+            return {logo_hash + rest: entry for rest, entry in entries.items()}
+
+    def prefixes(self) -> List[str]:
+        """색인된 접두사 (logo_hash 또는 다이제스트 디렉터리) 목록"""
+        with self._lock:
+            return list(self._index)
+
+    def has_any(self, logo_hash: str) -> bool:
+        with self._lock:
+            return bool(self._index.get(logo_hash))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "bucket": self.bucket,
+                "ready": self.ready,
+                "refreshed_at": self.refreshed_at,
+                "logo_hashes": len(self._index),
+                "objects": self._count,
+                "refresh_interval": self.refresh_interval,
+            }
+
+    # ------------------------------------------------------------------
+    # 자체 쓰기 반영
+    # ------------------------------------------------------------------
+    def record_put(self, key: str, size: int, etag: Optional[str] = None):
+        entry = (int(size or 0), _etag(etag))
+        with self._lock:
+            self._set(key, entry)
+            if self._pending is not None:
+                self._pending[key] = entry
+
+    def record_remove(self, key: str):
+        with self._lock:
+            self._set(key, None)
+            if self._pending is not None:
+                self._pending[key] = None
+
+    def _set(self, key: str, entry: Optional[Entry]):
+        prefix, rest = split_key(key)
+        entries = self._index.get(prefix)
+        if entry is None:
+            if entries and entries.pop(rest, None) is not None:
+                self._count -= 1
+                if not entries:
+                    del self._index[prefix]
+            return
+        if entries is None:
+            entries = self._index[prefix] = {}
+        if rest not in entries:
+            self._count += 1
+        entries[rest] = entry
+
+    # ------------------------------------------------------------------
+    # 전체 갱신 / 스냅샷
+    # ------------------------------------------------------------------
+    def refresh(self) -> int:
+        """버킷 전체 목록으로 인벤토리 교체 후 디스크에 저장 (동시 호출은 1개만 실행)"""
+        if not self._refreshing.acquire(blocking=False):
+            return self._count
+        try:
+            started = time.monotonic()
+            with self._lock:
+                self._pending = {}
+            try:
+                listing = (
+                    (obj.object_name, obj.size, obj.etag)
+                    for obj in self.minio_client.list_objects(self.bucket, recursive=True)
+                )
+                self.replace(listing)
+            finally:
+                with self._lock:
+                    self._pending = None
+            self.save()
+            print(f"📦 MinIO 인벤토리 갱신: {self.bucket} - {self._count}개 객체 ({time.monotonic() - started:.1f}s)")
+            return self._count
+        finally:
+            self._refreshing.release()
+
+    def replace(self, listing: Iterable[Tuple[str, int, Optional[str]]]):
+        """(키, 크기, etag) 전체 목록으로 인벤토리 교체 - 진행 중인 갱신 동안 들어온 쓰기는 유지"""
+        index: Dict[str, Dict[str, Entry]] = {}
+        count = 0
+        for key, size, etag in listing:
+            prefix, rest = split_key(key)
+            index.setdefault(prefix, {})[rest] = (int(size or 0), _etag(etag))
+            count += 1
+        with self._lock:
+            self._index = index
+            self._count = count
+            for key, entry in (self._pending or {}).items():
+                self._set(key, entry)
+            self.refreshed_at = datetime.now().isoformat()
+            self.ready = True
+
+    def save(self):
+        """인벤토리 스냅샷을 원자적으로 기록 (gzip JSON)"""
+        with self._lock:
+            snapshot = {
+                "bucket": self.bucket,
+                "refreshed_at": self.refreshed_at,
+                "objects": {prefix: {rest: list(entry) for rest, entry in entries.items()}
+                            for prefix, entries in self._index.items()},
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_name(self.path.name + ".tmp")
+        with gzip.open(tmp_file, 'wt', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_file, self.path)
+
+    def load(self) -> bool:
+        """디스크 스냅샷 읽기 (웜 재시작) - 스냅샷이 없거나 다른 버킷이면 False"""
+        if not self.path.exists():
+            return False
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except Exception as e:
+            print(f"⚠️ MinIO 인벤토리 스냅샷 읽기 실패: {self.path} - {e}")
+            return False
+        if snapshot.get("bucket") != self.bucket:
+            return False
+        listing = (
+            (prefix + rest, entry[0], entry[1])
+            for prefix, entries in (snapshot.get("objects") or {}).items()
+            for rest, entry in entries.items()
+        )
+        self.replace(listing)
+        self.refreshed_at = snapshot.get("refreshed_at")
+        print(f"📦 MinIO 인벤토리 스냅샷 로드: {self.bucket} - {self._count}개 객체 (갱신 시각 {self.refreshed_at})")
+        return True
+
+    def is_stale(self) -> bool:
+        if not self.refreshed_at:
+            return True
+        try:
+            age = (datetime.now() - datetime.fromisoformat(self.refreshed_at)).total_seconds()
+        except ValueError:
+            return True
+        return age >= self.refresh_interval
+
+
+# 버킷별 인벤토리 (다른 모듈의 쓰기를 반영하기 위한 등록부)
+_inventories: Dict[str, MinioInventory] = {}
+
+
+def get_inventory(bucket: str) -> Optional[MinioInventory]:
+    return _inventories.get(bucket)
+
+
+def notify_put(bucket: str, key: str, size: int, etag: Optional[str] = None):
+    """이 프로세스에서 객체를 썼음을 인벤토리에 반영 (인벤토리가 없으면 무시)"""
+    inventory = _inventories.get(bucket)
+    if inventory:
+        inventory.record_put(key, size, etag)
+
+
+def notify_remove(bucket: str, keys: List[str]):
+    inventory = _inventories.get(bucket)
+    if inventory:
+        for key in keys:
+            inventory.record_remove(key)
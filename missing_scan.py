@@ -0,0 +1,108 @@
+"""
+미보유 로고 스캔 모듈
+logo_master_with_status 뷰를 페이지 커서로 결정적으로 순회하며 미보유(has_any_file=false) 종목을 스트리밍
+"""
+
+import os
+from typing import AsyncIterator, Dict, Optional, Tuple
+import logging
+
+from existing_api_client import iter_table_pages
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "raw_data"
+VIEW = "logo_master_with_status"
+PAGE_SIZE = 100  # 기존 API 페이지 최대 크기
+
+# 서버 측 컬럼 필터로 전달하고, 응답에 컬럼이 있으면 클라이언트에서도 한 번 더 확인
+_COLUMN_FILTERS = ("fs_exchange", "country", "is_active")
+
+
+def parse_cursor(cursor: Optional[str]) -> Tuple[int, int]:
+    """커서 문자열 "{page}:{row}" → (page, row) (기본: 1페이지 처음부터)"""
+    if not cursor:
+        return 1, 0
+    try:
+        page, _, row = str(cursor).partition(":")
+        return max(1, int(page)), max(0, int(row or 0))
+    except ValueError:
+        raise ValueError(f"잘못된 커서: {cursor}")
+
+
+def format_cursor(page: int, row: int = 0) -> str:
+    return f"{page}:{row}"
+
+
+def build_query_params(filters: Dict, page_size: int = PAGE_SIZE) -> Dict:
+    """필터를 기존 API 쿼리 파라미터로 변환"""
+    params = {"size": page_size}
+    for key in _COLUMN_FILTERS:
+        if filters.get(key) is not None:
+            params[key] = filters[key]
+    if filters.get("prefix"):
+        params["search"] = filters["prefix"]
+        params["search_column"] = "infomax_code"
+    return params
+
+
+def matches_filters(row: Dict, filters: Dict) -> bool:
+    """서버가 무시한 필터가 있을 수 있으므로 응답 행을 다시 확인"""
+    for key in _COLUMN_FILTERS:
+        expected = filters.get(key)
+        if expected is not None and key in row and row[key] is not None and row[key] != expected:
+            return False
+    prefix = filters.get("prefix")
+    if prefix and not str(row.get("infomax_code", "")).startswith(prefix):
+        return False
+    return True
+
+
+def is_missing(row: Dict) -> bool:
+    return row.get("has_any_file") is False
+
+
+def to_ticker(row: Dict) -> Dict:
+    """뷰 행 → 크롤링 대상 형식"""
+    infomax_code = row["infomax_code"]
+    return {
+        "infomax_code": infomax_code,
+        "ticker": row.get("crawling_ticker") or infomax_code,
+        "api_domain": row.get("api_domain") or "website",
+    }
+
+
+async def scan_missing_logos(
+    api,
+    filters: Optional[Dict] = None,
+    cursor: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    page_size: int = PAGE_SIZE,
+    retries: int = 3,
+) -> AsyncIterator[Dict]:
+    """뷰 전체를 페이지 순서대로 순회하며 페이지별 미보유 종목을 yield
+
+    - 다음 concurrency개 페이지를 동시에 미리 가져오되, 결과는 항상 페이지 순서대로 내보낸다.
+    - 각 결과의 next_cursor로 중단한 지점부터 다시 시작할 수 있다.
+    - yield 형식: {"page", "total_pages", "rows", "missing": [(row 번호, 행), ...], "next_cursor"}
+    """
+    filters = filters or {}
+    concurrency = concurrency or int(os.getenv('MISSING_SCAN_CONCURRENCY', '4'))
+    params = build_query_params(filters, page_size)
+    start_page, start_row = parse_cursor(cursor)
+
+    async for page, total_pages, response in iter_table_pages(
+        api, SCHEMA, VIEW, params, start_page=start_page, concurrency=concurrency, retries=retries
+    ):
+        rows = response.get("data") or []
+        first_row = start_row if page == start_page else 0
+        yield {
+            "page": page,
+            "total_pages": total_pages,
+            "rows": len(rows),
+            "missing": [
+                (i, row) for i, row in enumerate(rows)
+                if i >= first_row and is_missing(row) and matches_filters(row, filters)
+            ],
+            "next_cursor": format_cursor(page + 1) if page < total_pages else None,
+        }
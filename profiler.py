@@ -0,0 +1,207 @@
+"""
+샘플링 프로파일러 모듈
+실행 중인 프로세스의 모든 스레드(이벤트 루프 + 크롤링 워커 스레드) 스택을 일정 간격으로 수집해
+플레임그래프 도구용 형식으로 반환
+
+- collapsed  : "스레드;함수 (파일:줄);... 샘플수" 한 줄씩 (flamegraph.pl, speedscope에서 열림)
+- speedscope : https://www.speedscope.app 파일 형식 (스레드별 sampled 프로파일)
+
+수집 방식
+- 메인 스레드(uvicorn 이벤트 루프): ITIMER_REAL 타이머 신호 처리기에서 중단된 프레임 기록
+  (샘플러 스레드는 GIL이 풀리는 select() 시점에만 깨어나므로 sys._current_frames로는 루프가 늘 유휴로 보임)
+- 그 밖의 스레드(크롤링 워커 등): 샘플러 스레드가 sys._current_frames()로 수집
+
+프로파일 중이 아닐 때는 타이머/스레드가 없으므로 비용이 없다.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '60'))
+MAX_DEPTH = 128
+# 스레드가 일 없이 대기 중일 때 스택 맨 위에 오는 함수 (include_idle=False에서 제외)
+IDLE_FUNCTIONS = {"select", "poll", "wait", "_wait_for_tstate_lock", "sleep", "get", "accept", "readinto", "recv_into"}
+
+_active = threading.Lock()
+
+Frame = Tuple[str, str, int]  # (함수, 파일, 첫 줄)
+
+
+class ProfileBusyError(RuntimeError):
+    """이미 다른 프로파일이 실행 중"""
+
+
+def _short_path(path: str) -> str:
+    for prefix in sorted((p for p in sys.path if p), key=len, reverse=True):
+        if path.startswith(prefix + os.sep):
+            return path[len(prefix) + 1:]
+    return path
+
+
+def _stack(frame) -> Tuple[Frame, ...]:
+    """루트 → 리프 순서의 프레임 목록"""
+    stack = []
+    while frame is not None and len(stack) < MAX_DEPTH:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class Profile:
+    """스레드별 스택 샘플 집계"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.samples = 0
+        self.thread_names: Dict[int, str] = {}
+        self.stacks: Dict[int, Dict[Tuple[Frame, ...], int]] = {}
+
+    def add(self, ident: int, stack: Tuple[Frame, ...]):
+        counts = self.stacks.setdefault(ident, {})
+        counts[stack] = counts.get(stack, 0) + 1
+
+    def _thread_label(self, ident: int) -> str:
+        return f"{self.thread_names.get(ident, 'thread')}-{ident}"
+
+    @staticmethod
+    def _frame_label(frame: Frame) -> str:
+        name, filename, line = frame
+        return f"{name} ({_short_path(filename)}:{line})"
+
+    def collapsed(self) -> str:
+        lines = []
+        for ident, counts in self.stacks.items():
+            thread = self._thread_label(ident)
+            for stack, count in counts.items():
+                lines.append(";".join([thread] + [self._frame_label(f) for f in stack]) + f" {count}")
+        lines.sort()
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self) -> Dict:
+        frames: List[Dict] = []
+        index: Dict[Frame, int] = {}
+        profiles = []
+        for ident, counts in sorted(self.stacks.items()):
+            samples, weights = [], []
+            for stack, count in counts.items():
+                row = []
+                for frame in stack:
+                    if frame not in index:
+                        index[frame] = len(frames)
+                        name, filename, line = frame
+                        frames.append({"name": name, "file": _short_path(filename), "line": line})
+                    row.append(index[frame])
+                samples.append(row)
+                weights.append(round(count * self.interval, 6))
+            profiles.append({
+                "type": "sampled",
+                "name": self._thread_label(ident),
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": weights,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"pid {os.getpid()} {time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at))}",
+            "exporter": "stock_logo_crawler profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def summary(self) -> Dict:
+        return {
+            "pid": os.getpid(),
+            "duration_s": round(self.duration, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "threads": {self._thread_label(ident): sum(counts.values()) for ident, counts in self.stacks.items()},
+        }
+
+
+def _is_idle(stack: Tuple[Frame, ...]) -> bool:
+    return bool(stack) and stack[-1][0] in IDLE_FUNCTIONS
+
+
+def sample(seconds: float, interval: float = 0.005, include_idle: bool = True,
+           profile: Profile = None, skip: Tuple[int, ...] = ()) -> Profile:
+    """seconds 동안 interval 간격으로 스레드 스택 수집 (호출한 스레드 자신과 skip 스레드는 제외)
+
+    include_idle=False면 리프가 대기 함수(select/wait/sleep 등)인 샘플은 버린다.
+    """
+    seconds = max(0.1, min(float(seconds), MAX_SECONDS))
+    profile = profile or Profile(max(0.001, float(interval)))
+    excluded = {threading.get_ident(), *skip}
+    started = time.perf_counter()
+    deadline = started + seconds
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        profile.thread_names.update((t.ident, t.name) for t in threading.enumerate())
+        for ident, frame in sys._current_frames().items():
+            if ident in excluded:
+                continue
+            stack = _stack(frame)
+            if include_idle or not _is_idle(stack):
+                profile.add(ident, stack)
+        profile.samples += 1
+        time.sleep(max(0.0, profile.interval - (time.perf_counter() - now)))
+    profile.duration = time.perf_counter() - started
+    return profile
+
+
+class _MainThreadTimer:
+    """메인 스레드 타이머 신호 샘플러 (메인 스레드에서 설치/해제)"""
+
+    def __init__(self, profile: Profile, include_idle: bool):
+        self.profile = profile
+        self.include_idle = include_idle
+        self.ident = threading.main_thread().ident
+        self._previous = None
+
+    def _handle(self, signum, frame):
+        stack = _stack(frame)
+        if self.include_idle or not _is_idle(stack):
+            self.profile.add(self.ident, stack)
+
+    def __enter__(self):
+        self._previous = signal.signal(signal.SIGALRM, self._handle)
+        signal.setitimer(signal.ITIMER_REAL, self.profile.interval, self.profile.interval)
+        return self
+
+    def __exit__(self, *exc):
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._previous or signal.SIG_DFL)
+        return False
+
+
+async def profile_process(seconds: float, interval: float = 0.005, include_idle: bool = True) -> Profile:
+    """이벤트 루프에서 호출 - 메인 스레드는 타이머 신호, 나머지 스레드는 샘플러 스레드로 수집
+
+    동시에 하나만 실행할 수 있으며, 실행 중이면 ProfileBusyError.
+    """
+    if not _active.acquire(blocking=False):
+        raise ProfileBusyError("이미 프로파일이 실행 중입니다")
+    try:
+        profile = Profile(max(0.001, float(interval)))
+        use_timer = threading.current_thread() is threading.main_thread() and hasattr(signal, "setitimer")
+        if not use_timer:
+            return await asyncio.to_thread(sample, seconds, interval, include_idle, profile)
+        main = threading.main_thread()
+        profile.thread_names[main.ident] = main.name
+        with _MainThreadTimer(profile, include_idle):
+            return await asyncio.to_thread(sample, seconds, interval, include_idle, profile, (main.ident,))
+    finally:
+        _active.release()
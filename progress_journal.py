@@ -0,0 +1,315 @@
+"""
+진행상황 저널 모듈
+작업별 append-only JSONL 이벤트 저널, 주기적 요약 스냅샷, 메모리 집계를 제공
+
+파일 구성 (PROGRESS_DIR 기준)
+- {job_id}.events.jsonl : 이벤트 저널 (한 줄 = 이벤트 1건, 추가만 함)
+- {job_id}.json         : 요약 스냅샷 (items 제외, 주기적으로 원자적 교체)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ('completed', 'failed', 'error', 'cancelled')
+
+
+def _json_default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"직렬화할 수 없는 타입: {type(obj)}")
+
+
+class ProgressJournal:
+    """작업 1건의 진행상황 저널
+
+    이벤트 형식
+    - {"type": "update", "fields": {...}}                     필드 설정
+    - {"type": "item", "item": {...}, "inc": {...}, "append": {...}}
+                                                              아이템 추가 + 카운터 증가 + 리스트 필드 추가
+    - {"type": "base", "fields": {...}, "items": [...]}       기존 JSON 파일의 상태 (저널 첫 줄, 레거시 작업 전환용)
+    이벤트 번호(offset)는 저널의 줄 번호(0부터)이며 파일에 저장하지 않는다.
+    여러 프로세스가 같은 저널에 추가해도 집계는 파일 순서대로 재생된다.
+    """
+
+    def __init__(self, progress_dir: Path, job_id: str, snapshot_every: int = None, snapshot_interval: float = None):
+        self.job_id = job_id
+        self.progress_dir = Path(progress_dir)
+        self.events_file = self.progress_dir / f"{job_id}.events.jsonl"
+        self.snapshot_file = self.progress_dir / f"{job_id}.json"
+        self.snapshot_every = snapshot_every or int(os.getenv('PROGRESS_SNAPSHOT_EVERY', '100'))
+        self.snapshot_interval = snapshot_interval if snapshot_interval is not None else float(
+            os.getenv('PROGRESS_SNAPSHOT_INTERVAL', '10')
+        )
+        self._lock = threading.RLock()
+        self._state: Dict = {}
+        self._items: List[Dict] = []
+        self._offset = 0          # 저널에서 읽은 바이트 위치
+        self._event_count = 0     # 재생한 이벤트 수
+        self._loaded = False
+        self._legacy = False      # 저널 없이 기존 JSON 파일만 있는 작업
+        self._events_since_snapshot = 0
+        self._last_snapshot = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def create(self, initial: Dict):
+        """새 저널 시작 (기존 저널/스냅샷은 덮어씀)"""
+        with self._lock:
+            self.progress_dir.mkdir(parents=True, exist_ok=True)
+            fields = {k: v for k, v in initial.items() if k != "items"}
+            self.events_file.write_text("", encoding='utf-8')
+            self._state = {}
+            self._items = []
+            self._offset = 0
+            self._event_count = 0
+            self._loaded = True
+            self._legacy = False
+            self._append({"type": "update", "fields": fields})
+            self.snapshot()
+
+    def update(self, **fields):
+        """필드 설정 이벤트 추가"""
+        self._append({"type": "update", "fields": fields})
+        if fields.get("status") in TERMINAL_STATUSES:
+            self.snapshot()
+
+    def record_item(self, item: Optional[Dict] = None, inc: Optional[Dict[str, int]] = None, append: Optional[Dict] = None, **fields):
+        """아이템 결과 이벤트 추가 (아이템 추가 + 카운터 증가 + 리스트 필드 추가 + 필드 설정)"""
+        event = {"type": "item"}
+        if item is not None:
+            event["item"] = item
+        if inc:
+            event["inc"] = inc
+        if append:
+            event["append"] = append
+        if fields:
+            event["fields"] = fields
+        self._append(event)
+
+    def _append(self, event: Dict):
+        event["ts"] = datetime.now().isoformat()
+        line = json.dumps(event, ensure_ascii=False, default=_json_default) + "\n"
+        with self._lock:
+            self._ensure_loaded()
+            if self._legacy:
+                self._write_base()
+            with open(self.events_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+            # 자신이 쓴 이벤트도 파일에서 다시 읽어 적용 (다른 프로세스의 이벤트와 순서 일치)
+            self._read_new_events()
+            self._events_since_snapshot += 1
+            if (
+                self._events_since_snapshot >= self.snapshot_every
+                or time.monotonic() - self._last_snapshot >= self.snapshot_interval
+            ):
+                self.snapshot()
+
+    def snapshot(self):
+        """요약 스냅샷(items 제외)을 원자적으로 기록"""
+        with self._lock:
+            summary = self._summary()
+            tmp_file = self.snapshot_file.with_suffix(".json.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, default=_json_default)
+            os.replace(tmp_file, self.snapshot_file)
+            self._events_since_snapshot = 0
+            self._last_snapshot = time.monotonic()
+            for listener in list(_snapshot_listeners):
+                try:
+                    listener(self.job_id, summary)
+                except Exception as e:
+                    logger.warning(f"스냅샷 리스너 실패: {self.job_id} - {e}")
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def exists(self) -> bool:
+        return self.events_file.exists() or self.snapshot_file.exists()
+
+    def refresh(self):
+        """다른 프로세스가 추가한 이벤트 반영"""
+        with self._lock:
+            self._ensure_loaded()
+            if self._legacy and self.events_file.exists():
+                # 다른 프로세스가 레거시 작업에 저널을 만들었음 - 그 저널로 전환
+                self._write_base()
+            elif not self._legacy:
+                self._read_new_events()
+
+    def aggregate(self, include_items: bool = True) -> Dict:
+        """현재 집계 (진행상황 API 응답 형식)"""
+        with self._lock:
+            self.refresh()
+            result = dict(self._state)
+            if include_items:
+                result["items"] = list(self._items)
+            else:
+                result["items_count"] = len(self._items)
+            return result
+
+    def summary(self) -> Dict:
+        with self._lock:
+            self.refresh()
+            return self._summary()
+
+    def item_outcomes(self, key: str = "infomax_code") -> Dict[str, str]:
+        """아이템별 마지막 결과 상태 (재개 시 완료 항목 건너뛰기용)"""
+        with self._lock:
+            self.refresh()
+            outcomes = {}
+            for item in self._items:
+                if isinstance(item, dict) and item.get(key) is not None:
+                    outcomes[item[key]] = item.get("status")
+            return outcomes
+
+    @property
+    def event_count(self) -> int:
+        return self._event_count
+
+    def read_events(self, start: int = 0, position: Optional[int] = None) -> Tuple[List[Dict], int, int]:
+        """start번째 이벤트부터 읽어 (이벤트 목록, 다음 offset, 다음 바이트 위치) 반환
+
+        position은 이전 호출이 돌려준 바이트 위치로, 주면 파일 처음부터 다시 세지 않는다 (tail용).
+        """
+        events = []
+        if not self.events_file.exists():
+            return events, start, position or 0
+        index = start if position is not None else 0
+        with open(self.events_file, 'rb') as f:
+            if position is not None:
+                f.seek(position)
+            pos = position or 0
+            for raw in f:
+                # 아직 다 쓰이지 않은 마지막 줄은 다음 호출에서 읽음
+                if not raw.endswith(b"\n"):
+                    break
+                if index >= start:
+                    try:
+                        event = json.loads(raw)
+                        event["offset"] = index
+                        events.append(event)
+                    except ValueError:
+                        pass
+                index += 1
+                pos += len(raw)
+        return events, max(index, start), pos
+
+    def _summary(self) -> Dict:
+        summary = dict(self._state)
+        summary["items_count"] = len(self._items)
+        summary["journal_events"] = self._event_count
+        return summary
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.events_file.exists():
+            self._read_new_events()
+        elif self.snapshot_file.exists():
+            # 저널 도입 이전의 진행상황 파일
+            self._legacy = True
+            try:
+                with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._items = list(data.pop("items", []) or [])
+                self._state = data
+            except Exception as e:
+                logger.warning(f"진행상황 파일 읽기 실패: {self.snapshot_file} - {e}")
+
+    def _write_base(self):
+        """레거시 작업의 첫 이벤트 추가 전, 읽어 둔 JSON 상태를 저널 첫 줄(base)로 기록
+
+        저널만 재생해도 스냅샷 필드와 items가 살아 있도록 한다.
+        다른 프로세스가 먼저 저널을 만들었으면(배타적 생성 실패) 그 저널을 그대로 따른다.
+        """
+        base = {"type": "base", "fields": self._state, "items": self._items, "ts": datetime.now().isoformat()}
+        try:
+            with open(self.events_file, 'x', encoding='utf-8') as f:
+                f.write(json.dumps(base, ensure_ascii=False, default=_json_default) + "\n")
+        except FileExistsError:
+            pass
+        self._state = {}
+        self._items = []
+        self._offset = 0
+        self._event_count = 0
+        self._legacy = False
+        self._read_new_events()
+
+    def _read_new_events(self):
+        if not self.events_file.exists():
+            return
+        with open(self.events_file, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        if not chunk:
+            return
+        # 마지막 줄이 아직 다 쓰이지 않았으면 다음 refresh에서 읽음
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return
+        for raw in chunk[:end].split(b"\n"):
+            if raw:
+                try:
+                    self._apply(json.loads(raw))
+                except ValueError:
+                    logger.warning(f"손상된 저널 이벤트 무시: {self.events_file}")
+            self._event_count += 1
+        self._offset += end + 1
+
+    def _apply(self, event: Dict):
+        if event.get("type") == "base":
+            self._items.extend(event.get("items") or [])
+        fields = event.get("fields")
+        if fields:
+            self._state.update(fields)
+        item = event.get("item")
+        if item is not None:
+            self._items.append(item)
+        for key, delta in (event.get("inc") or {}).items():
+            self._state[key] = (self._state.get(key) or 0) + delta
+        for key, value in (event.get("append") or {}).items():
+            self._state.setdefault(key, []).append(value)
+
+
+_snapshot_listeners: List[Callable[[str, Dict], None]] = []
+
+
+def add_snapshot_listener(listener: Callable[[str, Dict], None]):
+    """요약 스냅샷이 기록될 때마다 listener(job_id, summary) 호출 (예: 작업 레지스트리 갱신)"""
+    if listener not in _snapshot_listeners:
+        _snapshot_listeners.append(listener)
+
+
+_journals: "OrderedDict[Tuple[str, str], ProgressJournal]" = OrderedDict()
+_journals_lock = threading.Lock()
+JOURNAL_CACHE_SIZE = int(os.getenv('PROGRESS_JOURNAL_CACHE_SIZE', '64'))
+
+
+def get_journal(job_id: str, progress_dir=None) -> ProgressJournal:
+    """프로세스 전역 저널 (job_id별 1개, 메모리 집계 공유, LRU로 개수 제한)"""
+    progress_dir = Path(progress_dir or os.getenv('PROGRESS_DIR', 'progress'))
+    key = (str(progress_dir.resolve()), job_id)
+    with _journals_lock:
+        journal = _journals.get(key)
+        record_cache("progress_journal", journal is not None)
+        if journal is None:
+            journal = ProgressJournal(progress_dir, job_id)
+            _journals[key] = journal
+            while len(_journals) > JOURNAL_CACHE_SIZE:
+                _journals.popitem(last=False)
+        else:
+            _journals.move_to_end(key)
+        return journal
@@ -0,0 +1,266 @@
+"""
+API 쿼터 관리 모듈
+업스트림 ext_api_quota 원장에서 N건 단위 블록을 임대(lease)해 로컬에서 소모하는 쿼터 서비스를 제공
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone, date
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "raw_data"
+TABLE = "ext_api_quota"
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class QuotaLedger:
+    """API별 일일 쿼터 원장
+
+    - 업스트림 원장(ext_api_quota)에서 block_size 단위로 사용량을 선점한다.
+    - 선점한 블록은 로컬 카운터로 소모하므로 호출당 추가 왕복이 없다.
+    - 미사용분은 release()로 원장에 반환한다 (작업 종료/서버 종료 시).
+    - 업스트림 upsert는 used_count를 증가량으로 취급한다 (ON CONFLICT 시 used_count += N).
+    - 임대/조회는 블로킹 HTTP 호출이므로 이벤트 루프에서는 try_consume_local 후 부족할 때만
+      asyncio.to_thread(try_consume)로 호출한다.
+    - 원장 HTTP 호출은 상태 락(_lock) 밖에서 하고(임대/반환은 _lease_lock으로 직렬화), 결과 반영만 짧게 _lock을 잡는다.
+      그래서 임대/조회/반환이 진행 중이어도 try_consume_local은 기다리지 않는다.
+    """
+
+    def __init__(self, api, api_name: str, daily_limit: int, block_size: int = None):
+        self.api = api
+        self.api_name = api_name
+        self.daily_limit = daily_limit
+        self.block_size = block_size or int(os.getenv('QUOTA_LEASE_BLOCK_SIZE', '50'))
+        self._lock = threading.Lock()        # 로컬 상태 보호 (I/O 없이 짧게만 보유)
+        self._lease_lock = threading.Lock()  # 원장 임대/반환 직렬화 (HTTP 호출 동안 보유)
+        self._day = _utc_today()
+        self._available = 0        # 임대했지만 아직 소모하지 않은 건수
+        self._consumed = 0         # 이 프로세스가 오늘 소모한 건수
+        self._leased = 0           # 이 프로세스가 오늘 임대한 총 건수 (반환분 차감)
+        self._upstream_used = None  # 마지막으로 확인한 원장 사용량 (임대분 포함)
+        self._usage_checked = 0.0   # 원장 사용량 확인 시각 (monotonic)
+        self._usage_version = 0     # 임대/반환으로 원장 사용량을 갱신할 때마다 증가 (늦게 끝난 조회가 덮어쓰지 않도록)
+        self._exhausted_until = 0.0  # 소진 확인 후 재조회까지 대기 (monotonic)
+        self.exhausted_recheck = float(os.getenv('QUOTA_EXHAUSTED_RECHECK', '60'))
+        # 다른 워커의 소모를 반영하기 위한 원장 사용량 재조회 주기 (초)
+        self.usage_ttl = float(os.getenv('QUOTA_USAGE_TTL', str(self.exhausted_recheck)))
+
+    def try_consume_local(self, count: int = 1) -> bool:
+        """로컬 임대분에서만 count건 소모 (원장 호출 없음 - 이벤트 루프에서 안전)"""
+        with self._lock:
+            self._rollover()
+            if self._available < count:
+                return False
+            self._available -= count
+            self._consumed += count
+            return True
+
+    def try_consume(self, count: int = 1) -> bool:
+        """count건 소모 시도 - 로컬 잔량이 부족할 때만 원장에서 블록을 임대"""
+        if self.try_consume_local(count):
+            return True
+        with self._lease_lock:
+            with self._lock:
+                self._rollover()
+                # 기다리는 동안 다른 스레드가 임대했을 수 있음
+                if self._available >= count:
+                    self._available -= count
+                    self._consumed += count
+                    return True
+                # 소진이 확인된 직후에는 원장을 다시 조회하지 않음 (다른 워커의 반환 대기)
+                if time.monotonic() < self._exhausted_until:
+                    return False
+                day, minimum = self._day, count - self._available
+            if not self._lease(day, minimum):
+                return False
+        # 임대 직후 다른 스레드가 로컬에서 먼저 소모했으면 실패
+        return self.try_consume_local(count)
+
+    def has_budget(self, count: int = 1) -> bool:
+        """count건을 소모할 여유가 있는지 확인 (소모하지 않음)"""
+        return self.remaining() >= count
+
+    def remaining(self, refresh: bool = False) -> int:
+        """전체 워커 기준 남은 일일 쿼터 추정치"""
+        with self._lock:
+            self._rollover()
+            stale = time.monotonic() - self._usage_checked >= self.usage_ttl
+            fetch = refresh or stale or self._upstream_used is None
+            day, version = self._day, self._usage_version
+        if fetch:
+            used = self._fetch_usage(day)
+            with self._lock:
+                # 조회 중 임대/반환이 있었으면 그쪽 값이 더 새로움
+                if day == self._day and version == self._usage_version:
+                    self._upstream_used = used
+                    self._usage_checked = time.monotonic()
+        with self._lock:
+            # 원장 사용량에는 아직 소모하지 않은 로컬 임대분이 포함되어 있음
+            return max(0, self.daily_limit - (self._upstream_used or 0) + self._available)
+
+    def release(self) -> int:
+        """미사용 임대분을 원장에 반환하고 반환 건수를 리턴"""
+        with self._lease_lock:
+            with self._lock:
+                self._rollover()
+                unused = self._available
+                if unused <= 0:
+                    return 0
+                # 반환 중에는 로컬에서 소모하지 못하도록 먼저 빼 둠
+                self._available = 0
+                day = self._day
+            ok = self._increment(day, -unused)
+            with self._lock:
+                if day != self._day:
+                    return 0
+                if not ok:
+                    self._available += unused
+                    logger.error(f"{self.api_name} 쿼터 반환 실패: {unused}건")
+                    return 0
+                self._leased -= unused
+                if self._upstream_used is not None:
+                    self._upstream_used = max(0, self._upstream_used - unused)
+                    self._usage_version += 1
+        print(f"✅ {self.api_name} 미사용 쿼터 반환: {unused}건")
+        return unused
+
+    def status(self, refresh: bool = False) -> Dict:
+        """쿼터 상태 요약"""
+        remaining = self.remaining(refresh=refresh)
+        with self._lock:
+            used = self._upstream_used - self._available if self._upstream_used is not None else None
+            return {
+                "date_utc": self._day.isoformat(),
+                "used": used,
+                "limit": self.daily_limit,
+                "remaining": remaining,
+                "percentage": round((used / self.daily_limit) * 100, 2) if used is not None and self.daily_limit else None,
+                "local": {
+                    "leased": self._leased,
+                    "consumed": self._consumed,
+                    "available": self._available,
+                    "block_size": self.block_size
+                }
+            }
+
+    def _rollover(self):
+        """UTC 날짜가 바뀌면 로컬 상태 초기화 (전날 임대분은 반환하지 않음)"""
+        today = _utc_today()
+        if today != self._day:
+            self._day = today
+            self._available = 0
+            self._consumed = 0
+            self._leased = 0
+            self._upstream_used = None
+            self._usage_checked = 0.0
+            self._exhausted_until = 0.0
+
+    def _lease(self, day: date, minimum: int) -> bool:
+        """원장에서 블록 임대 (_lease_lock 보유, _lock 미보유 상태에서 호출 - 결과만 _apply_lease로 반영)"""
+        used = self._fetch_usage(day)
+        grant = min(max(self.block_size, minimum), self.daily_limit - used)
+        if grant < minimum:
+            print(f"❌ {self.api_name} 일일 쿼터 초과: {used}/{self.daily_limit} (요청: {minimum})")
+            self._apply_lease(day, 0, used, exhausted=True)
+            return False
+        if not self._increment(day, grant):
+            print(f"❌ {self.api_name} 쿼터 임대 실패: {grant}건")
+            return False
+        # 조회와 증가가 분리되어 있어 다른 워커와 동시에 임대하면 한도를 넘을 수 있음 → 다시 읽어 초과분 반환
+        total = self._fetch_usage(day)
+        over = min(grant, max(0, total - self.daily_limit))
+        if over and self._increment(day, -over):
+            grant -= over
+            total -= over
+        if grant < minimum:
+            if grant and self._increment(day, -grant):
+                total -= grant
+                grant = 0
+            print(f"❌ {self.api_name} 일일 쿼터 초과 (동시 임대): {total}/{self.daily_limit} (요청: {minimum})")
+            # 반환 실패분은 로컬에서 소모 가능하도록 유지
+            self._apply_lease(day, grant, total, exhausted=True)
+            return False
+        self._apply_lease(day, grant, total)
+        print(f"✅ {self.api_name} 쿼터 임대: {grant}건 (총 {total}/{self.daily_limit})")
+        return True
+
+    def _apply_lease(self, day: date, grant: int, used: int, exhausted: bool = False):
+        """임대 결과를 로컬 상태에 반영 (그 사이 날짜가 바뀌었으면 버림)"""
+        with self._lock:
+            if day != self._day:
+                return
+            self._available += grant
+            self._leased += grant
+            self._upstream_used = used
+            self._usage_checked = time.monotonic()
+            self._usage_version += 1
+            if exhausted:
+                self._exhausted_until = time.monotonic() + self.exhausted_recheck
+
+    def _fetch_usage(self, target_date: date) -> int:
+        """원장 사용량 조회"""
+        try:
+            response = self.api.query_table(SCHEMA, TABLE, {
+                "date_utc": target_date.isoformat(),
+                "api_name": self.api_name,
+                "limit": 1
+            })
+            if response and 'data' in response and response['data']:
+                return response['data'][0].get('used_count', 0) or 0
+            return 0
+        except Exception as e:
+            print(f"❌ 사용량 조회 오류: {e}")
+            return 0
+
+    def _increment(self, target_date: date, delta: int) -> bool:
+        """원장 사용량 증감 (upsert)"""
+        try:
+            result = self.api.upsert_data(SCHEMA, TABLE, {
+                "data": {
+                    "date_utc": target_date.isoformat(),
+                    "api_name": self.api_name,
+                    "used_count": delta,
+                    "max_count": self.daily_limit
+                },
+                "conflict_columns": ["date_utc", "api_name"]
+            })
+            return result is not None
+        except Exception as e:
+            print(f"❌ 쿼터 갱신 오류: {e}")
+            return False
+
+
+_ledgers: Dict[str, QuotaLedger] = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_quota_ledger(api_name: str, daily_limit: Optional[int] = None, api=None) -> QuotaLedger:
+    """프로세스 전역 쿼터 원장 (API 이름별 1개)
+
+    daily_limit 미지정 시 {API_NAME}_DAILY_LIMIT 환경변수(기본 5000)를 사용한다.
+    """
+    with _ledgers_lock:
+        ledger = _ledgers.get(api_name)
+        if ledger is None:
+            if api is None:
+                from existing_api_client import get_existing_api
+                api = get_existing_api()
+            if daily_limit is None:
+                daily_limit = int(os.getenv(f"{api_name.upper()}_DAILY_LIMIT", '5000'))
+            ledger = QuotaLedger(api, api_name, daily_limit)
+            _ledgers[api_name] = ledger
+        return ledger
+
+
+def release_all() -> Dict[str, int]:
+    """모든 원장의 미사용 임대분 반환"""
+    with _ledgers_lock:
+        ledgers = list(_ledgers.values())
+    return {ledger.api_name: ledger.release() for ledger in ledgers}
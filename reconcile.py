@@ -0,0 +1,372 @@
+"""
+스토리지/DB 정합성 점검 모듈
+MinIO 버킷 전체 목록 1회 + logos/logo_files 페이지 덤프 1회를 집합 비교해
+고아 객체, 끊긴 DB 행, 누락 렌디션, 크기 불일치를 찾고 선택적으로 복구
+
+사용법: python reconcile.py [--repair] [--delete-orphans] [--output report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from io import BytesIO
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from content_store import (
+    RENDITION_FORMATS, cas_key, expected_renditions, image_sizes, object_key_of, parse_cas_key, parse_object_key, row_key,
+    row_logo_hash,
+)
+from existing_api_client import iter_table_pages
+from logo_registry import LogoRegistry
+from minio_inventory import get_inventory, notify_put, notify_remove
+from similarity_index import get_similarity_index
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "raw_data"
+# 이보다 최근에 수정된 고아 객체는 삭제하지 않음 (업로드 직후 등록 대기 중인 렌디션 보호)
+ORPHAN_MIN_AGE = float(os.getenv('RECONCILE_ORPHAN_MIN_AGE', '3600'))
+CONTENT_TYPES = {"png": "image/png", "webp": "image/webp", "avif": "image/avif", "svg": "image/svg+xml", "jpg": "image/jpeg", "jfif": "image/jpeg"}
+
+
+def diff_inventory(
+    objects: Dict[str, Dict],
+    logos: Iterable[Dict],
+    files: Iterable[Dict],
+    sizes: List[int],
+    formats: Tuple[str, ...] = RENDITION_FORMATS,
+) -> Dict[str, List[Dict]]:
+    """버킷 목록과 DB 덤프를 비교 (네트워크 호출 없음)
+
+    objects: {object_key: {"size", "etag", "last_modified"(epoch 초, 선택)}}
+    logo_files 행 키는 object_key_of()로 객체 키에 대응시킨다 (공유 객체 하나를 여러 행이 가리킬 수 있음).
+    """
+    logo_by_id = {logo["logo_id"]: logo for logo in logos}
+    active_hashes = {logo["logo_hash"] for logo in logo_by_id.values() if not logo.get("is_deleted")}
+    files_by_key = {row["minio_object_key"]: row for row in files if row.get("minio_object_key")}
+    referenced = {object_key_of(key) for key in files_by_key}
+
+    orphaned_objects = []
+    for key, meta in objects.items():
+        if key not in referenced:
+            parsed = parse_object_key(key) or {}
+            modified = meta.get("last_modified")
+            orphaned_objects.append({
+                "key": key,
+                "size": meta.get("size"),
+                "last_modified": datetime.fromtimestamp(modified).isoformat() if modified else None,
+                "logo_hash": parsed.get("logo_hash"),
+                "known_logo": parsed.get("logo_hash") in active_hashes,
+            })
+
+    dangling_rows, rows_without_logo, size_mismatches = [], [], []
+    owners_by_digest: Dict[str, set] = {}
+    for key, row in files_by_key.items():
+        if row.get("logo_id") not in logo_by_id:
+            rows_without_logo.append({"file_id": row.get("file_id"), "key": key, "logo_id": row.get("logo_id")})
+        parsed = parse_cas_key(key)
+        owner = row_logo_hash(key)
+        if parsed and owner in active_hashes:
+            owners_by_digest.setdefault(parsed["digest"], set()).add(owner)
+        meta = objects.get(object_key_of(key))
+        if meta is None:
+            dangling_rows.append({"file_id": row.get("file_id"), "key": key, "logo_id": row.get("logo_id")})
+        elif row.get("file_size") is not None and meta.get("size") is not None and row["file_size"] != meta["size"]:
+            size_mismatches.append({
+                "file_id": row.get("file_id"),
+                "key": key,
+                "db_size": row["file_size"],
+                "object_size": meta["size"],
+            })
+
+    # 활성 로고 중 객체가 하나라도 있는 해시(공유 객체는 활성 로고가 가리키는 다이제스트)의 표준 렌디션 누락
+    present_by_hash: Dict[str, set] = {}
+    present_by_digest: Dict[str, set] = {}
+    for key in objects:
+        parsed = parse_object_key(key)
+        if not parsed:
+            continue
+        if parsed.get("digest") in owners_by_digest:
+            present_by_digest.setdefault(parsed["digest"], set()).add(key)
+        elif parsed["logo_hash"] in active_hashes:
+            present_by_hash.setdefault(parsed["logo_hash"], set()).add(key)
+    missing_renditions = []
+    for logo_hash, present in present_by_hash.items():
+        expected = [f"{logo_hash}_{size}.{fmt}" for size in sizes for fmt in formats]
+        missing = [key for key in expected if key not in present]
+        if missing:
+            missing_renditions.append({"logo_hash": logo_hash, "missing": missing, "present": sorted(present)})
+    for digest, present in present_by_digest.items():
+        missing = [key for key in expected_renditions(digest, sizes, False, formats) if key not in present]
+        if missing:
+            missing_renditions.append({
+                "digest": digest,
+                "logo_hashes": sorted(owners_by_digest[digest]),
+                "missing": missing,
+                "present": sorted(present),
+            })
+
+    return {
+        "orphaned_objects": orphaned_objects,
+        "dangling_rows": dangling_rows,
+        "rows_without_logo": rows_without_logo,
+        "missing_renditions": missing_renditions,
+        "size_mismatches": size_mismatches,
+    }
+
+
+class Reconciler:
+    """버킷/DB 정합성 점검 및 복구
+
+    - 점검 비용: list_objects 1회(버킷 전체) + 테이블당 페이지 수만큼의 조회 (동시 concurrency개)
+    - 복구: 알려진 로고의 고아 객체 등록, 크기 불일치 행 갱신, 누락 렌디션 재생성(renderer 지정 시),
+      알 수 없는 고아 객체 삭제(delete_orphans). 끊긴 DB 행은 기존 API에 삭제 기능이 없어 보고만 한다.
+    - 객체 목록을 먼저 받고 테이블을 덤프하므로, 목록 시점에 있던 객체의 행은 덤프에 반드시 보인다.
+      삭제는 orphan_min_age초보다 오래된 고아 객체만 대상 (업로드 중이거나 등록 버퍼에 있는 렌디션 보호)
+    """
+
+    def __init__(
+        self,
+        api,
+        minio_client,
+        bucket: str,
+        registry: Optional[LogoRegistry] = None,
+        renderer: Optional[Callable[[bytes, str, Dict[str, int]], Dict[str, bytes]]] = None,
+        sizes: Optional[List[int]] = None,
+        concurrency: int = None,
+        page_size: int = 100,
+        orphan_min_age: float = None,
+    ):
+        self.api = api
+        self.minio_client = minio_client
+        self.bucket = bucket
+        self.registry = registry or LogoRegistry(api)
+        self.renderer = renderer
+        self.sizes = sizes or image_sizes()
+        self.concurrency = concurrency or int(os.getenv('RECONCILE_CONCURRENCY', '4'))
+        self.page_size = page_size
+        self.orphan_min_age = ORPHAN_MIN_AGE if orphan_min_age is None else orphan_min_age
+
+    def list_inventory(self) -> Dict[str, Dict]:
+        """버킷 전체 객체 목록 (list_objects 1회, 페이지는 SDK가 이어받음)"""
+        inventory = {}
+        for obj in self.minio_client.list_objects(self.bucket, recursive=True):
+            inventory[obj.object_name] = {
+                "size": obj.size,
+                "etag": (obj.etag or "").strip('"'),
+                "last_modified": obj.last_modified.timestamp() if obj.last_modified else None,
+            }
+        # 전체 목록을 받았으므로 프로세스의 인벤토리도 함께 교체
+        shared = get_inventory(self.bucket)
+        if shared:
+            shared.replace((key, entry["size"], entry["etag"]) for key, entry in inventory.items())
+        return inventory
+
+    async def dump_table(self, table: str) -> List[Dict]:
+        rows = []
+        async for _, _, response in iter_table_pages(
+            self.api, SCHEMA, table, {"size": self.page_size}, concurrency=self.concurrency
+        ):
+            rows.extend(response.get("data") or [])
+        return rows
+
+    async def run(self, repair: bool = False, delete_orphans: bool = False, sample: int = 100) -> Dict:
+        """점검(및 복구) 실행 - 카테고리별 건수와 최대 sample건의 상세를 담은 보고서 반환"""
+        started = time.monotonic()
+        started_at = datetime.now().isoformat()
+
+        # 객체 목록 → 테이블 덤프 순서 (덤프 후 목록을 받으면 그 사이 업로드+등록된 객체가 고아로 보임)
+        objects = await asyncio.to_thread(self.list_inventory)
+        logos, files = await asyncio.gather(self.dump_table("logos"), self.dump_table("logo_files"))
+        findings = diff_inventory(objects, logos, files, self.sizes)
+        # logo_files 전체를 받았으므로 유사도 색인의 로고별 현재 그룹도 재구성
+        similarity = get_similarity_index(self.bucket)
+        if similarity:
+            similarity.assign_from_rows(files)
+        print(
+            f"🔎 정합성 점검: 객체 {len(objects)}개, logos {len(logos)}행, logo_files {len(files)}행 → "
+            + ", ".join(f"{k} {len(v)}" for k, v in findings.items())
+        )
+
+        report = {
+            "started_at": started_at,
+            "bucket": self.bucket,
+            "counts": {
+                "objects": len(objects),
+                "logos": len(logos),
+                "logo_files": len(files),
+                **{k: len(v) for k, v in findings.items()},
+            },
+            "findings": {k: v[:sample] for k, v in findings.items()},
+        }
+
+        if repair:
+            files_by_key = {row["minio_object_key"]: row for row in files if row.get("minio_object_key")}
+            report["repairs"] = await asyncio.to_thread(
+                self.repair, findings, objects, files_by_key, delete_orphans
+            )
+
+        report["finished_at"] = datetime.now().isoformat()
+        report["duration_s"] = round(time.monotonic() - started, 3)
+        return report
+
+    def repair(self, findings: Dict, objects: Dict[str, Dict], files_by_key: Dict[str, Dict], delete_orphans: bool) -> Dict:
+        """점검 결과 복구 (동기 - MinIO/기존 API 호출)"""
+        result = {
+            "registered_orphans": 0,
+            "deleted_orphans": 0,
+            "skipped_recent_orphans": 0,
+            "fixed_sizes": 0,
+            "generated_renditions": 0,
+            "errors": [],
+        }
+
+        # 1. 알려진 로고의 고아 객체 → logo_files 등록
+        entries: Dict[str, List[dict]] = {}
+        unknown = []
+        for orphan in findings["orphaned_objects"]:
+            parsed = parse_object_key(orphan["key"])
+            if orphan["known_logo"] and parsed:
+                entries.setdefault(parsed["logo_hash"], []).append(self._file_info(orphan["key"], parsed, orphan["size"], "auto"))
+            else:
+                unknown.append(orphan["key"])
+        if entries:
+            for logo_hash, ok in self.registry.register_many(list(entries.items())).items():
+                if ok:
+                    result["registered_orphans"] += len(entries[logo_hash])
+                else:
+                    result["errors"].append(f"고아 객체 등록 실패: {logo_hash}")
+
+        # 2. 알 수 없는 고아 객체 삭제 (명시적으로 요청한 경우만, 수정 시각을 모르거나 최근인 객체는 제외)
+        if delete_orphans and unknown:
+            cutoff = time.time() - self.orphan_min_age
+            stale = [key for key in unknown if ((objects.get(key) or {}).get("last_modified") or cutoff) < cutoff]
+            result["skipped_recent_orphans"] = len(unknown) - len(stale)
+            unknown = stale
+        if delete_orphans and unknown:
+            from minio.deleteobjects import DeleteObject
+            errors = list(self.minio_client.remove_objects(self.bucket, [DeleteObject(key) for key in unknown]))
+            result["deleted_orphans"] = len(unknown) - len(errors)
+            failed = {e.name for e in errors}
+            notify_remove(self.bucket, [key for key in unknown if key not in failed])
+            result["errors"].extend(f"객체 삭제 실패: {e.name} - {e.message}" for e in errors)
+
+        # 3. 크기 불일치 → 객체 크기로 행 갱신
+        rows = []
+        for mismatch in findings["size_mismatches"]:
+            row = files_by_key.get(mismatch["key"])
+            if row:
+                rows.append({
+                    "logo_id": row["logo_id"],
+                    "file_format": row["file_format"],
+                    "data_source": row["data_source"],
+                    "upload_type": row["upload_type"],
+                    "minio_object_key": row["minio_object_key"],
+                    "file_size": mismatch["object_size"],
+                })
+        if rows:
+            row_results = self.registry.upsert_file_rows(rows)
+            result["fixed_sizes"] = sum(1 for ok in row_results if ok)
+
+        # 4. 누락 렌디션 재생성 (원본 SVG 또는 가장 큰 렌디션에서)
+        if self.renderer:
+            for entry in findings["missing_renditions"]:
+                try:
+                    result["generated_renditions"] += self._regenerate(entry, objects, files_by_key)
+                except Exception as e:
+                    result["errors"].append(f"렌디션 생성 실패: {entry.get('digest') or entry['logo_hash']} - {e}")
+
+        print(f"🔧 정합성 복구: {result}")
+        return result
+
+    def _regenerate(self, entry: Dict, objects: Dict[str, Dict], files_by_key: Dict[str, Dict]) -> int:
+        digest = entry.get("digest")
+        # 공유 객체는 가리키는 로고 모두에 행을 등록
+        owners = entry["logo_hashes"] if digest else [entry["logo_hash"]]
+        source_key = cas_key(digest) if digest else f"{owners[0]}_original.svg"
+        if source_key not in objects:
+            candidates = [k for k in entry["present"] if (parse_object_key(k) or {}).get("size")]
+            if not candidates:
+                return 0
+            source_key = max(candidates, key=lambda k: parse_object_key(k)["size"])
+
+        response = self.minio_client.get_object(self.bucket, source_key)
+        try:
+            source = response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+        encodings: Dict[str, int] = {}
+        rendered = self.renderer(source, owners[0], encodings)
+        source_row = files_by_key.get(source_key) or files_by_key.get(row_key(source_key, owners[0])) or {}
+        data_source = source_row.get("data_source") or "website"
+        files = []
+        for key in entry["missing"]:
+            parsed = parse_object_key(key)
+            rendition = f"{parsed['format']}_{parsed['size']}"
+            data = rendered.get(rendition)
+            if not data:
+                continue
+            written = self.minio_client.put_object(
+                self.bucket, key, BytesIO(data), len(data),
+                content_type=CONTENT_TYPES.get(parsed["format"], "application/octet-stream")
+            )
+            notify_put(self.bucket, key, len(data), written.etag)
+            files.append(dict(self._file_info(key, parsed, len(data), "converted", data_source),
+                              quality=encodings.get(rendition)))
+        if files:
+            entries = [(owner, [dict(f, minio_key=row_key(f["minio_key"], owner)) for f in files]) for owner in owners]
+            failed = [owner for owner, ok in self.registry.register_many(entries).items() if not ok]
+            if failed:
+                raise RuntimeError(f"logo_files 등록 실패: {', '.join(failed)}")
+        return len(files)
+
+    @staticmethod
+    def _file_info(key: str, parsed: Dict, size: Optional[int], upload_type: str, data_source: str = "website") -> dict:
+        return {
+            "format": parsed["format"],
+            "width": parsed["size"],
+            "height": parsed["size"],
+            "size": size,
+            "minio_key": key,
+            "source": data_source,
+            "upload_type": upload_type,
+            "is_original": parsed["is_original"],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MinIO 버킷/DB 정합성 점검")
+    parser.add_argument("--repair", action="store_true", help="복구 실행")
+    parser.add_argument("--delete-orphans", action="store_true", help="알 수 없는 고아 객체 삭제 (--repair 필요)")
+    parser.add_argument("--sample", type=int, default=100, help="카테고리별 보고서 상세 건수 (기본: 100)")
+    parser.add_argument("--output", help="보고서 JSON 저장 경로")
+    args = parser.parse_args()
+
+    from crawler import LogoCrawler, get_shared_minio_client
+    from existing_api_client import get_existing_api
+
+    minio_client = get_shared_minio_client()
+    crawler = LogoCrawler(minio_client=minio_client)
+    reconciler = Reconciler(
+        get_existing_api(),
+        minio_client,
+        os.getenv('MINIO_BUCKET', 'logos'),
+        renderer=crawler.convert_image
+    )
+    report = asyncio.run(reconciler.run(repair=args.repair, delete_orphans=args.delete_orphans, sample=args.sample))
+
+    print(json.dumps(report["counts"], ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 보고서 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
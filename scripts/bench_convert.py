@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+이미지 변환 벤치마크
+- 대표 로고 코퍼스(단순/복잡 SVG, 큰 RGBA PNG, 팔레트 PNG, 비정사각 JPEG, 투명 WebP, LA PNG)를
+  세 가지 변환 경로로 처리
+  - 코퍼스는 고정 시드로 생성하며 처음 실행 시 scripts/bench_corpus/에 만들어 재사용 (--corpus로 다른 입력 지정)
+  - convert_image          (crawler.LogoCrawler, 크롤링 저장 시)
+  - convert_svg_to_png     (api_server, get_logo의 SVG 실시간 변환)
+  - process_uploaded_image (api_server, 업로드/수정)
+- (경로, 이미지)마다 새 프로세스에서 실행해 이미지당 시간, 최대 RSS, 크기/포맷별 출력 바이트를 JSON으로 기록
+
+사용법: python scripts/bench_convert.py --repeats 5 --output convert.json
+        python scripts/bench_convert.py --make-corpus   # 코퍼스 재생성
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+CORPUS_DIR = Path(__file__).resolve().parent / "bench_corpus"
+PATHS = ("convert_image", "convert_svg_to_png", "process_uploaded_image")
+SVG_SUFFIXES = (".svg",)
+
+
+# ----------------------------------------------------------------------
+# 코퍼스 생성 (고정 시드 - 재생성해도 같은 입력)
+# ----------------------------------------------------------------------
+def _simple_svg() -> str:
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100" width="100" height="100">'
+        '<circle cx="50" cy="50" r="45" fill="#1f6feb"/>'
+        '<rect x="30" y="30" width="40" height="40" rx="6" fill="#ffffff"/>'
+        '</svg>'
+    )
+
+
+def _complex_svg(rnd: random.Random, paths: int = 400) -> str:
+    parts = [
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 512 512" width="512" height="512">',
+        '<defs>',
+    ]
+    for i in range(8):
+        parts.append(
+            f'<linearGradient id="g{i}" x1="0" y1="0" x2="1" y2="1">'
+            f'<stop offset="0" stop-color="#{rnd.randrange(0xffffff):06x}"/>'
+            f'<stop offset="1" stop-color="#{rnd.randrange(0xffffff):06x}" stop-opacity="0.6"/>'
+            '</linearGradient>'
+        )
+    parts.append('<filter id="blur"><feGaussianBlur stdDeviation="2"/></filter></defs>')
+    for i in range(paths):
+        points = " ".join(
+            f"C {rnd.uniform(0, 512):.1f} {rnd.uniform(0, 512):.1f} {rnd.uniform(0, 512):.1f} "
+            f"{rnd.uniform(0, 512):.1f} {rnd.uniform(0, 512):.1f} {rnd.uniform(0, 512):.1f}"
+            for _ in range(3)
+        )
+        extra = ' filter="url(#blur)"' if i % 50 == 0 else ""
+        parts.append(
+            f'<path d="M {rnd.uniform(0, 512):.1f} {rnd.uniform(0, 512):.1f} {points} Z" '
+            f'fill="url(#g{i % 8})" stroke="#{rnd.randrange(0xffffff):06x}" stroke-width="{rnd.uniform(0.5, 3):.1f}"{extra}/>'
+        )
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def _shapes(image, rnd: random.Random, count: int):
+    from PIL import ImageDraw
+    draw = ImageDraw.Draw(image)
+    w, h = image.size
+    for _ in range(count):
+        x0, y0 = rnd.randrange(w), rnd.randrange(h)
+        x1, y1 = min(w, x0 + rnd.randrange(w // 8, w // 2)), min(h, y0 + rnd.randrange(h // 8, h // 2))
+        color = tuple(rnd.randrange(256) for _ in range(len(image.getbands())))
+        if rnd.random() < 0.5:
+            draw.ellipse((x0, y0, x1, y1), fill=color)
+        else:
+            draw.rectangle((x0, y0, x1, y1), fill=color)
+
+
+def make_corpus(target: Path = CORPUS_DIR) -> List[Path]:
+    """대표 로고 입력 생성"""
+    from PIL import Image, ImageFilter
+
+    rnd = random.Random(20251001)
+    target.mkdir(parents=True, exist_ok=True)
+    files = []
+
+    def save(name: str, writer: Callable[[Path], None]):
+        path = target / name
+        writer(path)
+        files.append(path)
+
+    save("simple.svg", lambda p: p.write_text(_simple_svg(), encoding="utf-8"))
+    save("complex.svg", lambda p: p.write_text(_complex_svg(rnd), encoding="utf-8"))
+
+    # 큰 RGBA PNG (2048px, 안티앨리어싱된 도형 → 압축률 낮음)
+    large = Image.new("RGBA", (2048, 2048), (0, 0, 0, 0))
+    _shapes(large, rnd, 60)
+    large = large.filter(ImageFilter.GaussianBlur(1.5))
+    save("large_rgba.png", lambda p: large.save(p, format="PNG"))
+
+    # 팔레트 PNG (16색)
+    palette = Image.new("RGB", (512, 512), (255, 255, 255))
+    _shapes(palette, rnd, 30)
+    palette = palette.quantize(colors=16)
+    save("palette.png", lambda p: palette.save(p, format="PNG"))
+
+    # 비정사각 JPEG (중앙 크롭 경로)
+    photo = Image.new("RGB", (1200, 800))
+    pixels = photo.load()
+    for y in range(0, 800):
+        for x in range(0, 1200, 4):
+            value = (int(127 + 127 * math.sin(x / 40) * math.cos(y / 55)), (x * 255) // 1200, (y * 255) // 800)
+            for dx in range(4):
+                pixels[x + dx, y] = value
+    _shapes(photo, rnd, 10)
+    save("photo.jpg", lambda p: photo.save(p, format="JPEG", quality=88))
+
+    # 투명 WebP
+    transparent = Image.new("RGBA", (800, 800), (0, 0, 0, 0))
+    _shapes(transparent, rnd, 25)
+    save("transparent.webp", lambda p: transparent.save(p, format="WEBP", quality=90))
+
+    # 작은 그레이스케일+알파 PNG
+    small = Image.new("LA", (128, 128), (0, 0))
+    _shapes(small, rnd, 8)
+    save("small_la.png", lambda p: small.save(p, format="PNG"))
+    return files
+
+
+# ----------------------------------------------------------------------
+# 워커: (경로, 이미지) 1건을 새 프로세스에서 측정
+# ----------------------------------------------------------------------
+def _rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 bytes, Linux는 KB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _load_path(path_name: str, sizes: List[int], formats: List[str]) -> Callable[[bytes, str], Dict[str, bytes]]:
+    """변환 경로 → (입력 바이트, 파일명) → {"{fmt}_{size}": 출력 바이트}"""
+    if path_name == "convert_image":
+        from crawler import LogoCrawler
+        crawler = LogoCrawler(minio_client=object(), existing_api=object(), quota=object())
+
+        def run(data: bytes, name: str) -> Dict[str, bytes]:
+            return {k: v for k, v in crawler.convert_image(data, name).items() if k != "original"}
+        return run
+
+    # api_server 임포트 시 생성되는 저장소/큐/진행상황 파일은 임시 디렉터리로
+    import api_server
+
+    if path_name == "convert_svg_to_png":
+        def run(data: bytes, name: str) -> Dict[str, bytes]:
+            return {f"png_{size}": api_server.convert_svg_to_png(data, size) for size in sizes}
+        return run
+
+    def run(data: bytes, name: str) -> Dict[str, bytes]:
+        return {
+            f"{fmt.lower()}_{size}": api_server.process_uploaded_image(data, target_size=size, target_format=fmt.upper())
+            for size in sizes for fmt in formats
+        }
+    return run
+
+
+def run_worker(args) -> Dict:
+    image = Path(args.image)
+    data = image.read_bytes()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    formats = args.formats.split(",")
+
+    started = time.perf_counter()
+    convert = _load_path(args.worker, sizes, formats)
+    import_s = time.perf_counter() - started
+    baseline_kb = _rss_kb()
+
+    # 1회차(콜드): 최대 RSS 측정
+    started = time.perf_counter()
+    outputs = convert(data, image.stem)
+    cold_ms = (time.perf_counter() - started) * 1000
+    peak_kb = _rss_kb()
+
+    timings = []
+    for _ in range(args.repeats):
+        started = time.perf_counter()
+        convert(data, image.stem)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "input_bytes": len(data),
+        "import_s": round(import_s, 3),
+        "cold_ms": round(cold_ms, 3),
+        "time_ms": {
+            "median": round(statistics.median(timings), 3) if timings else None,
+            "min": round(min(timings), 3) if timings else None,
+            "mean": round(statistics.mean(timings), 3) if timings else None,
+        },
+        "baseline_rss_kb": baseline_kb,
+        "peak_rss_kb": peak_kb,
+        "conversion_rss_kb": peak_kb - baseline_kb,
+        "outputs": {key: (len(value) if value else None) for key, value in sorted(outputs.items())},
+    }
+
+
+# ----------------------------------------------------------------------
+# 드라이버
+# ----------------------------------------------------------------------
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=str(ROOT), capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def applicable(path_name: str, image: Path) -> bool:
+    is_svg = image.suffix.lower() in SVG_SUFFIXES
+    if path_name == "convert_svg_to_png":
+        return is_svg
+    if path_name == "process_uploaded_image":
+        # PIL로 열 수 있는 래스터만 (업로드 경로는 SVG를 처리하지 않음)
+        return not is_svg
+    return True
+
+
+def measure(path_name: str, image: Path, args, workdir: Path) -> Dict:
+    result_file = workdir / f"{path_name}_{image.name}.json"
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": str(ROOT) + os.pathsep + env.get("PYTHONPATH", ""),
+        "STORAGE_BACKEND": "filesystem",
+        "STORAGE_ROOT": str(workdir / "storage"),
+        "PROGRESS_DIR": str(workdir / "progress"),
+        "JOB_QUEUE_PATH": str(workdir / "progress" / "jobs.sqlite3"),
+        "CRAWL_WORKERS": "0",
+        "IMAGE_SIZES": args.sizes,
+    })
+    proc = subprocess.run(
+        [sys.executable, __file__, "--worker", path_name, "--image", str(image), "--repeats", str(args.repeats),
+         "--sizes", args.sizes, "--formats", args.formats, "--result-file", str(result_file)],
+        cwd=str(ROOT), env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0 or not result_file.exists():
+        error = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+        return {"ok": False, "error": error}
+    result = json.loads(result_file.read_text(encoding="utf-8"))
+    result["ok"] = True
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이미지 변환 벤치마크")
+    parser.add_argument("--corpus", default=str(CORPUS_DIR), help="입력 이미지 디렉터리")
+    parser.add_argument("--make-corpus", action="store_true", help="코퍼스를 다시 생성하고 종료")
+    parser.add_argument("--paths", nargs="+", default=list(PATHS), choices=list(PATHS))
+    parser.add_argument("--repeats", type=int, default=5, help="이미지당 반복 측정 횟수 (콜드 1회 제외)")
+    parser.add_argument("--sizes", default=os.getenv('IMAGE_SIZES', '240,300'), help="출력 크기 (쉼표 구분)")
+    parser.add_argument("--formats", default="png,webp", help="process_uploaded_image 출력 포맷 (쉼표 구분)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (미지정 시 표준출력)")
+    # 내부용 (워커 프로세스)
+    parser.add_argument("--worker", choices=list(PATHS), help=argparse.SUPPRESS)
+    parser.add_argument("--image", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(args)
+        Path(args.result_file).write_text(json.dumps(result), encoding="utf-8")
+        return
+
+    corpus = Path(args.corpus)
+    if args.make_corpus:
+        files = make_corpus(corpus)
+        print(f"✅ 코퍼스 생성: {corpus} ({len(files)}개)")
+        return
+    if not corpus.is_dir() and corpus == CORPUS_DIR:
+        files = make_corpus(corpus)
+        print(f"✅ 코퍼스 생성: {corpus} ({len(files)}개)")
+    images = sorted(p for p in corpus.iterdir() if p.is_file()) if corpus.is_dir() else []
+    if not images:
+        print(f"❌ 코퍼스가 비어 있습니다: {corpus}")
+        sys.exit(1)
+
+    results: Dict[str, Dict[str, Dict]] = {}
+    with tempfile.TemporaryDirectory(prefix="bench_convert_") as tmp:
+        for path_name in args.paths:
+            results[path_name] = {}
+            for image in images:
+                if not applicable(path_name, image):
+                    continue
+                result = measure(path_name, image, args, Path(tmp))
+                results[path_name][image.name] = result
+                if result["ok"]:
+                    print(
+                        f"📊 {path_name} / {image.name}: {result['time_ms']['median']}ms "
+                        f"(콜드 {result['cold_ms']}ms), RSS +{result['conversion_rss_kb']}KB, 출력 {result['outputs']}"
+                    )
+                else:
+                    print(f"❌ {path_name} / {image.name}: {result['error']}")
+
+    report = {
+        "benchmark": "convert",
+        "measured_at": datetime.now().isoformat(),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "config": {"repeats": args.repeats, "sizes": args.sizes, "formats": args.formats, "corpus": str(corpus)},
+        "corpus": {p.name: p.stat().st_size for p in images},
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"✅ 결과 저장: {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+크롤링 처리량 벤치마크 (오프라인)
+- 로컬 웹사이트/logo.dev 대역(scripts/fake_website.py, 로고 마크업 변형 + 지연 주입)과
+  기존 API 대역(scripts/fake_upstream.py), 파일시스템 저장소로 LogoCrawler.crawl_batch를 실행
+- 크롤링 트레이스로 분당 티커 수, 브라우저 시간(시도 span), 구간별 시간, 결과/실패 유형을 JSON으로 기록
+
+사용법: python scripts/bench_crawl.py --tickers 50 --concurrency 4 --page-delay-ms 200 --output crawl.json
+        (playwright와 chromium이 설치되어 있어야 함: playwright install chromium)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from fake_upstream import FakeUpstream
+from fake_website import VARIANTS, FakeWebsite, parse_mix
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=str(ROOT), capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def configure_env(workdir: Path, site: FakeWebsite, upstream: FakeUpstream):
+    """crawler 임포트 전에 대역 주소/임시 경로 설정"""
+    sys.path.insert(0, str(ROOT))
+    os.environ.update({
+        "WEBSITE_BASE_URL": site.base_url,
+        "LOGO_DEV_BASE_URL": site.logo_dev_base_url,
+        "LOGO_DEV_TOKEN": os.environ.get("LOGO_DEV_TOKEN") or "bench-token",
+        "EXISTING_API_BASE": upstream.base_url,
+        "STORAGE_BACKEND": "filesystem",
+        "STORAGE_ROOT": str(workdir / "storage"),
+        "PROGRESS_DIR": str(workdir / "progress"),
+        "CRAWL_TRACE_ENABLED": "true",
+        "CRAWL_TRACE_INDEX_PATH": str(workdir / "progress" / "traces.sqlite3"),
+    })
+
+
+def load_traces(progress_dir: Path, job_ids: List[str]) -> List[Dict]:
+    traces = []
+    for job_id in job_ids:
+        path = progress_dir / f"{job_id}.traces.jsonl"
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            traces.extend(json.loads(line) for line in f if line.strip())
+    return traces
+
+
+def summarize(traces: List[Dict], variants: Dict[str, str]) -> Dict:
+    """트레이스 → 결과/실패 유형/변형별 집계"""
+    outcomes: Dict[str, int] = {}
+    failure_classes: Dict[str, int] = {}
+    by_variant: Dict[str, Dict] = {}
+    browser_ms: List[float] = []
+    for trace in traces:
+        outcome = trace.get("outcome") or "unknown"
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        spans = trace.get("spans", [])
+        attempts = [s for s in spans if s["name"] == "attempt" and (s.get("attrs") or {}).get("source") == "website"]
+        browser_ms.append(sum(s.get("duration_ms") or 0 for s in attempts))
+
+        variant = variants.get((trace.get("attrs") or {}).get("ticker"), "unknown")
+        entry = by_variant.setdefault(variant, {"count": 0, "outcomes": {}, "durations": []})
+        entry["count"] += 1
+        entry["outcomes"][outcome] = entry["outcomes"].get(outcome, 0) + 1
+        entry["durations"].append(trace.get("duration_ms") or 0)
+
+        if outcome != "success":
+            # 실패 유형: 최종 결과 + 마지막 웹사이트 시도 결과 + logo.dev 다운로드 결과
+            last_attempt = attempts[-1]["outcome"] if attempts else "no_attempt"
+            logo_dev = [s for s in spans if s["name"] == "download" and (s.get("attrs") or {}).get("function") == "crawl_logo_dev"]
+            fallback = logo_dev[-1]["outcome"] if logo_dev else "no_fallback"
+            key = f"{outcome}/{last_attempt}/{fallback}"
+            failure_classes[key] = failure_classes.get(key, 0) + 1
+
+    for entry in by_variant.values():
+        durations = sorted(entry.pop("durations"))
+        entry["p50_ms"] = durations[len(durations) // 2] if durations else None
+        entry["max_ms"] = durations[-1] if durations else None
+    return {
+        "outcomes": outcomes,
+        "failure_classes": dict(sorted(failure_classes.items(), key=lambda kv: kv[1], reverse=True)),
+        "browser_ms": {
+            "total": round(sum(browser_ms), 2),
+            "mean_per_ticker": round(statistics.mean(browser_ms), 2) if browser_ms else None,
+        },
+        "by_variant": dict(sorted(by_variant.items())),
+    }
+
+
+async def benchmark(args) -> Dict:
+    site = FakeWebsite(args.page_delay_ms, args.image_delay_ms, args.logo_dev_delay_ms, args.jitter_ms,
+                       args.logo_dev_missing_rate).start()
+    upstream = FakeUpstream(args.upstream_latency_ms).start()
+    seeded = upstream.seed_logos(args.tickers, sizes=())
+    master = {row["infomax_code"]: row for row in upstream.tables["logo_master"]}
+    tickers = [
+        {
+            "infomax_code": logo["infomax_code"],
+            "ticker": master[logo["infomax_code"]]["crawling_ticker"],
+            "api_domain": master[logo["infomax_code"]]["api_domain"],
+        }
+        for logo in seeded
+    ]
+    variants = site.assign([t["ticker"] for t in tickers], parse_mix(args.mix), seed=args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="bench_crawl_") as tmp:
+        workdir = Path(tmp)
+        configure_env(workdir, site, upstream)
+        from crawler import LogoCrawler
+
+        # concurrency개의 crawl_batch를 동시에 실행 (워커 여러 개와 같은 부하)
+        run_id = f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        chunks = [tickers[i::args.concurrency] for i in range(args.concurrency)]
+        job_ids = [f"{run_id}_{i}" for i in range(len(chunks))]
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(
+                LogoCrawler().crawl_batch(chunk, job_id=job_id)
+                for chunk, job_id in zip(chunks, job_ids) if chunk
+            ))
+        finally:
+            elapsed = time.perf_counter() - started
+            site.stop()
+            upstream.stop()
+
+        from tracing import get_trace_store
+        store = get_trace_store()
+        stages: Dict[str, Dict] = {}
+        for job_id in job_ids:
+            for name, stat in store.span_stats(job_id).items():
+                merged = stages.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                merged["count"] += stat["count"]
+                merged["total_ms"] = round(merged["total_ms"] + stat["total_ms"], 2)
+                merged["max_ms"] = max(merged["max_ms"], stat["max_ms"])
+        traces = load_traces(workdir / "progress", job_ids)
+
+    summary = summarize(traces, variants)
+    success = summary["outcomes"].get("success", 0)
+    report = {
+        "benchmark": "crawl",
+        "measured_at": datetime.now().isoformat(),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "config": {
+            "tickers": args.tickers,
+            "concurrency": args.concurrency,
+            "mix": parse_mix(args.mix),
+            "page_delay_ms": args.page_delay_ms,
+            "image_delay_ms": args.image_delay_ms,
+            "logo_dev_delay_ms": args.logo_dev_delay_ms,
+            "jitter_ms": args.jitter_ms,
+            "logo_dev_missing_rate": args.logo_dev_missing_rate,
+            "upstream_latency_ms": args.upstream_latency_ms,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "tickers_per_minute": round(len(traces) / elapsed * 60, 2) if elapsed else None,
+        "success_per_minute": round(success / elapsed * 60, 2) if elapsed else None,
+        "stages": dict(sorted(stages.items(), key=lambda kv: kv[1]["total_ms"], reverse=True)),
+        "site_requests": site.calls,
+        "upstream_calls": upstream.calls,
+        **summary,
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤링 처리량 벤치마크 (로컬 대역)")
+    parser.add_argument("--tickers", type=int, default=30, help="크롤링할 티커 수")
+    parser.add_argument("--concurrency", type=int, default=1, help="동시에 실행할 crawl_batch 수")
+    parser.add_argument("--mix", default=None, help=f"로고 변형 가중치 (가능: {', '.join(VARIANTS)}, 예: img_svg=60,flag=10,missing=30)")
+    parser.add_argument("--page-delay-ms", type=float, default=200.0, help="종목 페이지 응답 지연(ms)")
+    parser.add_argument("--image-delay-ms", type=float, default=50.0, help="로고 이미지 응답 지연(ms)")
+    parser.add_argument("--logo-dev-delay-ms", type=float, default=100.0, help="logo.dev 응답 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지연 편차(ms)")
+    parser.add_argument("--logo-dev-missing-rate", type=float, default=0.2, help="logo.dev가 404를 주는 도메인 비율")
+    parser.add_argument("--upstream-latency-ms", type=float, default=5.0, help="기존 API 대역 응답 지연(ms)")
+    parser.add_argument("--seed", type=int, default=0, help="변형 배정 시드")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (미지정 시 표준출력)")
+    args = parser.parse_args()
+    args.concurrency = max(1, args.concurrency)
+
+    report = asyncio.run(benchmark(args))
+    print(
+        f"📊 {report['tickers_per_minute']} 티커/분 (성공 {report['success_per_minute']}/분), "
+        f"결과 {report['outcomes']}, 브라우저 시간 {report['browser_ms']['total']}ms"
+    )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"✅ 결과 저장: {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
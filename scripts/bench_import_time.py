@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+임포트 시간 벤치마크
+- `python -X importtime`으로 모듈 임포트 비용을 측정
+- 여러 번 실행한 중앙값과 누적 비용 상위 모듈을 JSON으로 기록
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure_once(module: str) -> Dict:
+    """새 인터프리터에서 모듈을 1회 임포트하고 importtime 출력을 파싱"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        # 형식: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            _, rest = line.split(":", 1)
+            self_us, cumulative_us, name = rest.split("|", 2)
+            imports.append({
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            })
+        except ValueError:
+            continue
+
+    top_level = [i for i in imports if i["module"] == module]
+    return {
+        "ok": proc.returncode == 0,
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode != 0 and proc.stderr.strip() else None,
+        "wall_s": wall,
+        "import_us": top_level[-1]["cumulative_us"] if top_level else None,
+        "imports": imports,
+    }
+
+
+def benchmark(module: str, runs: int, top: int) -> Dict:
+    """모듈 임포트를 runs회 측정"""
+    samples = [measure_once(module) for _ in range(runs)]
+    ok_samples = [s for s in samples if s["ok"]]
+    result = {
+        "module": module,
+        "runs": runs,
+        "ok_runs": len(ok_samples),
+        "errors": sorted({s["error"] for s in samples if s["error"]}),
+    }
+    if not ok_samples:
+        return result
+
+    import_us = [s["import_us"] for s in ok_samples if s["import_us"] is not None]
+    result.update({
+        "wall_s_median": statistics.median(s["wall_s"] for s in ok_samples),
+        "import_ms_median": statistics.median(import_us) / 1000 if import_us else None,
+        "import_ms_min": min(import_us) / 1000 if import_us else None,
+    })
+
+    # 마지막 실행 기준 최상위(서드파티 포함) 임포트 누적 비용 상위 N개
+    last = ok_samples[-1]["imports"]
+    direct = [i for i in last if i["depth"] <= 1 and i["module"] != module]
+    direct.sort(key=lambda i: i["cumulative_us"], reverse=True)
+    result["top_imports"] = [
+        {"module": i["module"], "cumulative_ms": i["cumulative_us"] / 1000}
+        for i in direct[:top]
+    ]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모듈 임포트 시간 벤치마크")
+    parser.add_argument("modules", nargs="*", default=["api_server", "crawler"], help="측정할 모듈 (기본: api_server crawler)")
+    parser.add_argument("--runs", type=int, default=5, help="모듈별 반복 횟수 (기본: 5)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 상위 임포트 수 (기본: 15)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "results": [benchmark(m, args.runs, args.top) for m in args.modules],
+    }
+
+    for r in report["results"]:
+        if not r["ok_runs"]:
+            print(f"❌ {r['module']}: 임포트 실패 - {r['errors']}")
+            continue
+        print(f"📦 {r['module']}: 중앙값 {r['import_ms_median']:.1f}ms (최소 {r['import_ms_min']:.1f}ms, {r['ok_runs']}/{r['runs']}회)")
+        for i in r["top_imports"][:5]:
+            print(f"   - {i['module']}: {i['cumulative_ms']:.1f}ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
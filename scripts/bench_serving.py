@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+로고 조회 경로 벤치마크
+- 기존 API 대역(scripts/fake_upstream.py, 지연 주입)과 파일시스템 저장소(STORAGE_BACKEND=filesystem)로
+  api_server를 별도 프로세스(uvicorn)로 띄우고
+- get_logo / get_logo_by_criteria / search_logos 를 고정 동시성으로 호출해
+  엔드포인트별 p50/p95/p99 지연과 req/s를 JSON으로 기록
+- 지연 통계는 2xx 응답만 대상 (오류 응답은 error_latency_ms로 따로), 오류 비율이 --max-error-ratio를 넘으면 종료 코드 1
+- get_logo는 logo_files 1페이지(100행)만 읽으므로, 시드 행이 그 안에 드는 로고만 요청
+
+사용법: python scripts/bench_serving.py --logos 200 --concurrency 16 --requests 2000 --upstream-latency-ms 5 --output serving.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from fake_upstream import FakeUpstream
+
+ROOT = Path(__file__).resolve().parent.parent
+BUCKET = "logos"
+
+ENDPOINTS = {
+    "get_logo": lambda code, rnd: f"/api/v1/logos/{code}?format={rnd.choice(['png', 'webp'])}&size={rnd.choice([240, 300])}",
+    "get_logo_by_criteria": lambda code, rnd: f"/api/v1/logo-info?infomax_code={code}&format=png&size=300",
+    "search_logos": lambda code, rnd: "/api/v1/logos/search?has_logo=true&limit=100",
+}
+
+
+# get_logo가 읽는 logo_files 행 수 (page=1, size=100)
+GET_LOGO_PAGE_ROWS = 100
+
+
+def servable_codes(seeded: List[Dict], rows: int = GET_LOGO_PAGE_ROWS) -> List[str]:
+    """시드 순서상 logo_files 행이 앞쪽 rows개 안에 드는 로고 (get_logo가 찾을 수 있는 로고)"""
+    codes, used = [], 0
+    for logo in seeded:
+        used += len(logo["object_keys"])
+        if used > rows:
+            break
+        codes.append(logo["infomax_code"])
+    return codes
+
+
+def latency_summary(latencies: List[float]) -> Dict:
+    return {
+        "mean": round(statistics.mean(latencies), 3) if latencies else None,
+        "p50": round(percentile(latencies, 50), 3) if latencies else None,
+        "p95": round(percentile(latencies, 95), 3) if latencies else None,
+        "p99": round(percentile(latencies, 99), 3) if latencies else None,
+        "max": round(max(latencies), 3) if latencies else None,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=str(ROOT), capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def seed_storage(root: Path, seeded: List[Dict], object_bytes: int):
+    """시드한 logo_files 행에 대응하는 객체 파일 생성 (내용은 임의 바이트)"""
+    bucket_dir = root / BUCKET
+    bucket_dir.mkdir(parents=True, exist_ok=True)
+    rnd = random.Random(0)
+    for logo in seeded:
+        for key in logo["object_keys"]:
+            (bucket_dir / key).write_bytes(rnd.randbytes(object_bytes))
+
+
+def start_server(port: int, upstream_url: str, workdir: Path, log_file) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": str(ROOT) + os.pathsep + env.get("PYTHONPATH", ""),
+        "EXISTING_API_BASE": upstream_url,
+        "STORAGE_BACKEND": "filesystem",
+        "STORAGE_ROOT": str(workdir / "storage"),
+        "MINIO_BUCKET": BUCKET,
+        "PROGRESS_DIR": str(workdir / "progress"),
+        "JOB_QUEUE_PATH": str(workdir / "progress" / "jobs.sqlite3"),
+        "CRAWL_WORKERS": "0",
+        "CRAWL_TRACE_ENABLED": "false",
+        "MINIO_INVENTORY_REFRESH_INTERVAL": "0",
+        "MINIO_INVENTORY_PATH": str(workdir / "inventory.json.gz"),
+    })
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api_server:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=str(ROOT), env=env, stdout=log_file, stderr=subprocess.STDOUT,
+    )
+
+
+async def wait_ready(session, base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(f"{base_url}/api/v1/test") as response:
+                if response.status == 200:
+                    return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("api_server가 제한 시간 내에 기동되지 않았습니다")
+
+
+async def run_load(session, base_url: str, endpoint: str, codes: List[str], total: int, concurrency: int, seed: int) -> Dict:
+    """total건을 concurrency개 동시 요청으로 실행"""
+    rnd = random.Random(seed)
+    paths = [ENDPOINTS[endpoint](rnd.choice(codes), rnd) for _ in range(total)]
+    latencies: List[float] = []
+    error_latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    index = 0
+
+    async def worker():
+        nonlocal index, errors
+        while index < len(paths):
+            path = paths[index]
+            index += 1
+            started = time.perf_counter()
+            ok = False
+            try:
+                async with session.get(base_url + path) as response:
+                    await response.read()
+                    statuses[str(response.status)] = statuses.get(str(response.status), 0) + 1
+                    ok = response.status < 400
+            except Exception:
+                statuses["exception"] = statuses.get("exception", 0) + 1
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if ok:
+                latencies.append(elapsed_ms)
+            else:
+                errors += 1
+                error_latencies.append(elapsed_ms)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    requests = len(latencies) + len(error_latencies)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_ratio": round(errors / requests, 4) if requests else None,
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(requests / elapsed, 2) if elapsed else None,
+        "latency_ms": latency_summary(latencies),
+        "error_latency_ms": latency_summary(error_latencies),
+    }
+
+
+async def benchmark(args) -> Dict:
+    import aiohttp
+
+    upstream = FakeUpstream(args.upstream_latency_ms, args.upstream_jitter_ms).start()
+    seeded = upstream.seed_logos(args.logos)
+    codes = [logo["infomax_code"] for logo in seeded]
+    logo_codes = servable_codes(seeded)
+    if len(logo_codes) < len(codes):
+        print(f"ℹ️ get_logo는 logo_files 첫 {GET_LOGO_PAGE_ROWS}행만 읽으므로 로고 {len(logo_codes)}/{len(codes)}개만 요청")
+
+    with tempfile.TemporaryDirectory(prefix="bench_serving_") as tmp:
+        workdir = Path(tmp)
+        seed_storage(workdir / "storage", seeded, args.object_bytes)
+        port = args.port or free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        log_path = Path(args.server_log) if args.server_log else workdir / "server.log"
+        with open(log_path, "w") as log_file:
+            server = start_server(port, upstream.base_url, workdir, log_file)
+            try:
+                connector = aiohttp.TCPConnector(limit=args.concurrency)
+                timeout = aiohttp.ClientTimeout(total=60)
+                async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                    await wait_ready(session, base_url)
+                    results = {}
+                    for endpoint in args.endpoints:
+                        endpoint_codes = logo_codes if endpoint == "get_logo" else codes
+                        if args.warmup:
+                            await run_load(session, base_url, endpoint, endpoint_codes, args.warmup, args.concurrency, seed=1)
+                        calls_before = sum(upstream.calls.values())
+                        result = await run_load(session, base_url, endpoint, endpoint_codes, args.requests, args.concurrency, seed=2)
+                        result["upstream_calls_per_request"] = round(
+                            (sum(upstream.calls.values()) - calls_before) / max(1, result["requests"]), 3
+                        )
+                        results[endpoint] = result
+                        print(
+                            f"📊 {endpoint}: {result['rps']} req/s, p50 {result['latency_ms']['p50']}ms, "
+                            f"p95 {result['latency_ms']['p95']}ms, p99 {result['latency_ms']['p99']}ms, 오류 {result['errors']} ({result['error_ratio']})"
+                        )
+            finally:
+                server.terminate()
+                try:
+                    server.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+                upstream.stop()
+
+    return {
+        "benchmark": "serving",
+        "measured_at": datetime.now().isoformat(),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "config": {
+            "logos": args.logos,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "upstream_latency_ms": args.upstream_latency_ms,
+            "upstream_jitter_ms": args.upstream_jitter_ms,
+            "object_bytes": args.object_bytes,
+            "get_logo_logos": len(logo_codes),
+            "max_error_ratio": args.max_error_ratio,
+            "storage_backend": "filesystem",
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로고 조회 경로 벤치마크")
+    parser.add_argument("--logos", type=int, default=200, help="시드할 로고 수")
+    parser.add_argument("--requests", type=int, default=1000, help="엔드포인트별 측정 요청 수")
+    parser.add_argument("--warmup", type=int, default=50, help="엔드포인트별 워밍업 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 요청 수")
+    parser.add_argument("--upstream-latency-ms", type=float, default=5.0, help="기존 API 대역 응답 지연(ms)")
+    parser.add_argument("--upstream-jitter-ms", type=float, default=1.0, help="기존 API 대역 지연 편차(ms)")
+    parser.add_argument("--object-bytes", type=int, default=8192, help="시드 객체 크기(bytes)")
+    parser.add_argument("--endpoints", nargs="+", default=list(ENDPOINTS), choices=list(ENDPOINTS))
+    parser.add_argument("--max-error-ratio", type=float, default=0.05, help="엔드포인트별 허용 오류(비 2xx) 비율 - 넘으면 종료 코드 1")
+    parser.add_argument("--port", type=int, default=0, help="api_server 포트 (기본: 빈 포트)")
+    parser.add_argument("--server-log", default=None, help="api_server 출력 저장 경로")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (미지정 시 표준출력)")
+    args = parser.parse_args()
+
+    report = asyncio.run(benchmark(args))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"✅ 결과 저장: {args.output}")
+    else:
+        print(text)
+
+    failed = {
+        endpoint: result["error_ratio"] for endpoint, result in report["results"].items()
+        if result["error_ratio"] is None or result["error_ratio"] > args.max_error_ratio
+    }
+    if failed:
+        print(f"❌ 오류 비율 초과 (허용 {args.max_error_ratio}): {failed} - 지연 수치가 오류 경로를 측정한 것일 수 있음", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+기존 API 대역(fake) 서버
+- /api/schemas/{schema}/tables/{table}/query|upsert 를 메모리 테이블로 흉내냄
+- 응답마다 지연(latency_ms ± jitter_ms)을 주입해 업스트림 왕복 비용을 재현
+- 벤치마크 스크립트에서 임포트해 사용하거나 단독 실행 가능
+
+사용법: python scripts/fake_upstream.py --port 18004 --latency-ms 5 --seed 100
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlparse
+
+# 테이블별 자동 증가 키
+ID_COLUMNS = {"logos": "logo_id", "logo_files": "file_id", "ext_api_quota": "id"}
+PAGING_PARAMS = {"page", "size", "limit", "search", "search_column"}
+
+
+def _matches(row: Dict, column: str, expected: str) -> bool:
+    value = row.get(column)
+    if isinstance(value, bool) or value is None:
+        return str(value).lower() == expected.lower()
+    return str(value) == expected
+
+
+class FakeUpstream:
+    """메모리 테이블 기반 기존 API 대역"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tables: Dict[str, List[Dict]] = {}
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeUpstream":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-upstream", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ------------------------------------------------------------------
+    # 테이블 조작
+    # ------------------------------------------------------------------
+    def query(self, table: str, params: Dict[str, str]) -> Dict:
+        with self._lock:
+            rows = list(self.tables.get(table, []))
+        search = params.get("search")
+        search_column = params.get("search_column")
+        if search and search_column:
+            rows = [r for r in rows if search.lower() in str(r.get(search_column, "")).lower()]
+        for column, expected in params.items():
+            if column not in PAGING_PARAMS:
+                rows = [r for r in rows if _matches(r, column, expected)]
+
+        total = len(rows)
+        if "limit" in params and "page" not in params:
+            size, page = int(params["limit"]), 1
+        else:
+            size = int(params.get("size") or params.get("limit") or 100)
+            page = max(1, int(params.get("page") or 1))
+        start = (page - 1) * size
+        return {
+            "data": rows[start:start + size],
+            "total": total,
+            "page": page,
+            "size": size,
+            "total_pages": max(1, math.ceil(total / size)) if size else 1,
+        }
+
+    def upsert(self, table: str, body: Dict):
+        data = body.get("data")
+        conflict_columns = body.get("conflict_columns") or []
+        rows = data if isinstance(data, list) else [data]
+        saved = [self._upsert_row(table, dict(row), conflict_columns) for row in rows]
+        return {"data": saved if isinstance(data, list) else saved[0]}
+
+    def _upsert_row(self, table: str, row: Dict, conflict_columns: List[str]) -> Dict:
+        with self._lock:
+            rows = self.tables.setdefault(table, [])
+            for existing in rows:
+                if conflict_columns and all(existing.get(c) == row.get(c) for c in conflict_columns):
+                    existing.update(row)
+                    return dict(existing)
+            id_column = ID_COLUMNS.get(table)
+            if id_column and row.get(id_column) is None:
+                row[id_column] = len(rows) + 1
+            rows.append(row)
+            return dict(row)
+
+    def seed_logos(self, count: int, sizes=(240, 256, 300), formats=("png", "webp"), exchange: str = "NAS") -> List[Dict]:
+        """로고 count개의 master/logos/logo_files 행 생성 - 반환: [{"infomax_code", "logo_hash", "object_keys"}]"""
+        seeded = []
+        for i in range(count):
+            infomax_code = f"{exchange}:T{i:05d}"
+            logo_hash = hashlib.md5(f"bench_{infomax_code}".encode()).hexdigest()
+            self._upsert_row("logo_master", {
+                "infomax_code": infomax_code,
+                "terminal_code": f"T{i:05d}",
+                "english_name": f"Bench Corp {i}",
+                "fs_regional_id": f"R{i:05d}-R",
+                "fs_entity_id": 100000 + i,
+                "fs_exchange": exchange,
+                "country": "US",
+                "is_active": True,
+                "crawling_ticker": f"{exchange}-T{i:05d}",
+                "api_domain": f"bench{i}.example.com",
+                "logo_hash": logo_hash,
+            }, ["infomax_code"])
+            logo = self._upsert_row("logos", {"logo_hash": logo_hash, "is_deleted": False}, ["logo_hash"])
+            keys = []
+            for size in sizes:
+                for fmt in formats:
+                    key = f"{logo_hash}_{size}.{fmt}"
+                    self._upsert_row("logo_files", {
+                        "logo_id": logo["logo_id"],
+                        "file_format": fmt,
+                        "data_source": "website",
+                        "upload_type": "crawled",
+                        "dimension_width": size,
+                        "dimension_height": size,
+                        "quality": None,
+                        "file_size": None,
+                        "minio_object_key": key,
+                        "is_original": False,
+                    }, ["minio_object_key"])
+                    keys.append(key)
+            seeded.append({"infomax_code": infomax_code, "logo_hash": logo_hash, "object_keys": keys})
+        return seeded
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    def _delay(self):
+        delay = self.latency_ms + (random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _count(self, key: str):
+        with self._lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+
+    def _handler_class(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _route(self):
+                parsed = urlparse(self.path)
+                parts = parsed.path.strip("/").split("/")
+                # api/schemas/{schema}/tables/{table}/{op}
+                if len(parts) == 6 and parts[:2] == ["api", "schemas"] and parts[3] == "tables":
+                    return parts[4], parts[5], dict(parse_qsl(parsed.query))
+                return None, parsed.path, {}
+
+            def _send(self, status: int, payload):
+                body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                table, op, params = self._route()
+                if table is None:
+                    self._send(200 if op == "/health" else 404, {"status": "ok"} if op == "/health" else {"detail": "Not found"})
+                    return
+                upstream._delay()
+                upstream._count(f"{table}:{op}")
+                if op != "query":
+                    self._send(404, {"detail": "Not found"})
+                    return
+                self._send(200, upstream.query(table, params))
+
+            def do_POST(self):
+                table, op, _ = self._route()
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                upstream._delay()
+                upstream._count(f"{table}:{op}")
+                if table is None or op != "upsert":
+                    self._send(404, {"detail": "Not found"})
+                    return
+                self._send(200, upstream.upsert(table, body))
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기존 API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18004)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답마다 주입할 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지연 편차(ms, 균등분포)")
+    parser.add_argument("--seed", type=int, default=0, help="미리 만들 로고 수")
+    args = parser.parse_args()
+
+    upstream = FakeUpstream(args.latency_ms, args.jitter_ms, args.host, args.port)
+    if args.seed:
+        upstream.seed_logos(args.seed)
+    print(f"🧪 기존 API 대역 실행: {upstream.base_url} (지연 {args.latency_ms}ms ± {args.jitter_ms}ms)")
+    upstream.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        upstream.stop()
+
+
+if __name__ == "__main__":
+    main()
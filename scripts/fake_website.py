@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+로고 웹사이트 / logo.dev 대역(fake) 서버
+- /symbols/{ticker}/news : 실제 사이트와 같은 헤더 구조(첫 번째 XPath 셀렉터 위치)에 종목별 로고 마크업 변형을 렌더링
+- /logos/{ticker}.svg|png, /country/{code}.svg : 페이지가 참조하는 이미지
+- /logo-dev/{api_domain} : logo.dev 이미지 엔드포인트 (LOGO_DEV_BASE_URL={base_url}/logo-dev)
+- 페이지/이미지 응답마다 지연(± 편차)을 주입
+
+로고 마크업 변형
+- img_svg    : 로고 <img src=".../logos/{ticker}.svg">
+- img_png    : 로고 <img src=".../logos/{ticker}.png">
+- flag       : 로고 자리에 국기 이미지(country/*.svg) → logo.dev 폴백
+- inline_svg : <img> 없이 인라인 <svg>만 있음
+- broken_img : 로고 <img>가 404
+- missing    : 로고 없음
+
+사용법: python scripts/fake_website.py --port 18010 --page-delay-ms 200 --seed 100
+"""
+
+import argparse
+import hashlib
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+VARIANTS = ("img_svg", "img_png", "flag", "inline_svg", "broken_img", "missing")
+DEFAULT_MIX = {"img_svg": 55, "img_png": 15, "flag": 10, "inline_svg": 5, "broken_img": 5, "missing": 10}
+
+LOGO_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100" width="100" height="100">'
+    '<circle cx="50" cy="50" r="45" fill="#{color}"/><rect x="30" y="30" width="40" height="40" rx="6" fill="#ffffff"/>'
+    '</svg>'
+)
+FLAG_SVG = '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 3 2"><rect width="3" height="2" fill="#b22234"/></svg>'
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{ticker} news</title></head>
+<body>
+<div id="overlap-manager-root"></div>
+<div class="tv-main"><main>
+<div class="tv-header"><a href="/">home</a></div>
+<div id="js-category-content"><div class="js-symbol-page-header-root"><div>
+<div class="symbolRow-NopKb87z"><div><div class="container-F4HZNWkx logo-iJMmXWiA">{logo}</div></div>
+<h1 class="title">{ticker}</h1></div>
+</div></div>
+<div class="news">{news}</div>
+</div>
+</main></div>
+</body></html>"""
+
+
+def solid_png(size: int = 64, rgba=(31, 111, 235, 255)) -> bytes:
+    """Pillow 없이 단색 RGBA PNG 생성"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+    row = b"\x00" + bytes(rgba) * size
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * size, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def parse_mix(text: Optional[str]) -> Dict[str, int]:
+    """"img_svg=60,flag=10" → {"img_svg": 60, "flag": 10}"""
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in VARIANTS:
+            raise ValueError(f"알 수 없는 로고 변형: {name} (가능: {', '.join(VARIANTS)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+class FakeWebsite:
+    """종목 페이지 + logo.dev 대역"""
+
+    def __init__(self, page_delay_ms: float = 0.0, image_delay_ms: float = 0.0, logo_dev_delay_ms: float = 0.0,
+                 jitter_ms: float = 0.0, logo_dev_missing_rate: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.page_delay_ms = page_delay_ms
+        self.image_delay_ms = image_delay_ms
+        self.logo_dev_delay_ms = logo_dev_delay_ms
+        self.jitter_ms = jitter_ms
+        self.logo_dev_missing_rate = logo_dev_missing_rate
+        self.variants: Dict[str, str] = {}
+        self.calls: Dict[str, int] = {}
+        self._png = solid_png()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def logo_dev_base_url(self) -> str:
+        return f"{self.base_url}/logo-dev"
+
+    def start(self) -> "FakeWebsite":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-website", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ------------------------------------------------------------------
+    # 종목 배정
+    # ------------------------------------------------------------------
+    def assign(self, tickers: List[str], mix: Dict[str, int], seed: int = 0) -> Dict[str, str]:
+        """티커별 로고 마크업 변형 배정 (가중치 비율대로, 시드 고정)"""
+        rnd = random.Random(seed)
+        names = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in names]
+        for ticker in tickers:
+            self.variants[ticker] = rnd.choices(names, weights)[0]
+        return dict(self.variants)
+
+    def logo_dev_has(self, api_domain: str) -> bool:
+        bucket = int(hashlib.md5(api_domain.encode()).hexdigest()[:8], 16) / 0xffffffff
+        return bucket >= self.logo_dev_missing_rate
+
+    def render(self, ticker: str) -> str:
+        variant = self.variants.get(ticker, "missing")
+        color = hashlib.md5(ticker.encode()).hexdigest()[:6]
+        logo = {
+            "img_svg": f'<img class="logo-PsAlMQQF xxxlarge-PsAlMQQF" src="/logos/{ticker}.svg" alt="">',
+            "img_png": f'<img class="logo-PsAlMQQF xxxlarge-PsAlMQQF" src="/logos/{ticker}.png" alt="">',
+            "flag": '<img class="logo-PsAlMQQF xxxlarge-PsAlMQQF" src="/country/US.svg" alt="">',
+            "inline_svg": LOGO_SVG.format(color=color),
+            "broken_img": f'<img class="logo-PsAlMQQF xxxlarge-PsAlMQQF" src="/logos/{ticker}.gone.svg" alt="">',
+            "missing": "",
+        }[variant]
+        news = "".join(f"<article><h3>{ticker} headline {i}</h3><p>{'lorem ipsum ' * 20}</p></article>" for i in range(10))
+        return PAGE.format(ticker=ticker, logo=logo, news=news)
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    def _delay(self, base_ms: float):
+        delay = base_ms + (random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _count(self, key: str):
+        with self._lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parts = [unquote(p) for p in urlparse(self.path).path.strip("/").split("/")]
+                # /symbols/{ticker}/news
+                if len(parts) == 3 and parts[0] == "symbols" and parts[2] == "news":
+                    site._count("page")
+                    site._delay(site.page_delay_ms)
+                    self._send(200, site.render(parts[1]).encode("utf-8"), "text/html; charset=utf-8")
+                    return
+                # /logos/{ticker}.svg|png
+                if len(parts) == 2 and parts[0] == "logos":
+                    site._count("image")
+                    site._delay(site.image_delay_ms)
+                    name = parts[1]
+                    if name.endswith(".gone.svg"):
+                        self._send(404, b"not found", "text/plain")
+                    elif name.endswith(".svg"):
+                        color = hashlib.md5(name[:-4].encode()).hexdigest()[:6]
+                        self._send(200, LOGO_SVG.format(color=color).encode("utf-8"), "image/svg+xml")
+                    elif name.endswith(".png"):
+                        self._send(200, site._png, "image/png")
+                    else:
+                        self._send(404, b"not found", "text/plain")
+                    return
+                if len(parts) == 2 and parts[0] == "country":
+                    site._count("flag")
+                    self._send(200, FLAG_SVG.encode("utf-8"), "image/svg+xml")
+                    return
+                # /logo-dev/{api_domain}
+                if len(parts) == 2 and parts[0] == "logo-dev":
+                    site._count("logo_dev")
+                    site._delay(site.logo_dev_delay_ms)
+                    if site.logo_dev_has(parts[1]):
+                        self._send(200, site._png, "image/png")
+                    else:
+                        self._send(404, b"not found", "text/plain")
+                    return
+                site._count("other")
+                self._send(404, b"not found", "text/plain")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로고 웹사이트 / logo.dev 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18010)
+    parser.add_argument("--page-delay-ms", type=float, default=0.0, help="종목 페이지 응답 지연(ms)")
+    parser.add_argument("--image-delay-ms", type=float, default=0.0, help="로고 이미지 응답 지연(ms)")
+    parser.add_argument("--logo-dev-delay-ms", type=float, default=0.0, help="logo.dev 응답 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지연 편차(ms, 균등분포)")
+    parser.add_argument("--logo-dev-missing-rate", type=float, default=0.0, help="logo.dev가 404를 주는 도메인 비율 (0~1)")
+    parser.add_argument("--mix", default=None, help="로고 변형 가중치 (예: img_svg=60,flag=10,missing=30)")
+    parser.add_argument("--seed", type=int, default=0, help="NAS-T00000 형식으로 미리 배정할 티커 수")
+    args = parser.parse_args()
+
+    site = FakeWebsite(args.page_delay_ms, args.image_delay_ms, args.logo_dev_delay_ms, args.jitter_ms,
+                       args.logo_dev_missing_rate, args.host, args.port)
+    if args.seed:
+        site.assign([f"NAS-T{i:05d}" for i in range(args.seed)], parse_mix(args.mix))
+    print(f"🧪 웹사이트 대역 실행: {site.base_url} (logo.dev: {site.logo_dev_base_url})")
+    site.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@
 import json
 import os
 import glob
+import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -36,6 +37,19 @@ class ProgressManager:
         self.progress_dir = Path(progress_dir)
         self.progress_dir.mkdir(exist_ok=True)
         
+    def _remove_trace_index(self, job_id: str):
+        """트레이스 색인(traces.sqlite3)에서 작업 행 삭제"""
+        index_path = Path(os.getenv('CRAWL_TRACE_INDEX_PATH') or self.progress_dir / "traces.sqlite3")
+        if not index_path.exists():
+            return
+        try:
+            conn = sqlite3.connect(str(index_path), timeout=30)
+            with conn:
+                conn.execute("DELETE FROM crawl_traces WHERE job_id = ?", (job_id,))
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️  트레이스 색인 정리 실패: {job_id} - {e}")
+
     def validate_schema(self, file_path: Path) -> bool:
         """JSON 스키마 검증"""
         try:
@@ -133,6 +147,13 @@ class ProgressManager:
                 
                 if started_at < cutoff_date:
                     file_path.unlink()
+                    # 같은 작업의 이벤트 저널도 함께 삭제
+                    events_file = file_path.with_suffix(".events.jsonl")
+                    if events_file.exists():
+                        events_file.unlink()
+                    # 크롤링 트레이스 본문과 색인도 삭제
+                    file_path.with_suffix(".traces.jsonl").unlink(missing_ok=True)
+                    self._remove_trace_index(file_path.stem)
                     removed_count += 1
                     print(f"🗑️  삭제: {file_path.name} ({started_at.strftime('%Y-%m-%d %H:%M')})")
                     
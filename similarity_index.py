@@ -0,0 +1,326 @@
+"""
+로고 유사도 색인 모듈
+저장된 로고마다 대표 렌디션(가장 작은 PNG)의 dHash(64비트 지각 해시)를 계산해 메모리에 색인하고,
+해밍 거리 기준 근접 중복을 찾는다
+
+- 색인 단위(그룹): minio_inventory.split_key의 접두사 (기존 키는 logo_hash, 콘텐츠 주소 키는 cas/ab/{digest}/)
+- 검색: 해시를 8비트 조각 8개로 나눈 조각별 역색인 (multi-index hashing)
+  거리 7 이하는 비둘기집 원리로 적어도 한 조각이 정확히 같으므로 해당 버킷 후보만 비교, 8 이상은 전체 비교
+- 증분 갱신: 인벤토리 기준으로 새로 생겼거나 대표 렌디션 etag가 바뀐 그룹만 내려받아 해시, 사라진 그룹은 제거
+- 현재 그룹: logo_hash가 지금 쓰는 그룹 (크롤링 저장 시 기록, 정합성 점검 시 logo_files 최신 행으로 재구성)
+"""
+
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from content_store import object_key_of, row_logo_hash
+from minio_inventory import split_key
+
+logger = logging.getLogger(__name__)
+
+SLICES = 8
+SLICE_BITS = 64 // SLICES
+SLICE_MASK = (1 << SLICE_BITS) - 1
+# 렌디션 키의 나머지 부분: "_240.png"(기존) 또는 "240.png"(콘텐츠 주소)
+RENDITION_PATTERN = re.compile(r"^_?(?P<size>\d+)\.(?P<fmt>png|webp)$")
+DUPLICATE_DISTANCE = int(os.getenv('SIMILARITY_DUPLICATE_DISTANCE', '3'))
+
+
+def dhash(data: bytes) -> Optional[int]:
+    """이미지 바이트 → 64비트 dHash (투명 영역은 흰 배경에 합성, 열 수 없으면 None)"""
+    from PIL import Image
+
+    try:
+        image = Image.open(BytesIO(data))
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+            background.alpha_composite(image)
+            image = background
+        pixels = list(image.convert("L").resize((9, 8), Image.Resampling.LANCZOS).getdata())
+    except Exception:
+        return None
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+
+def rendition_dhash(renditions: Dict[str, bytes]) -> Optional[int]:
+    """convert_image 결과({"png_240": ...})에서 가장 작은 PNG의 dHash - 색인 대표 렌디션과 같은 기준"""
+    sizes = sorted(int(key.split("_")[1]) for key in renditions if key.startswith("png_"))
+    return dhash(renditions[f"png_{sizes[0]}"]) if sizes else None
+
+
+def representative(entries: Dict[str, Tuple[int, str]]) -> Optional[str]:
+    """그룹 객체 {나머지 키: (size, etag)} 중 해시할 렌디션 (PNG 우선, 가장 작은 크기)"""
+    best, best_rank = None, None
+    for rest, _ in entries.items():
+        match = RENDITION_PATTERN.match(rest)
+        if not match:
+            continue
+        rank = (match.group("fmt") != "png", int(match.group("size")))
+        if best_rank is None or rank < best_rank:
+            best, best_rank = rest, rank
+    return best
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class SimilarityIndex:
+    """그룹별 dHash 색인 (group → (hash, etag)) + 조각별 역색인"""
+
+    def __init__(self, minio_client, bucket: str, path=None, workers: int = None):
+        self.minio_client = minio_client
+        self.bucket = bucket
+        self.path = Path(path or Path(os.getenv('PROGRESS_DIR', 'progress')) / "similarity" / f"{bucket}.json.gz")
+        self.workers = workers or int(os.getenv('SIMILARITY_WORKERS', '8'))
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Tuple[int, str]] = {}
+        self._slices: List[Dict[int, Set[str]]] = [{} for _ in range(SLICES)]
+        self._current: Dict[str, str] = {}       # logo_hash → 현재 그룹
+        self._owners: Dict[str, Set[str]] = {}   # 그룹 → 현재 그룹으로 쓰는 logo_hash
+        self._refreshing = threading.Lock()
+        self.refreshed_at: Optional[str] = None
+        self.ready = False
+        _indexes[bucket] = self
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def hash_of(self, group: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(group)
+            return entry[0] if entry else None
+
+    def current_group(self, logo_hash: str) -> Optional[str]:
+        """logo_hash가 지금 쓰는 그룹 (기록이 없으면 기존 키 그룹 logo_hash)"""
+        with self._lock:
+            group = self._current.get(logo_hash)
+            if group is None and logo_hash in self._entries:
+                group = logo_hash
+            return group
+
+    def owners_of(self, group: str) -> List[str]:
+        with self._lock:
+            owners = set(self._owners.get(group, ()))
+            if not group.startswith("cas/") and group in self._entries:
+                owners.add(group)
+            return sorted(owners)
+
+    def search(self, value: int, max_distance: int = 6, limit: int = 20, exclude: Iterable[str] = ()) -> List[Tuple[str, int]]:
+        """해밍 거리 max_distance 이하 그룹 [(group, distance)] (거리순)"""
+        excluded = set(exclude)
+        with self._lock:
+            if max_distance < SLICES:
+                candidates: Set[str] = set()
+                for i, table in enumerate(self._slices):
+                    candidates.update(table.get((value >> (i * SLICE_BITS)) & SLICE_MASK, ()))
+                pool = ((group, self._entries[group][0]) for group in candidates)
+            else:
+                pool = ((group, entry[0]) for group, entry in self._entries.items())
+            matches = [
+                (group, distance) for group, other in pool
+                if group not in excluded and (distance := hamming(value, other)) <= max_distance
+            ]
+        matches.sort(key=lambda m: (m[1], m[0]))
+        return matches[:limit]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "bucket": self.bucket,
+                "ready": self.ready,
+                "refreshed_at": self.refreshed_at,
+                "groups": len(self._entries),
+                "current_assignments": len(self._current),
+            }
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def record(self, group: str, value: int, etag: str = "", owner: Optional[str] = None):
+        """그룹 해시 기록 (etag가 비어 있으면 다음 갱신 때 다시 해시하지 않고 인벤토리 etag만 채움)"""
+        with self._lock:
+            self._put(group, value, etag)
+            if owner:
+                self.set_current(owner, group)
+
+    def set_current(self, logo_hash: str, group: str):
+        with self._lock:
+            previous = self._current.get(logo_hash)
+            if previous == group:
+                return
+            if previous is not None:
+                owners = self._owners.get(previous)
+                if owners:
+                    owners.discard(logo_hash)
+                    if not owners:
+                        del self._owners[previous]
+            self._current[logo_hash] = group
+            self._owners.setdefault(group, set()).add(logo_hash)
+
+    def assign_from_rows(self, rows: Iterable[Dict]) -> int:
+        """logo_files 행으로 현재 그룹 재구성 (logo_hash별 file_id가 가장 큰 행의 그룹)"""
+        latest: Dict[str, Tuple[int, str]] = {}
+        for row in rows:
+            key = row.get("minio_object_key")
+            owner = row_logo_hash(key)
+            if not owner:
+                continue
+            file_id = row.get("file_id") or 0
+            if owner not in latest or file_id > latest[owner][0]:
+                latest[owner] = (file_id, split_key(object_key_of(key))[0])
+        with self._lock:
+            for owner, (_, group) in latest.items():
+                self.set_current(owner, group)
+        return len(latest)
+
+    def _put(self, group: str, value: int, etag: str):
+        self._remove(group)
+        self._entries[group] = (value, etag)
+        for i, table in enumerate(self._slices):
+            table.setdefault((value >> (i * SLICE_BITS)) & SLICE_MASK, set()).add(group)
+
+    def _remove(self, group: str):
+        entry = self._entries.pop(group, None)
+        if entry is None:
+            return
+        for i, table in enumerate(self._slices):
+            piece = (entry[0] >> (i * SLICE_BITS)) & SLICE_MASK
+            bucket = table.get(piece)
+            if bucket:
+                bucket.discard(group)
+                if not bucket:
+                    del table[piece]
+
+    # ------------------------------------------------------------------
+    # 증분 갱신 / 스냅샷
+    # ------------------------------------------------------------------
+    def _fetch_hash(self, key: str) -> Optional[int]:
+        response = self.minio_client.get_object(self.bucket, key)
+        try:
+            return dhash(response.read())
+        finally:
+            response.close()
+            response.release_conn()
+
+    def refresh(self, inventory) -> int:
+        """인벤토리와 비교해 새 그룹/바뀐 그룹만 해시하고 사라진 그룹 제거 (동시 호출은 1개만 실행)
+
+        반환값: 새로 해시한 그룹 수
+        """
+        if not inventory.ready or not self._refreshing.acquire(blocking=False):
+            return 0
+        try:
+            started = time.monotonic()
+            present = set()
+            todo: List[Tuple[str, str, str]] = []  # (group, key, etag)
+            for group in inventory.prefixes():
+                entries = {key[len(group):]: entry for key, entry in inventory.objects(group).items()}
+                rest = representative(entries)
+                if rest is None:
+                    continue
+                present.add(group)
+                etag = entries[rest][1]
+                with self._lock:
+                    known = self._entries.get(group)
+                    if known and not known[1]:
+                        self._entries[group] = (known[0], etag)
+                        continue
+                if known is None or known[1] != etag:
+                    todo.append((group, group + rest, etag))
+
+            with self._lock:
+                for group in [g for g in self._entries if g not in present]:
+                    self._remove(group)
+
+            hashed, failed = 0, 0
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="similarity") as pool:
+                for (group, key, etag), value in zip(todo, pool.map(self._safe_fetch, [t[1] for t in todo])):
+                    if value is None:
+                        failed += 1
+                        continue
+                    with self._lock:
+                        self._put(group, value, etag)
+                    hashed += 1
+                    if hashed % 5000 == 0:
+                        self.save()
+
+            with self._lock:
+                self.refreshed_at = datetime.now().isoformat()
+                self.ready = True
+            self.save()
+            print(
+                f"🧬 유사도 색인 갱신: {self.bucket} - 그룹 {len(self._entries)}개, 새로 해시 {hashed}개, 실패 {failed}개 "
+                f"({time.monotonic() - started:.1f}s)"
+            )
+            return hashed
+        finally:
+            self._refreshing.release()
+
+    def _safe_fetch(self, key: str) -> Optional[int]:
+        try:
+            return self._fetch_hash(key)
+        except Exception as e:
+            logger.debug(f"유사도 해시 실패: {key} - {e}")
+            return None
+
+    def save(self):
+        """색인 스냅샷을 원자적으로 기록 (gzip JSON, 해시는 16진수 16자리)"""
+        with self._lock:
+            snapshot = {
+                "bucket": self.bucket,
+                "refreshed_at": self.refreshed_at,
+                "entries": {group: [f"{value:016x}", etag] for group, (value, etag) in self._entries.items()},
+                "current": dict(self._current),
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_name(self.path.name + ".tmp")
+        with gzip.open(tmp_file, 'wt', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_file, self.path)
+
+    def load(self) -> bool:
+        """디스크 스냅샷 읽기 (웜 재시작) - 스냅샷이 없거나 다른 버킷이면 False"""
+        if not self.path.exists():
+            return False
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except Exception as e:
+            print(f"⚠️ 유사도 색인 스냅샷 읽기 실패: {self.path} - {e}")
+            return False
+        if snapshot.get("bucket") != self.bucket:
+            return False
+        with self._lock:
+            for group, (value, etag) in (snapshot.get("entries") or {}).items():
+                self._put(group, int(value, 16), etag)
+            for owner, group in (snapshot.get("current") or {}).items():
+                self.set_current(owner, group)
+            self.refreshed_at = snapshot.get("refreshed_at")
+            self.ready = True
+        print(f"🧬 유사도 색인 스냅샷 로드: {self.bucket} - 그룹 {len(self._entries)}개 (갱신 시각 {self.refreshed_at})")
+        return True
+
+
+# 버킷별 색인 (크롤러가 현재 로고와의 시각적 동일성을 확인하기 위한 등록부)
+_indexes: Dict[str, SimilarityIndex] = {}
+
+
+def get_similarity_index(bucket: str) -> Optional[SimilarityIndex]:
+    return _indexes.get(bucket)
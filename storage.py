@@ -0,0 +1,169 @@
+"""
+객체 저장소 모듈
+STORAGE_BACKEND에 따라 MinIO 클라이언트 또는 로컬 파일시스템 저장소를 생성
+
+- minio      : 기본값, MINIO_ENDPOINT/MINIO_ACCESS_KEY/MINIO_SECRET_KEY 사용
+- filesystem : STORAGE_ROOT/{bucket}/{object_key}에 저장 (개발/벤치마크용, MinIO 없이 실행)
+
+파일시스템 저장소는 이 코드베이스가 사용하는 Minio 메서드만 같은 시그니처로 제공한다.
+"""
+
+import mimetypes
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StorageObject:
+    """list_objects/stat_object 결과 (minio.datatypes.Object와 같은 속성)"""
+
+    def __init__(self, bucket_name: str, object_name: str, size: int, etag: str, last_modified: datetime, content_type: str = None):
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_type = content_type
+        self.is_dir = False
+
+
+class StorageWriteResult:
+    def __init__(self, bucket_name: str, object_name: str, etag: str):
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.etag = etag
+        self.version_id = None
+
+
+class StorageResponse:
+    """get_object 응답 (read/close/release_conn/headers)"""
+
+    def __init__(self, path: Path, content_type: str):
+        self._file = open(path, 'rb')
+        self.headers = {"Content-Length": str(path.stat().st_size), "Content-Type": content_type}
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._file.read() if amt is None else self._file.read(amt)
+
+    def stream(self, amt: int = 64 * 1024) -> Iterator[bytes]:
+        while True:
+            chunk = self._file.read(amt)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        self._file.close()
+
+    def release_conn(self):
+        pass
+
+
+class StorageDeleteError:
+    def __init__(self, name: str, message: str):
+        self.name = name
+        self.message = message
+        self.code = "NoSuchKey"
+
+
+class FilesystemStorage:
+    """로컬 디렉터리를 버킷처럼 사용하는 저장소 (Minio 호환 메서드 일부)"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, bucket: str, object_name: str) -> Path:
+        path = (self.root / bucket / object_name).resolve()
+        if not str(path).startswith(str((self.root / bucket).resolve()) + os.sep):
+            raise ValueError(f"잘못된 객체 키: {object_name}")
+        return path
+
+    @staticmethod
+    def _etag(stat: os.stat_result) -> str:
+        # 내용 해시 대신 크기/수정 시각 기반 (목록 조회 시 파일을 읽지 않기 위해)
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def _object(self, bucket: str, object_name: str, path: Path) -> StorageObject:
+        stat = path.stat()
+        return StorageObject(
+            bucket, object_name, stat.st_size, self._etag(stat),
+            datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+            mimetypes.guess_type(object_name)[0] or "application/octet-stream",
+        )
+
+    def bucket_exists(self, bucket: str) -> bool:
+        return (self.root / bucket).is_dir()
+
+    def make_bucket(self, bucket: str):
+        (self.root / bucket).mkdir(parents=True, exist_ok=True)
+
+    def put_object(self, bucket: str, object_name: str, data, length: int, content_type: str = "application/octet-stream", **kwargs) -> StorageWriteResult:
+        path = self._path(bucket, object_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            if length is not None and length >= 0:
+                f.write(data.read(length))
+            else:
+                shutil.copyfileobj(data, f)
+        os.replace(tmp_path, path)
+        return StorageWriteResult(bucket, object_name, self._etag(path.stat()))
+
+    def get_object(self, bucket: str, object_name: str, **kwargs) -> StorageResponse:
+        path = self._path(bucket, object_name)
+        if not path.is_file():
+            raise FileNotFoundError(f"NoSuchKey: {bucket}/{object_name}")
+        return StorageResponse(path, mimetypes.guess_type(object_name)[0] or "application/octet-stream")
+
+    def stat_object(self, bucket: str, object_name: str, **kwargs) -> StorageObject:
+        path = self._path(bucket, object_name)
+        if not path.is_file():
+            raise FileNotFoundError(f"NoSuchKey: {bucket}/{object_name}")
+        return self._object(bucket, object_name, path)
+
+    def list_objects(self, bucket: str, prefix: Optional[str] = None, recursive: bool = False, **kwargs) -> Iterator[StorageObject]:
+        bucket_dir = self.root / bucket
+        if not bucket_dir.is_dir():
+            return
+        prefix = prefix or ""
+        for path in sorted(bucket_dir.rglob("*") if recursive else bucket_dir.glob("*")):
+            if not path.is_file() or path.name.endswith(".tmp"):
+                continue
+            object_name = path.relative_to(bucket_dir).as_posix()
+            if object_name.startswith(prefix):
+                yield self._object(bucket, object_name, path)
+
+    def remove_object(self, bucket: str, object_name: str, **kwargs):
+        self._path(bucket, object_name).unlink(missing_ok=True)
+
+    def remove_objects(self, bucket: str, delete_object_list: Iterable, **kwargs) -> Iterator[StorageDeleteError]:
+        for item in delete_object_list:
+            name = getattr(item, "_name", None) or getattr(item, "name", None) or str(item)
+            try:
+                self.remove_object(bucket, name)
+            except (OSError, ValueError) as e:
+                yield StorageDeleteError(name, str(e))
+
+
+def create_storage_client(endpoint: str = None, access_key: str = None, secret_key: str = None, backend: str = None):
+    """STORAGE_BACKEND에 맞는 저장소 클라이언트 생성 (minio | filesystem)"""
+    backend = (backend or os.getenv('STORAGE_BACKEND', 'minio')).lower()
+    if backend == 'filesystem':
+        root = os.getenv('STORAGE_ROOT', 'storage')
+        print(f"📁 파일시스템 저장소 사용: {root}")
+        return FilesystemStorage(root)
+    if backend != 'minio':
+        raise ValueError(f"지원하지 않는 STORAGE_BACKEND: {backend}")
+    from minio import Minio
+    return Minio(
+        endpoint or os.getenv('MINIO_ENDPOINT', 'minio:9000'),
+        access_key=access_key or os.getenv('MINIO_ACCESS_KEY', 'minioadmin'),
+        secret_key=secret_key or os.getenv('MINIO_SECRET_KEY', 'minioadmin123'),
+        secure=False
+    )
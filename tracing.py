@@ -0,0 +1,310 @@
+"""
+크롤링 트레이스 모듈
+crawl_logo 호출 1건마다 시도/셀렉터 탐색/HTTP 다운로드/변환/업로드 구간(span)의 시간과 결과를 기록
+
+저장 위치 (PROGRESS_DIR 기준)
+- {job_id}.traces.jsonl : 트레이스 본문 (한 줄 = crawl_logo 1건, 작업 없이 실행되면 adhoc.traces.jsonl)
+- traces.sqlite3        : 종목 코드/작업/소요 시간 색인 (본문은 파일 오프셋으로 찾음)
+"""
+
+import contextvars
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+ADHOC_JOB_ID = "adhoc"
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("crawl_trace", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("crawl_span", default=None)
+
+
+def _elapsed_ms(since: float) -> float:
+    return round((time.perf_counter() - since) * 1000, 2)
+
+
+class CrawlTrace:
+    """crawl_logo 1건의 트레이스 (span 목록은 시작 순서, parent는 상위 span 번호)"""
+
+    def __init__(self, infomax_code: str, job_id: Optional[str] = None, **attrs):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.infomax_code = infomax_code
+        self.job_id = job_id or ADHOC_JOB_ID
+        self.attrs = attrs
+        self.started_at = datetime.now().isoformat()
+        self._started = time.perf_counter()
+        self.spans: List[Dict] = []
+        self.outcome: Optional[str] = None
+        self.duration_ms: Optional[float] = None
+
+    def open_span(self, name: str, parent: Optional[int], attrs: Dict) -> Dict:
+        span = {
+            "id": len(self.spans),
+            "parent": parent,
+            "name": name,
+            "start_ms": _elapsed_ms(self._started),
+            "duration_ms": None,
+            "outcome": None,
+        }
+        if attrs:
+            span["attrs"] = attrs
+        self.spans.append(span)
+        return span
+
+    def finish(self, outcome: str):
+        self.outcome = outcome
+        self.duration_ms = _elapsed_ms(self._started)
+        # 타임아웃 등으로 닫히지 않은 span 표시
+        for span in self.spans:
+            if span["duration_ms"] is None:
+                span["duration_ms"] = round(self.duration_ms - span["start_ms"], 2)
+                span["outcome"] = span["outcome"] or "unfinished"
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "job_id": self.job_id,
+            "infomax_code": self.infomax_code,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "outcome": self.outcome,
+            "attrs": self.attrs,
+            "spans": self.spans,
+        }
+
+
+def current_trace() -> Optional[CrawlTrace]:
+    return _current_trace.get()
+
+
+class span:
+    """현재 트레이스에 구간 기록 (트레이스가 없으면 아무것도 하지 않음)
+
+    with/async with 모두 사용할 수 있어 `async with span(...), async_playwright() as p:`처럼 묶을 수 있다.
+    as로 받은 dict의 "outcome"을 바꾸면 그 값으로 기록하고, 예외가 나면 "error"(취소는 "cancelled")로 기록한다.
+    """
+
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.record: Dict = {}
+        self._trace = None
+        self._token = None
+        self._started = 0.0
+
+    def __enter__(self) -> Dict:
+        self._trace = _current_trace.get()
+        if self._trace is None:
+            return self.record
+        self.record = self._trace.open_span(self.name, _current_span.get(), self.attrs)
+        self._started = time.perf_counter()
+        self._token = _current_span.set(self.record["id"])
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._trace is None:
+            return False
+        _current_span.reset(self._token)
+        record = self.record
+        record["duration_ms"] = _elapsed_ms(self._started)
+        if exc_type is not None and record["outcome"] is None:
+            record["outcome"] = "cancelled" if exc_type.__name__ == "CancelledError" else "error"
+            record.setdefault("attrs", {})["error"] = str(exc)[:200] or exc_type.__name__
+        if record["outcome"] is None:
+            record["outcome"] = "ok"
+        return False
+
+    async def __aenter__(self) -> Dict:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+@contextmanager
+def crawl_trace(infomax_code: str, job_id: Optional[str] = None, **attrs) -> Iterator[CrawlTrace]:
+    """crawl_logo 1건 트레이스 시작 - 블록이 끝나면 결과(trace.outcome, 기본 "ok")와 함께 저장"""
+    trace = CrawlTrace(infomax_code, job_id, **attrs)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    except BaseException:
+        trace.outcome = trace.outcome or "error"
+        raise
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        trace.finish(trace.outcome or "ok")
+        if TRACE_ENABLED:
+            try:
+                get_trace_store().write(trace)
+            except Exception as e:
+                logger.warning(f"트레이스 저장 실패: {infomax_code} - {e}")
+
+
+class TraceStore:
+    """트레이스 저장소 - 본문은 작업별 JSONL에 추가, 검색용 요약은 SQLite 색인"""
+
+    def __init__(self, progress_dir, index_path=None):
+        self.progress_dir = Path(progress_dir)
+        self.progress_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = Path(index_path or self.progress_dir / "traces.sqlite3")
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.index_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS crawl_traces (
+                    trace_id TEXT PRIMARY KEY,
+                    job_id TEXT NOT NULL,
+                    infomax_code TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    duration_ms REAL,
+                    outcome TEXT,
+                    span_count INTEGER NOT NULL DEFAULT 0,
+                    file_offset INTEGER NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_traces_code ON crawl_traces(infomax_code, started_at DESC)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_traces_job ON crawl_traces(job_id, duration_ms DESC)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_traces_duration ON crawl_traces(duration_ms DESC)")
+        finally:
+            conn.close()
+
+    def trace_file(self, job_id: str) -> Path:
+        return self.progress_dir / f"{Path(job_id).name}.traces.jsonl"
+
+    def write(self, trace: CrawlTrace):
+        line = (json.dumps(trace.to_dict(), ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            # O_APPEND 쓰기 후 위치 = 방금 쓴 줄의 끝 (여러 프로세스가 같은 파일에 추가해도 오프셋이 맞음)
+            fd = os.open(self.trace_file(trace.job_id), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                offset = os.lseek(fd, 0, os.SEEK_CUR) - len(line)
+            finally:
+                os.close(fd)
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO crawl_traces VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (trace.trace_id, trace.job_id, trace.infomax_code, trace.started_at,
+                     trace.duration_ms, trace.outcome, len(trace.spans), offset)
+                )
+            finally:
+                conn.close()
+
+    def _load(self, rows) -> List[Dict]:
+        traces = []
+        for row in rows:
+            try:
+                with open(self.trace_file(row["job_id"]), 'rb') as f:
+                    f.seek(row["file_offset"])
+                    traces.append(json.loads(f.readline()))
+            except (OSError, ValueError) as e:
+                logger.warning(f"트레이스 읽기 실패: {row['trace_id']} - {e}")
+        return traces
+
+    def _query(self, where: List[str], params: List, order_by: str, limit: int, with_spans: bool) -> List[Dict]:
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT * FROM crawl_traces {clause} ORDER BY {order_by} LIMIT ?", params + [limit]
+            ).fetchall()
+        finally:
+            conn.close()
+        if with_spans:
+            return self._load(rows)
+        return [{k: row[k] for k in row.keys() if k != "file_offset"} for row in rows]
+
+    def by_code(self, infomax_code: str, job_id: Optional[str] = None, limit: int = 20, with_spans: bool = True) -> List[Dict]:
+        """종목 코드의 트레이스 (최신순)"""
+        where, params = ["infomax_code = ?"], [infomax_code]
+        if job_id:
+            where.append("job_id = ?")
+            params.append(job_id)
+        return self._query(where, params, "started_at DESC", limit, with_spans)
+
+    def slowest(self, job_id: Optional[str] = None, outcome: Optional[str] = None, limit: int = 20, with_spans: bool = True) -> List[Dict]:
+        """소요 시간이 긴 트레이스 (전체 또는 작업별)"""
+        where, params = [], []
+        if job_id:
+            where.append("job_id = ?")
+            params.append(job_id)
+        if outcome:
+            where.append("outcome = ?")
+            params.append(outcome)
+        return self._query(where, params, "duration_ms DESC", limit, with_spans)
+
+    def span_stats(self, job_id: str) -> Dict[str, Dict]:
+        """작업의 span 이름별 건수/합계/p50/p95/최대 (ms) 및 결과별 건수 - 느린 구간 찾기용"""
+        durations: Dict[str, List[float]] = {}
+        outcomes: Dict[str, Dict[str, int]] = {}
+        trace_file = self.trace_file(job_id)
+        if not trace_file.exists():
+            return {}
+        with open(trace_file, 'rb') as f:
+            for raw in f:
+                try:
+                    trace = json.loads(raw)
+                except ValueError:
+                    continue
+                for s in trace.get("spans", []):
+                    durations.setdefault(s["name"], []).append(s.get("duration_ms") or 0)
+                    counts = outcomes.setdefault(s["name"], {})
+                    counts[s.get("outcome")] = counts.get(s.get("outcome"), 0) + 1
+        stats = {}
+        for name, values in durations.items():
+            values.sort()
+            stats[name] = {
+                "count": len(values),
+                "total_ms": round(sum(values), 2),
+                "p50_ms": values[len(values) // 2],
+                "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "max_ms": values[-1],
+                "outcomes": outcomes[name],
+            }
+        return dict(sorted(stats.items(), key=lambda kv: kv[1]["total_ms"], reverse=True))
+
+    def remove_job(self, job_id: str):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM crawl_traces WHERE job_id = ?", (job_id,))
+        finally:
+            conn.close()
+        self.trace_file(job_id).unlink(missing_ok=True)
+
+
+TRACE_ENABLED = os.getenv('CRAWL_TRACE_ENABLED', 'true').lower() == 'true'
+
+_store: Optional[TraceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_trace_store() -> TraceStore:
+    """프로세스 전역 트레이스 저장소 (PROGRESS_DIR, CRAWL_TRACE_INDEX_PATH)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TraceStore(os.getenv('PROGRESS_DIR', 'progress'), os.getenv('CRAWL_TRACE_INDEX_PATH') or None)
+    return _store
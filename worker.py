@@ -0,0 +1,26 @@
+"""
+크롤링 워커 프로세스
+API 서버와 같은 작업 큐(JOB_QUEUE_PATH, 또는 JOB_QUEUE_BACKEND=postgres면 JOB_QUEUE_DSN)를 공유하며 작업을 소비
+
+사용법: CRAWL_WORKERS=0 으로 API 서버를 띄우고 `python worker.py --workers 4` 실행
+여러 노드에서 실행하면 종목 배치(작업 항목)를 임대해 나눠 처리한다 (여러 호스트라면 postgres 저장소 사용).
+"""
+
+import argparse
+import os
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤링 작업 큐 워커")
+    parser.add_argument("--workers", type=int, default=int(os.getenv('CRAWL_WORKERS', '2')) or 2, help="워커 수 (기본: CRAWL_WORKERS 또는 2)")
+    args = parser.parse_args()
+
+    # api_server 임포트 시 작업 큐/크롤러/DB 등록기가 동일한 설정으로 구성된다
+    import api_server
+
+    pool = api_server.create_worker_pool(args.workers)
+    pool.run_forever()
+
+
+if __name__ == "__main__":
+    main()